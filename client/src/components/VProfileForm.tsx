@@ -144,7 +144,7 @@ export const VProfileForm = () => {
         const parsedAvail = availability.map((date) => ({ date: date.toISOString().split("T")[0] }));
         console.log(parsedAvail);
         await axios.post(
-          `${BACKEND_URL}/availabilities/`,
+          `${BACKEND_URL}/availabilities/?replace=true`,
           availability.map((date) => ({ date: date.toISOString().split("T")[0] })),
           {
             headers: {
@@ -157,7 +157,7 @@ export const VProfileForm = () => {
 
       if (skills.length > 0) {
         await axios.post(
-          `${BACKEND_URL}/skills/`,
+          `${BACKEND_URL}/skills/?replace=true`,
           skills.map((skill) => ({ name: skill })),
           {
             headers: {
@@ -17,6 +17,7 @@ interface Event {
     event_date: string;
     status: string;
     required_skills: { name: string }[];
+    skills?: string;
 }
 
 interface VolunteerTableProps {
@@ -33,30 +34,17 @@ export const VolunteerTable: React.FC<VolunteerTableProps> = ({ onEditEvent }) =
 
         const fetchEvents = async () => {
             try {
-                axios.get(`${BACKEND_URL}/profile/`,{
+                const response = await axios.get(`${BACKEND_URL}/history/`, {
                     headers: {
-                      Authorization: `Bearer ${accessToken}`,
+                        Authorization: `Bearer ${accessToken}`,
                     },
-                  }).then((response) => {
-                    axios.get(`${BACKEND_URL}/history/${response.data.id}/`,{
-                        headers: {
-                            Authorization: `Bearer ${accessToken}`,
-                            },
-                    }).then((response) => {
-                        // console.log(response.data);
-                    setLoading(false);
-                    }).catch((error) => {
-                        console.error(error);
-                        setError((error as any).message);
-                        setLoading(false);
-                  });
-                }
-                ).catch((error) => {
-                    console.error(error);
-                    setError((error as any).message);
-                    setLoading(false);
-                }
-                );
+                });
+                setEvents(response.data.history.map((record: any) => ({
+                    ...record.event,
+                    status: record.status,
+                    skills: record.event.required_skills.map((skill: { name: string }) => skill.name).join(", "),
+                })));
+                setLoading(false);
             } catch (error) {
                 console.error(error);
                 setError((error as any).message);
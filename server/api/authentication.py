@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import UserProfile
+from .versioning import bump_version, data_version
+
+
+def token_version_name(user_id):
+    """The DataVersion counter that revokes ``user_id``'s tokens when bumped."""
+    return f"User:{user_id}"
+
+
+def revoke_tokens(user_id):
+    bump_version(token_version_name(user_id))
+
+
+def issue_tokens(user):
+    """
+    Return a refresh token for ``user`` carrying the claims ClaimsUser reads,
+    so authenticated requests do not need to load the user row.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh["is_admin"] = user.is_admin
+    refresh["profile_id"] = UserProfile.objects.filter(user=user).values_list("id", flat=True).first()
+    refresh["token_version"] = data_version(token_version_name(user.pk))
+    return refresh
+
+
+class ClaimsUser(TokenUser):
+    """
+    The request user built from a validated access token. ``id``, ``is_admin``
+    and ``profile_id`` come from the token's claims; any other attribute loads
+    the full User row on first use. Claims are fixed when the token is issued
+    and access tokens are not checked against the database, so a change to
+    the user holds from the next refresh, at most ACCESS_TOKEN_LIFETIME later.
+    """
+    @cached_property
+    def model(self):
+        return get_user_model().objects.get(pk=self.pk)
+
+    @cached_property
+    def is_admin(self):
+        claim = self.token.get("is_admin")
+        return self.model.is_admin if claim is None else bool(claim)
+
+    @cached_property
+    def profile_id(self):
+        return self.token.get("profile_id")
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.model, attr)
+
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refuses a refresh token issued before its user's token version last moved
+    (see revoke_tokens). simplejwt itself refuses inactive users.
+    """
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        claim = refresh.get("token_version")
+        if claim is not None and claim != data_version(token_version_name(refresh[api_settings.USER_ID_CLAIM])):
+            raise InvalidToken("Token has been revoked")
+        return super().validate(attrs)
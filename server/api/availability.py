@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+from functools import reduce
+from itertools import groupby
+from operator import and_, itemgetter, or_
+
+from django.db.models import Count, F, Q
+from django.db.models.lookups import Exact
+
+from .models import AvailabilityYear, UserAvailability
+
+# Day n of a year (0-based) is bit n % 61 of column days{n // 61}. 61 bits
+# keep every word positive in a signed 64-bit column, and six words cover a
+# leap year. A date range becomes one mask per (year, word), so "any day in
+# the range" is a non-zero ``&`` and "every day" is ``&`` equal to the mask,
+# tested across all volunteers' rows in one query.
+DAYS_PER_WORD = 61
+WORDS = 6
+WORD_FIELDS = [f"days{i}" for i in range(WORDS)]
+WORD_MASK = (1 << DAYS_PER_WORD) - 1
+MAX_RANGE_DAYS = 366
+BATCH_SIZE = 2000
+
+
+def _split(bits):
+    return [(bits >> (DAYS_PER_WORD * word)) & WORD_MASK for word in range(WORDS)]
+
+
+def year_words(days):
+    """Group dates by year into that year's bitmap words."""
+    bits = {}
+    for day in days:
+        bits[day.year] = bits.get(day.year, 0) | 1 << (day.timetuple().tm_yday - 1)
+    return {year: _split(value) for year, value in bits.items()}
+
+
+def range_words(start, end):
+    """Masks covering every day from ``start`` to ``end`` inclusive, by year."""
+    masks = {}
+    for year in range(start.year, end.year + 1):
+        first = max(start, date(year, 1, 1)).timetuple().tm_yday - 1
+        last = min(end, date(year, 12, 31)).timetuple().tm_yday - 1
+        masks[year] = _split(((1 << (last - first + 1)) - 1) << first)
+    return masks
+
+
+def sync_availability(profile_id, years):
+    """Rebuild one profile's bitmaps for ``years`` from its UserAvailability rows."""
+    years = set(years)
+    if not years:
+        return
+    days = UserAvailability.objects.filter(
+        user_profile_id=profile_id, date__gte=date(min(years), 1, 1), date__lte=date(max(years), 12, 31)
+    ).values_list("date", flat=True)
+    words = year_words(day for day in days if day.year in years)
+    AvailabilityYear.objects.bulk_create(
+        [
+            AvailabilityYear(user_profile_id=profile_id, year=year, **dict(zip(WORD_FIELDS, words.get(year, [0] * WORDS))))
+            for year in years
+        ],
+        update_conflicts=True,
+        unique_fields=["user_profile", "year"],
+        update_fields=WORD_FIELDS,
+    )
+
+
+def rebuild_availability():
+    """Rebuild every bitmap from UserAvailability. Returns the rows written."""
+    AvailabilityYear.objects.all().delete()
+    rows = UserAvailability.objects.order_by("user_profile_id").values_list("user_profile_id", "date")
+    count, batch = 0, []
+    for profile_id, group in groupby(rows.iterator(chunk_size=BATCH_SIZE), key=itemgetter(0)):
+        batch.extend(
+            AvailabilityYear(user_profile_id=profile_id, year=year, **dict(zip(WORD_FIELDS, words)))
+            for year, words in year_words(day for _, day in group).items()
+        )
+        if len(batch) >= BATCH_SIZE:
+            AvailabilityYear.objects.bulk_create(batch)
+            count, batch = count + len(batch), []
+    AvailabilityYear.objects.bulk_create(batch)
+    return count + len(batch)
+
+
+def available_profile_ids(start, end=None, every_day=False):
+    """
+    Ids of the profiles available on any day from ``start`` to ``end``
+    inclusive, or on every one of those days with ``every_day``, as a
+    queryset usable in ``id__in``. Answered from the bitmaps alone; raises
+    ValueError for an empty or over-long range.
+    """
+    end = end or start
+    if end < start or end - start >= timedelta(days=MAX_RANGE_DAYS):
+        raise ValueError(f"The availability range must be 1 to {MAX_RANGE_DAYS} days.")
+
+    conditions = []
+    for year, masks in range_words(start, end).items():
+        words = [(field, mask) for field, mask in zip(WORD_FIELDS, masks) if mask]
+        if every_day:
+            test = reduce(and_, (Q(Exact(F(field).bitand(mask), mask)) for field, mask in words))
+        else:
+            test = reduce(or_, (~Q(Exact(F(field).bitand(mask), 0)) for field, mask in words))
+        conditions.append(Q(year=year) & test)
+
+    rows = AvailabilityYear.objects.filter(reduce(or_, conditions))
+    if every_day and len(conditions) > 1:
+        # Each year of the range must match on its own.
+        rows = rows.values("user_profile_id").annotate(years=Count("id")).filter(years=len(conditions))
+    return rows.values("user_profile_id")
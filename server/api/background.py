@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections, transaction
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def get_executor(name, workers):
+    with _lock:
+        if name not in _executors:
+            _executors[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        return _executors[name]
+
+
+def _close_connections_after(fn, *args):
+    try:
+        fn(*args)
+    finally:
+        connections.close_all()
+
+
+def run_after_commit(fn, *args, pool="background", workers=0):
+    """
+    Run ``fn(*args)`` once the current transaction commits: on a named thread
+    pool when ``workers`` is positive, otherwise inline in the committing
+    thread.
+    """
+    def start():
+        if workers:
+            get_executor(pool, workers).submit(_close_connections_after, fn, *args)
+        else:
+            fn(*args)
+
+    transaction.on_commit(start)
@@ -0,0 +1,101 @@
+import hashlib
+import threading
+from functools import wraps
+
+from django.core.cache import caches
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .versioning import version_info
+
+
+class ResponseCache:
+    """
+    Stores serialized response data under keys derived from the request path
+    and the data-version stamp of the tables the view reads. A write to any of
+    those tables changes the stamp, so stale entries are simply never looked
+    up again and are left to the backend's eviction.
+
+    Hits and misses are counted per process, for lookups this worker made;
+    with a shared backend each worker reports its own share.
+    """
+    def __init__(self, alias="responses"):
+        self.alias = alias
+        self.process_hits = 0
+        self.process_misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def get(self, key):
+        data = self.backend.get(key)
+        with self._lock:
+            if data is None:
+                self.process_misses += 1
+            else:
+                self.process_hits += 1
+        return data
+
+    def set(self, key, data, timeout=None):
+        self.backend.set(key, data, timeout)
+
+    def process_stats(self):
+        with self._lock:
+            return {"hits": self.process_hits, "misses": self.process_misses}
+
+    def reset_process_stats(self):
+        with self._lock:
+            self.process_hits = self.process_misses = 0
+
+
+response_cache = ResponseCache()
+
+
+def make_etag(path, stamp, modified):
+    seed = f"{path}|{stamp}|{modified.timestamp() if modified else ''}"
+    return '"%s"' % hashlib.md5(seed.encode(), usedforsecurity=False).hexdigest()
+
+
+def not_modified(request, etag, modified):
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match is not None:
+        return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+    if_modified_since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    return bool(modified and if_modified_since and int(modified.timestamp()) <= if_modified_since)
+
+
+def cached_response(*tables, timeout=None):
+    """
+    Cache the 200 responses of a view's ``get`` and answer conditional requests
+    with 304. ``tables`` lists the DataVersion names the response is built from.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            stamp, modified = version_info(*tables)
+            etag = make_etag(request.get_full_path(), stamp, modified)
+
+            if not_modified(request, etag, modified):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                key = "response:" + etag.strip('"')
+                data = response_cache.get(key)
+                if data is None:
+                    response = method(self, request, *args, **kwargs)
+                    if response.status_code != status.HTTP_200_OK:
+                        return response
+                    response_cache.set(key, response.data, timeout)
+                else:
+                    response = Response(data, status=status.HTTP_200_OK)
+
+            response["ETag"] = etag
+            if modified:
+                response["Last-Modified"] = http_date(modified.timestamp())
+            response["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,143 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from .background import run_after_commit
+from .models import DashboardCounter, EventDetails, EventSkills, EventStats, UserProfile, VolunteerHistory
+from .versioning import bump_version
+
+# Writes name the keys they touched (events, volunteers' profiles, states,
+# the urgency breakdown) and only those keys are recounted, once the
+# transaction commits. rebuild_dashboard() recounts everything and is what
+# the rebuild_dashboard management command runs.
+
+
+def _grouped(queryset, field, value):
+    return dict(queryset.order_by().values(field).annotate(value=value).values_list(field, "value"))
+
+
+def _upsert_counters(kind, counts):
+    DashboardCounter.objects.bulk_create(
+        [DashboardCounter(kind=kind, key=key, value=value) for key, value in counts.items()],
+        update_conflicts=True,
+        unique_fields=["kind", "key"],
+        update_fields=["value", "updated_at"],
+    )
+
+
+def refresh_event_stats(event_ids):
+    event_ids = list(EventDetails.objects.filter(id__in=event_ids).values_list("id", flat=True))
+    if not event_ids:
+        return
+    volunteers = _grouped(VolunteerHistory.objects.filter(event_id__in=event_ids), "event_id", Count("id"))
+    required = _grouped(EventSkills.objects.filter(event_id__in=event_ids), "event_id", Count("id"))
+    # A required skill is covered when a volunteer assigned to the same event has it.
+    covered = _grouped(
+        EventSkills.objects.filter(
+            event_id__in=event_ids,
+            skill__user_links__user_profile__volunteer_history__event_id=F("event_id"),
+        ),
+        "event_id",
+        Count("skill_id", distinct=True),
+    )
+    EventStats.objects.bulk_create(
+        [
+            EventStats(
+                event_id=event_id,
+                volunteers=volunteers.get(event_id, 0),
+                required_skills=required.get(event_id, 0),
+                covered_skills=covered.get(event_id, 0),
+            )
+            for event_id in event_ids
+        ],
+        update_conflicts=True,
+        unique_fields=["event"],
+        update_fields=["volunteers", "required_skills", "covered_skills", "updated_at"],
+    )
+
+
+def refresh_urgency_counts():
+    counts = _grouped(EventDetails.objects.all(), "urgency", Count("id"))
+    DashboardCounter.objects.filter(kind=DashboardCounter.URGENCY).exclude(key__in=counts).delete()
+    _upsert_counters(DashboardCounter.URGENCY, counts)
+
+
+def refresh_state_counts(states):
+    states = set(states)
+    if not states:
+        return
+    counts = _grouped(
+        VolunteerHistory.objects.filter(user_profile__state__in=states), "user_profile__state", Count("id")
+    )
+    _upsert_counters(DashboardCounter.STATE, {state: counts.get(state, 0) for state in states})
+
+
+def refresh_dashboard(event_ids=(), profile_ids=(), states=(), urgency=False, skill_profile_ids=()):
+    states = set(states)
+    if profile_ids:
+        states.update(UserProfile.objects.filter(id__in=profile_ids).values_list("state", flat=True))
+    event_ids = set(event_ids)
+    if skill_profile_ids:
+        # A volunteer's skills count toward every event they are assigned to.
+        event_ids.update(
+            VolunteerHistory.objects.filter(user_profile_id__in=skill_profile_ids).values_list("event_id", flat=True)
+        )
+    with transaction.atomic():
+        refresh_event_stats(event_ids)
+        refresh_state_counts(states)
+        if urgency:
+            refresh_urgency_counts()
+        bump_version("DashboardStats")
+
+
+def schedule_dashboard_refresh(event_ids=(), profile_ids=(), states=(), urgency=False, skill_profile_ids=()):
+    """
+    Recount the named keys after the current transaction commits.
+    ``skill_profile_ids`` names volunteers whose skills changed, which recounts
+    the events they are assigned to.
+    """
+    run_after_commit(
+        refresh_dashboard, list(event_ids), list(profile_ids), list(states), urgency, list(skill_profile_ids),
+        pool="dashboard", workers=settings.DASHBOARD_REFRESH_WORKERS,
+    )
+
+
+def rebuild_dashboard():
+    """Recount every aggregate from scratch, dropping rows for deleted keys."""
+    with transaction.atomic():
+        EventStats.objects.all().delete()
+        DashboardCounter.objects.all().delete()
+        refresh_event_stats(EventDetails.objects.values_list("id", flat=True))
+        refresh_urgency_counts()
+        refresh_state_counts(UserProfile.objects.values_list("state", flat=True).distinct())
+        bump_version("DashboardStats")
+
+
+def dashboard_snapshot():
+    """Everything the admin dashboard shows, read from the aggregate tables."""
+    counters = {DashboardCounter.URGENCY: {}, DashboardCounter.STATE: {}}
+    for kind, key, value in DashboardCounter.objects.values_list("kind", "key", "value"):
+        if value:
+            counters[kind][key] = value
+
+    stats = EventStats.objects.select_related("event").only(
+        "volunteers", "required_skills", "covered_skills", "updated_at", "event__event_name", "event__event_date"
+    ).order_by("event_id")
+    events = [
+        {
+            "event": entry.event_id,
+            "event_name": entry.event.event_name,
+            "event_date": entry.event.event_date,
+            "volunteers": entry.volunteers,
+            "required_skills": entry.required_skills,
+            "covered_skills": entry.covered_skills,
+            "fill_ratio": round(entry.fill_ratio, 4),
+        }
+        for entry in stats
+    ]
+    return {
+        "events_by_urgency": counters[DashboardCounter.URGENCY],
+        "participation_by_state": counters[DashboardCounter.STATE],
+        "events": events,
+        "updated_at": max((entry.updated_at for entry in stats), default=None),
+    }
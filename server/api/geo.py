@@ -0,0 +1,278 @@
+import csv
+import math
+import re
+from functools import reduce
+from operator import or_
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Cast, Floor, Least, Substr
+
+from .matching import parse_location
+from .models import EventDetails, UserProfile, ZipCentroid
+from .versioning import bump_version
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE = 69.0
+MAX_RADIUS_MILES = 500.0
+LOAD_BATCH_SIZE = 2000
+CACHE_PREFIX = "zip:"
+NEAREST_GROWTH = 4
+
+# Located rows carry the id of the GRID_DEGREES square they fall in, numbered
+# row by row from (-90, -180), so the cells of one latitude row are a run of
+# consecutive ids. A radius query becomes one indexed range per row of the
+# covering cells instead of a latitude range scan that checks longitude row
+# by row. Half a degree is about 35 miles north to south.
+GRID_DEGREES = 0.5
+GRID_ROWS = int(180 / GRID_DEGREES)
+GRID_COLUMNS = int(360 / GRID_DEGREES)
+
+POINT_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+ZIP5_RE = re.compile(r"^\s*(\d{5})")
+
+
+def distance_miles(lat1, lon1, lat2, lon2):
+    """Great-circle (haversine) distance between two points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _zip5(zip_code):
+    match = ZIP5_RE.match(zip_code or "")
+    return match.group(1) if match else None
+
+
+def centroids(zip_codes):
+    """
+    Map each known ZIP code among ``zip_codes`` to its (latitude, longitude),
+    with one cache read and at most two queries for the whole set.
+    """
+    wanted = {zip5 for zip5 in map(_zip5, zip_codes) if zip5}
+    if not wanted:
+        return {}
+    cached = cache.get_many([CACHE_PREFIX + zip5 for zip5 in wanted])
+    points = {key[len(CACHE_PREFIX):]: tuple(point) for key, point in cached.items()}
+
+    missing = wanted - points.keys()
+    if missing:
+        found = {
+            zip_code: (latitude, longitude)
+            for zip_code, latitude, longitude in ZipCentroid.objects.filter(zip_code__in=missing).values_list(
+                "zip_code", "latitude", "longitude"
+            )
+        }
+        cache.set_many({CACHE_PREFIX + zip5: point for zip5, point in found.items()}, None)
+        points.update(found)
+        unknown = missing - found.keys()
+        if unknown and (found or ZipCentroid.objects.exists()):
+            # Unknown ZIPs are cached as () for a while so they are not looked
+            # up again. Not forever: load_centroids() runs in another process
+            # and cannot drop this worker's entries. Nor before any centroids
+            # are loaded, when every ZIP would miss.
+            cache.set_many({CACHE_PREFIX + zip5: () for zip5 in unknown}, settings.ZIP_MISS_CACHE_TIMEOUT)
+    return {zip5: point for zip5, point in points.items() if point}
+
+
+def centroid(zip_code):
+    """(latitude, longitude) of a ZIP code's centroid, or None if unknown."""
+    return centroids([zip_code]).get(_zip5(zip_code))
+
+
+def grid_cell(lat, lon):
+    """Id of the grid square holding (lat, lon), or None without a point."""
+    if lat is None or lon is None:
+        return None
+    # The 90th parallel and 180th meridian belong to the last row and column.
+    row = min(math.floor((lat + 90) / GRID_DEGREES), GRID_ROWS - 1)
+    column = min(math.floor((lon + 180) / GRID_DEGREES), GRID_COLUMNS - 1)
+    return row * GRID_COLUMNS + column
+
+
+def _grid_cell_expression():
+    # grid_cell() in SQL, for bulk updates.
+    row = Least(Floor((F("latitude") + 90) / GRID_DEGREES), GRID_ROWS - 1)
+    column = Least(Floor((F("longitude") + 180) / GRID_DEGREES), GRID_COLUMNS - 1)
+    return Cast(row * GRID_COLUMNS + column, IntegerField())
+
+
+def _locate(obj, point):
+    obj.latitude, obj.longitude = point or (None, None)
+    obj.geo_cell = grid_cell(obj.latitude, obj.longitude)
+
+
+def locate_profile(profile):
+    _locate(profile, centroid(profile.zip_code))
+
+
+def locate_event(event):
+    _, zip_code = parse_location(event.location)
+    _locate(event, centroid(zip_code))
+
+
+def locate_profiles(profiles):
+    """locate_profile() for many profiles, looking their ZIP codes up together."""
+    points = centroids(profile.zip_code for profile in profiles)
+    for profile in profiles:
+        _locate(profile, points.get(_zip5(profile.zip_code)))
+
+
+def locate_events(events):
+    """locate_event() for many events, looking their ZIP codes up together."""
+    zip_codes = [parse_location(event.location)[1] for event in events]
+    points = centroids(zip_codes)
+    for event, zip_code in zip(events, zip_codes):
+        _locate(event, points.get(_zip5(zip_code)))
+
+
+def resolve_point(value):
+    """Parse ``"lat,lon"`` or a ZIP code into a point; raises ValueError."""
+    match = POINT_RE.match(value)
+    if match:
+        lat, lon = float(match.group(1)), float(match.group(2))
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError("near is out of range.")
+        return lat, lon
+    point = centroid(value)
+    if point is None:
+        raise ValueError("near must be a known ZIP code or 'lat,lon'.")
+    return point
+
+
+def bounding_box(lat, lon, miles):
+    lat_delta = miles / MILES_PER_DEGREE
+    lon_delta = miles / (MILES_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta
+
+
+def covering_cells(lat, lon, miles):
+    """
+    Inclusive (first, last) grid cell id ranges covering the bounding box of
+    ``miles`` around (lat, lon): one per row of cells, or two where the box
+    crosses the antimeridian.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, miles)
+    first_row = grid_cell(max(lat_min, -90), 0) // GRID_COLUMNS
+    last_row = grid_cell(min(lat_max, 90), 0) // GRID_COLUMNS
+    if lon_max - lon_min >= 360:
+        spans = [(0, GRID_COLUMNS - 1)]
+    else:
+        first_col = math.floor((lon_min + 180) / GRID_DEGREES) % GRID_COLUMNS
+        last_col = math.floor((lon_max + 180) / GRID_DEGREES) % GRID_COLUMNS
+        if first_col <= last_col:
+            spans = [(first_col, last_col)]
+        else:
+            spans = [(first_col, GRID_COLUMNS - 1), (0, last_col)]
+    return [
+        (row * GRID_COLUMNS + first, row * GRID_COLUMNS + last)
+        for row in range(first_row, last_row + 1)
+        for first, last in spans
+    ]
+
+
+def radius_candidates(queryset, lat, lon, miles):
+    """Rows of ``queryset`` in the grid cells covering ``miles`` around (lat, lon)."""
+    return queryset.filter(reduce(or_, (Q(geo_cell__range=cells) for cells in covering_cells(lat, lon, miles))))
+
+
+def within_radius(queryset, lat, lon, miles):
+    """
+    Objects of ``queryset`` within ``miles`` of (lat, lon) as a list of
+    (distance, object), nearest first. The covering grid cells are one range
+    scan per cell row on the geo_cell index; only rows inside them are measured.
+    """
+    candidates = radius_candidates(queryset, lat, lon, miles)
+    hits = []
+    for obj in candidates:
+        distance = distance_miles(lat, lon, obj.latitude, obj.longitude)
+        if distance <= miles:
+            hits.append((distance, obj))
+    hits.sort(key=lambda hit: (hit[0], hit[1].pk))
+    return hits
+
+
+def nearest(queryset, lat, lon, k, start_miles=10.0, max_miles=MAX_RADIUS_MILES):
+    """
+    The ``k`` objects nearest to (lat, lon), searched in a radius that grows
+    fourfold until it holds ``k`` objects, so at most four grid lookups reach
+    the 500 mile cap. Everything within the final radius has been measured,
+    so the ``k`` nearest inside it are the true ``k`` nearest.
+    """
+    miles = start_miles
+    while True:
+        hits = within_radius(queryset, lat, lon, miles)
+        if len(hits) >= k or miles >= max_miles:
+            return hits[:k]
+        miles = min(miles * NEAREST_GROWTH, max_miles)
+
+
+def read_centroids(path):
+    """
+    Rows of a US Census ZCTA gazetteer file (tab-separated, with GEOID,
+    INTPTLAT and INTPTLONG columns) or a CSV with zip_code, latitude and
+    longitude columns.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        dialect = "excel-tab" if "\t" in handle.readline() else "excel"
+        handle.seek(0)
+        for row in csv.DictReader(handle, dialect=dialect):
+            row = {key.strip().lower(): value.strip() for key, value in row.items() if key}
+            zip_code = row.get("zip_code") or row.get("geoid")
+            latitude = row.get("latitude") or row.get("intptlat")
+            longitude = row.get("longitude") or row.get("intptlong")
+            if zip_code and latitude and longitude:
+                yield ZipCentroid(zip_code=zip_code.zfill(5), latitude=float(latitude), longitude=float(longitude))
+
+
+def load_centroids(centroids):
+    """Upsert ZIP centroids and return how many rows were written."""
+    count = 0
+    with transaction.atomic():
+        batch = []
+        for entry in centroids:
+            batch.append(entry)
+            if len(batch) == LOAD_BATCH_SIZE:
+                count += _upsert(batch)
+                batch = []
+        if batch:
+            count += _upsert(batch)
+    return count
+
+
+def _upsert(batch):
+    ZipCentroid.objects.bulk_create(
+        batch, update_conflicts=True, unique_fields=["zip_code"], update_fields=["latitude", "longitude"]
+    )
+    cache.delete_many([CACHE_PREFIX + entry.zip_code for entry in batch])
+    return len(batch)
+
+
+def backfill_coordinates():
+    """
+    Set coordinates on every profile and event from the current centroid
+    table, for rows written before it was loaded or by bulk paths that skip
+    save(). Returns (profiles, events) updated.
+    """
+    zip5 = Substr(OuterRef("zip_code"), 1, 5)
+    centroids = ZipCentroid.objects.filter(zip_code=zip5)
+    profiles = UserProfile.objects.update(
+        latitude=Subquery(centroids.values("latitude")[:1]),
+        longitude=Subquery(centroids.values("longitude")[:1]),
+    )
+    UserProfile.objects.update(geo_cell=_grid_cell_expression())
+
+    events, batch = 0, []
+    for event in EventDetails.objects.only("id", "location").iterator(chunk_size=LOAD_BATCH_SIZE):
+        batch.append(event)
+        if len(batch) == LOAD_BATCH_SIZE:
+            locate_events(batch)
+            events += EventDetails.objects.bulk_update(batch, ["latitude", "longitude", "geo_cell"])
+            batch = []
+    if batch:
+        locate_events(batch)
+        events += EventDetails.objects.bulk_update(batch, ["latitude", "longitude", "geo_cell"])
+
+    bump_version("UserProfile", "EventDetails")
+    return profiles, events
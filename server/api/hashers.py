@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Django's hashers fix their cost as class attributes. These read it from
+# settings instead, so the cost can be tuned per deployment. Django rehashes a
+# stored password on the next successful login whenever must_update() sees
+# parameters that differ from these.
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    # Only an upper bound for hashlib; hashes made with older, larger
+    # parameters must still verify.
+    maxmem = 256 * 1024 * 1024
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Needs the optional argon2-cffi package."""
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
@@ -0,0 +1,321 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .availability import WORD_FIELDS, year_words
+from .background import run_after_commit
+from .dashboard import schedule_dashboard_refresh
+from .geo import locate_events, locate_profiles
+from .models import AvailabilityYear, EventDetails, EventSkills, ImportJob, Skill, User, UserAvailability, UserProfile, UserSkills
+from .search import index_objects
+from .serializers import EventDetailsSerializer, RegisterSerializer, UserProfileSerializer
+from .sync import resolve_skills
+from .versioning import bump_version
+
+# Records are read lazily and handled IMPORT_BATCH_SIZE at a time. Each batch
+# is validated with the API's own serializers, has its passwords hashed on a
+# process pool, and is written with one bulk insert per table in a single
+# transaction. Bulk inserts skip model signals, so the writers also do what
+# the signals would: coordinates, search index, bitmaps, versions.
+#
+# Uploads through the API are saved under IMPORT_ROOT and imported by a
+# background ImportJob that hashes in its own thread; only manage.py
+# import_records forks a hashing process pool.
+IMPORT_KINDS = ("volunteers", "events")
+IMPORT_FORMATS = ("csv", "jsonl")
+LIST_SEPARATOR = ";"
+MAX_REPORTED_ERRORS = 1000
+
+PROFILE_FIELDS = ("full_name", "address1", "address2", "city", "state", "zip_code", "preferences")
+EVENT_FIELDS = ("event_name", "description", "location", "urgency", "event_date")
+
+
+class ImportRegisterSerializer(RegisterSerializer):
+    # Email uniqueness is checked once per batch rather than once per row,
+    # so the field drops the model's unique validator.
+    email = serializers.EmailField(max_length=254)
+
+    def validate_email(self, value):
+        return User.objects.normalize_email(value)
+
+
+def import_format(name, fmt=None):
+    """The format of a file, given explicitly or taken from its extension."""
+    fmt = (fmt or name.rsplit(".", 1)[-1]).lower()
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError("The file must be .csv or .jsonl.")
+    return fmt
+
+
+def read_records(handle, fmt):
+    """
+    Yield one dict per record of a CSV file with a header row, or of a JSONL
+    file. A JSONL line that does not parse yields {"__error__": message}.
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(handle):
+            yield {key.strip(): (value or "").strip() for key, value in row.items() if key}
+        return
+    for line in handle:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            record = {"__error__": f"Invalid JSON: {exc}"}
+        yield record if isinstance(record, dict) else {"__error__": "Each line must be a JSON object."}
+
+
+def _as_list(value):
+    """A list field: a JSON array, or a ``;``-separated CSV cell."""
+    if value in (None, ""):
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _fields(record, names):
+    return {name: record[name] for name in names if record.get(name) not in (None, "")}
+
+
+def _skills(record, errors):
+    names = [" ".join(str(name).split()) for name in _as_list(record.get("skills"))]
+    if any(len(name) > 50 for name in names):
+        errors["skills"] = ["Skill names must be at most 50 characters."]
+    return [name for name in names if name]
+
+
+def _hash(passwords):
+    hasher = get_hasher("default")
+    return [hasher.encode(password, hasher.salt()) for password in passwords]
+
+
+@contextmanager
+def password_pool(workers):
+    """A process pool for hashing passwords, or None to hash in this process."""
+    if workers <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        yield pool
+
+
+def hash_passwords(passwords, pool=None, workers=1):
+    """Hash each password with the default hasher, spread over ``pool``."""
+    if pool is None or len(passwords) < 2:
+        return _hash(passwords)
+    # One chunk per worker: hashing dominates, so bigger chunks cost nothing.
+    size = -(-len(passwords) // workers)
+    chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+    return [encoded for chunk in pool.map(_hash, chunks) for encoded in chunk]
+
+
+def validate_volunteer(record):
+    """Return (entry, None) for a valid volunteer record or (None, errors)."""
+    errors = {}
+    register = ImportRegisterSerializer(data=_fields(record, ("email", "password")))
+    profile = UserProfileSerializer(data=_fields(record, PROFILE_FIELDS))
+    if not register.is_valid():
+        errors.update(register.errors)
+    if not profile.is_valid():
+        errors.update(profile.errors)
+    skills = _skills(record, errors)
+    try:
+        days = serializers.ListField(child=serializers.DateField()).run_validation(_as_list(record.get("availability")))
+    except serializers.ValidationError as exc:
+        errors["availability"] = exc.detail
+    if errors:
+        return None, errors
+    return {"user": register.validated_data, "profile": profile.validated_data, "skills": skills, "days": set(days)}, None
+
+
+def validate_event(record):
+    """Return (entry, None) for a valid event record or (None, errors)."""
+    errors = {}
+    event = EventDetailsSerializer(data=_fields(record, EVENT_FIELDS))
+    if not event.is_valid():
+        errors.update(event.errors)
+    skills = _skills(record, errors)
+    if errors:
+        return None, errors
+    return {"event": event.validated_data, "skills": skills}, None
+
+
+def _skill_ids(entries):
+    names = [name for entry in entries for name in entry["skills"]]
+    keys = list(dict.fromkeys(Skill.normalize(name) for name in names))
+    return dict(zip(keys, resolve_skills(names)))
+
+
+def unique_volunteers(rows, report):
+    """Drop and report rows whose email is taken, by an earlier row or an existing user."""
+    seen = set(User.objects.filter(email__in=[entry["user"]["email"] for _, entry in rows]).values_list("email", flat=True))
+    unique = []
+    for number, entry in rows:
+        email = entry["user"]["email"]
+        if email in seen:
+            report_error(report, number, {"email": ["A user with this email already exists."]})
+            continue
+        seen.add(email)
+        unique.append((number, entry))
+    return unique
+
+
+def write_volunteers(entries, pool, workers):
+    encoded = hash_passwords([entry["user"]["password"] for entry in entries], pool, workers)
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [User(email=entry["user"]["email"], password=password) for entry, password in zip(entries, encoded)]
+        )
+        profiles = [UserProfile(user=user, **entry["profile"]) for user, entry in zip(users, entries)]
+        locate_profiles(profiles)
+        profiles = UserProfile.objects.bulk_create(profiles)
+
+        skill_ids = _skill_ids(entries)
+        UserSkills.objects.bulk_create(
+            [
+                UserSkills(user_profile=profile, skill_id=skill_id)
+                for profile, entry in zip(profiles, entries)
+                for skill_id in {skill_ids[Skill.normalize(name)] for name in entry["skills"]}
+            ],
+            ignore_conflicts=True,
+        )
+        UserAvailability.objects.bulk_create(
+            [UserAvailability(user_profile=profile, date=day) for profile, entry in zip(profiles, entries) for day in entry["days"]]
+        )
+        AvailabilityYear.objects.bulk_create([
+            AvailabilityYear(user_profile=profile, year=year, **dict(zip(WORD_FIELDS, words)))
+            for profile, entry in zip(profiles, entries)
+            for year, words in year_words(entry["days"]).items()
+        ])
+        index_objects(UserProfile, profiles)
+        bump_version("UserProfile", "UserSkills", "UserAvailability")
+        schedule_dashboard_refresh(skill_profile_ids=[profile.pk for profile in profiles])
+    return len(profiles)
+
+
+def write_events(entries, pool, workers):
+    with transaction.atomic():
+        events = [EventDetails(**entry["event"]) for entry in entries]
+        locate_events(events)
+        events = EventDetails.objects.bulk_create(events)
+
+        skill_ids = _skill_ids(entries)
+        EventSkills.objects.bulk_create(
+            [
+                EventSkills(event=event, skill_id=skill_id)
+                for event, entry in zip(events, entries)
+                for skill_id in {skill_ids[Skill.normalize(name)] for name in entry["skills"]}
+            ],
+            ignore_conflicts=True,
+        )
+        index_objects(EventDetails, events)
+        bump_version("EventDetails", "EventSkills")
+        schedule_dashboard_refresh(event_ids=[event.pk for event in events], urgency=True)
+    return len(events)
+
+
+# kind: (validate one record, filter the batch's valid rows, write entries)
+IMPORTERS = {
+    "volunteers": (validate_volunteer, unique_volunteers, write_volunteers),
+    "events": (validate_event, lambda rows, report: rows, write_events),
+}
+
+
+def report_error(report, number, errors):
+    report["failed"] += 1
+    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+        report["errors"].append({"row": number, "errors": errors})
+
+
+def import_records(kind, records, batch_size=None, workers=None):
+    """
+    Validate and write ``records`` (dicts, as from read_records) of ``kind``
+    in batches. Rows that fail validation are reported by 1-based record
+    number and skipped without affecting the rest of their batch. Returns
+    {"created", "failed", "errors"}; at most MAX_REPORTED_ERRORS errors are
+    listed.
+    """
+    validate, check, write = IMPORTERS[kind]
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    workers = settings.IMPORT_HASH_WORKERS if workers is None else workers
+    report = {"created": 0, "failed": 0, "errors": []}
+    numbered = enumerate(records, start=1)
+
+    with password_pool(workers if kind == "volunteers" else 0) as pool:
+        while batch := list(islice(numbered, batch_size)):
+            rows = []
+            for number, record in batch:
+                entry, errors = (None, {"non_field_errors": [record["__error__"]]}) if "__error__" in record else validate(record)
+                if errors:
+                    report_error(report, number, errors)
+                else:
+                    rows.append((number, entry))
+            rows = check(rows, report) if rows else rows
+            if not rows:
+                continue
+            try:
+                report["created"] += write([entry for _, entry in rows], pool, workers)
+            except IntegrityError as exc:
+                # A concurrent write took a unique value after the batch was checked.
+                for number, _ in rows:
+                    report_error(report, number, {"non_field_errors": [f"Not saved: {exc}"]})
+    return report
+
+
+def import_root():
+    root = Path(settings.IMPORT_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def enqueue_import(kind, upload, fmt, user=None):
+    """
+    Save ``upload`` (a file of ``fmt``) and queue its import, on the
+    import-job thread pool or inline when IMPORT_JOB_WORKERS is 0.
+    Returns the ImportJob to poll.
+    """
+    job = ImportJob(kind=kind, requested_by_id=user.pk if user else None)
+    job.file_path = str(import_root() / f"{job.pk}.{fmt}")
+    with open(job.file_path, "wb") as output:
+        for chunk in upload.chunks():
+            output.write(chunk)
+    job.save()
+
+    if settings.IMPORT_JOB_WORKERS:
+        run_after_commit(run_import_job, job.pk, pool="import-job", workers=settings.IMPORT_JOB_WORKERS)
+    else:
+        run_import_job(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def run_import_job(job_id):
+    claimed = ImportJob.objects.filter(pk=job_id, status=ImportJob.PENDING).update(status=ImportJob.RUNNING)
+    if not claimed:
+        return
+
+    job = ImportJob.objects.get(pk=job_id)
+    try:
+        with open(job.file_path, encoding="utf-8-sig", newline="") as handle:
+            report = import_records(job.kind, read_records(handle, import_format(job.file_path)), workers=0)
+    except Exception as exc:
+        ImportJob.objects.filter(pk=job_id).update(status=ImportJob.FAILED, error=str(exc), finished_at=timezone.now())
+        return
+    finally:
+        if os.path.exists(job.file_path):
+            os.remove(job.file_path)
+
+    ImportJob.objects.filter(pk=job_id).update(status=ImportJob.DONE, report=report, finished_at=timezone.now())
@@ -0,0 +1,109 @@
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .background import run_after_commit
+from .models import ReportJob
+from .reports import render_events_pdf, render_volunteers_pdf
+from .versioning import data_version
+
+# Report kind -> (renderer, tables the report reads). The version stamp of a
+# report is the combined change counter of those tables.
+REPORT_SOURCES = {
+    ReportJob.EVENTS_PDF: (render_events_pdf, ("EventDetails", "EventSkills", "Skill", "VolunteerHistory", "UserProfile")),
+    ReportJob.VOLUNTEERS_PDF: (render_volunteers_pdf, ("VolunteerHistory", "EventDetails", "UserProfile")),
+}
+
+# Pending/running jobs older than this are assumed lost (e.g. the worker
+# process was restarted) and no longer deduplicate new requests.
+STALE_AFTER = timedelta(minutes=30)
+
+
+def report_root():
+    root = Path(settings.REPORT_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def report_version(kind):
+    return data_version(*REPORT_SOURCES[kind][1])
+
+
+def artifact_ready(job):
+    return job.status == ReportJob.DONE and bool(job.file_path) and os.path.exists(job.file_path)
+
+
+def cached_report(kind):
+    """Return the finished job for the current data version of ``kind``, if any."""
+    job = (
+        ReportJob.objects.filter(kind=kind, data_version=report_version(kind), status=ReportJob.DONE)
+        .order_by("-finished_at")
+        .first()
+    )
+    return job if job and artifact_ready(job) else None
+
+
+def enqueue_report(kind, user=None):
+    """
+    Return a job for ``kind`` at the current data version. A finished job with
+    its artifact on disk or a job still in flight is reused, so repeated
+    requests without a data change never render twice.
+    """
+    version = report_version(kind)
+    existing = (
+        ReportJob.objects.filter(kind=kind, data_version=version)
+        .exclude(status=ReportJob.FAILED)
+        .order_by("-created_at")
+        .first()
+    )
+    if existing:
+        if artifact_ready(existing):
+            return existing
+        if existing.status != ReportJob.DONE and existing.created_at > timezone.now() - STALE_AFTER:
+            return existing
+
+    job = ReportJob.objects.create(kind=kind, data_version=version, requested_by_id=user.pk if user else None)
+    if settings.REPORT_JOB_WORKERS:
+        run_after_commit(run_report_job, job.pk, pool="report-job", workers=settings.REPORT_JOB_WORKERS)
+    else:
+        run_report_job(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def run_report_job(job_id):
+    claimed = ReportJob.objects.filter(pk=job_id, status=ReportJob.PENDING).update(status=ReportJob.RUNNING)
+    if not claimed:
+        return
+
+    job = ReportJob.objects.get(pk=job_id)
+    render, _ = REPORT_SOURCES[job.kind]
+    root = report_root()
+    path = root / f"{job.kind}-{job.data_version}.pdf"
+
+    fd, tmp_path = tempfile.mkstemp(dir=root, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as output:
+            render(output)
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        ReportJob.objects.filter(pk=job_id).update(status=ReportJob.FAILED, error=str(exc), finished_at=timezone.now())
+        return
+
+    ReportJob.objects.filter(pk=job_id).update(status=ReportJob.DONE, file_path=str(path), finished_at=timezone.now())
+    prune_reports(job.kind, keep_version=job.data_version)
+
+
+def prune_reports(kind, keep_version):
+    """Drop artifacts of ``kind`` built from data versions that are now stale."""
+    stale = ReportJob.objects.filter(kind=kind, status=ReportJob.DONE).exclude(data_version=keep_version)
+    for file_path in stale.values_list("file_path", flat=True):
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+    stale.delete()
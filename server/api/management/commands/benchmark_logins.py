@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+PASSWORD = "correct horse battery staple"
+
+
+def verify_for(hasher_path, encoded, seconds):
+    """Check ``encoded`` against PASSWORD until ``seconds`` pass; return the count."""
+    hasher = import_string(hasher_path)()
+    checks = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if not hasher.verify(PASSWORD, encoded):
+            raise RuntimeError("benchmark hash failed to verify")
+        checks += 1
+    return checks
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password checks per second, per core and in total, for a "
+        "hasher at the cost parameters currently configured. A password check "
+        "is nearly all of the CPU a login spends."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hasher", choices=sorted(settings.PASSWORD_HASHER_CLASSES), default=settings.PASSWORD_HASHER)
+        parser.add_argument("--seconds", type=float, default=5.0, help="How long each process runs.")
+        parser.add_argument("--processes", type=int, default=1, help="Parallel processes, at most one per core.")
+
+    def handle(self, *args, **options):
+        hasher_path = settings.PASSWORD_HASHER_CLASSES[options["hasher"]]
+        hasher = import_string(hasher_path)()
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        processes, seconds = options["processes"], options["seconds"]
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            counts = list(pool.map(verify_for, [hasher_path] * processes, [encoded] * processes, [seconds] * processes))
+
+        total = sum(counts) / seconds
+        params = {key: value for key, value in hasher.safe_summary(encoded).items() if key not in ("salt", "hash")}
+        self.stdout.write(f"hasher:    {options['hasher']} {params}")
+        self.stdout.write(f"processes: {processes}")
+        self.stdout.write(f"per core:  {total / processes:.1f} logins/sec ({1000 * processes / total:.1f} ms each)")
+        self.stdout.write(f"total:     {total:.1f} logins/sec")
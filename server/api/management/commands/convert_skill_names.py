@@ -0,0 +1,123 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.models import EventSkills, Skill, UserSkills
+from api.sync import BULK_BATCH_SIZE, resolve_skills
+from api.versioning import bump_version
+
+# Link rows are parked here between the two runs, keyed by the link table.
+HOLDING_TABLE = "api_legacy_skill_links"
+
+# Link model -> the owner column it had before the skill catalog.
+LINK_MODELS = {UserSkills: "user_profile_id", EventSkills: "event_id"}
+
+
+def _columns(table):
+    with connection.cursor() as cursor:
+        return {column.name for column in connection.introspection.get_table_description(cursor, table)}
+
+
+def stash_legacy_links():
+    """
+    Copy every (owner, name) link out of link tables that still hold skill
+    names into the holding table, then empty them so the schema change that
+    replaces ``name`` with a ``skill`` foreign key has no rows to convert.
+    Returns the number of links parked, or None if there was nothing to do.
+    """
+    tables = connection.introspection.table_names()
+    legacy = [
+        (model._meta.db_table, owner)
+        for model, owner in LINK_MODELS.items()
+        if model._meta.db_table in tables and "name" in _columns(model._meta.db_table)
+    ]
+    if not legacy:
+        return None
+
+    quote = connection.ops.quote_name
+    count = 0
+    with connection.cursor() as cursor:
+        if HOLDING_TABLE not in tables:
+            cursor.execute(
+                f"CREATE TABLE {quote(HOLDING_TABLE)} ("
+                "link_table varchar(100) NOT NULL, owner_id integer NOT NULL, name varchar(255) NOT NULL)"
+            )
+        for table, owner in legacy:
+            cursor.execute(
+                f"INSERT INTO {quote(HOLDING_TABLE)} (link_table, owner_id, name) "
+                f"SELECT %s, {quote(owner)}, {quote('name')} FROM {quote(table)}",
+                [table],
+            )
+            count += cursor.rowcount
+            cursor.execute(f"DELETE FROM {quote(table)}")
+    return count
+
+
+def restore_legacy_links():
+    """
+    Intern the parked names into the skill catalog (case-insensitively, so
+    "Cooking" and "cooking " become one skill) and recreate the links against
+    it, one per owner and skill. Drops the holding table. Returns the number
+    of links written, or None if nothing was parked.
+    """
+    if HOLDING_TABLE not in connection.introspection.table_names():
+        return None
+
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT link_table, owner_id, name FROM {quote(HOLDING_TABLE)}")
+        rows = cursor.fetchall()
+
+    names = {}
+    for _, _, name in rows:
+        key = Skill.normalize(name)
+        if key:
+            names.setdefault(key, name)
+    ids = dict(zip(names, resolve_skills(names.values())))
+
+    links = defaultdict(set)
+    for table, owner_id, name in rows:
+        key = Skill.normalize(name)
+        if key:
+            links[table].add((owner_id, ids[key]))
+
+    count = 0
+    for model, owner in LINK_MODELS.items():
+        pairs = links.get(model._meta.db_table, ())
+        model.objects.bulk_create(
+            [model(**{owner: owner_id, "skill_id": skill_id}) for owner_id, skill_id in pairs],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        count += len(pairs)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {quote(HOLDING_TABLE)}")
+    bump_version(*(model.__name__ for model in LINK_MODELS))
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        "Carry skill links stored by name over to the skill catalog. Run it "
+        "once before migrating to the catalog schema: it parks the old links "
+        "and empties the link tables, so makemigrations' one-off default for "
+        "the new skill column (any value, e.g. 1) is never applied. Run it "
+        "again after migrate to intern the names and recreate the links. Then "
+        "run rebuild_dashboard to recount skill coverage."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            parked = stash_legacy_links()
+            if parked is not None:
+                self.stdout.write(
+                    f"Parked {parked} skill links. Run makemigrations and migrate, then run this command again."
+                )
+                return
+            restored = restore_legacy_links()
+        if restored is None:
+            self.stdout.write("No skill links to convert.")
+        else:
+            self.stdout.write(f"Restored {restored} skill links.")
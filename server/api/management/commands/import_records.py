@@ -0,0 +1,38 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.imports import IMPORT_FORMATS, IMPORT_KINDS, import_format, import_records, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Import volunteers or events from a CSV (with a header row) or JSONL file, "
+        "validated with the same rules as the API. List columns (skills, "
+        "availability) are JSON arrays or ';'-separated cells. Invalid rows are "
+        "reported and skipped; every valid row is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=IMPORT_KINDS)
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file's extension.")
+        parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=settings.IMPORT_HASH_WORKERS, help="Password hashing processes.")
+
+    def handle(self, *args, **options):
+        try:
+            fmt = import_format(options["path"], options["format"])
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as handle:
+            report = import_records(
+                options["kind"], read_records(handle, fmt),
+                batch_size=options["batch_size"], workers=options["workers"],
+            )
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(f"Imported {report['created']} {options['kind']}; {report['failed']} rows failed.")
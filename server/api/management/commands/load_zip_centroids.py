@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from api.geo import backfill_coordinates, load_centroids, read_centroids
+
+
+class Command(BaseCommand):
+    help = (
+        "Load ZIP code centroids from a US Census ZCTA gazetteer file (or a CSV "
+        "with zip_code, latitude and longitude columns) and set coordinates on "
+        "existing profiles and events. Safe to re-run with a newer file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Gazetteer .txt or CSV file to load.")
+        parser.add_argument(
+            "--no-backfill", action="store_true", help="Only load centroids; leave profiles and events as they are."
+        )
+
+    def handle(self, *args, **options):
+        count = load_centroids(read_centroids(options["path"]))
+        self.stdout.write(f"Loaded {count} ZIP centroids.")
+        if not options["no_backfill"]:
+            profiles, events = backfill_coordinates()
+            self.stdout.write(f"Located {profiles} profiles and {events} events.")
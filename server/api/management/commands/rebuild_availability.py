@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.availability import rebuild_availability
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild every volunteer's availability bitmaps from their availability "
+        "dates. The availability endpoint keeps them current; run this after "
+        "loading or deleting availability rows outside it."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_availability()
+        self.stdout.write(f"Rebuilt {count} availability bitmaps.")
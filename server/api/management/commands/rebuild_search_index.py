@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.search import SEARCH_INDEXES, install_search_indexes, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Create any missing full-text index and, on SQLite, re-fill the FTS "
+        "tables from their models. Saves keep the index current; run this "
+        "after writes that bypass model signals, such as bulk_create or update()."
+    )
+
+    def handle(self, *args, **options):
+        install_search_indexes()
+        with transaction.atomic():
+            for kind, (model, _) in SEARCH_INDEXES.items():
+                count = rebuild_search_index(model)
+                self.stdout.write(f"Indexed {count} {kind}.")
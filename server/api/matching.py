@@ -0,0 +1,118 @@
+import heapq
+import re
+
+from django.utils import timezone
+
+from .availability import available_profile_ids
+from .models import UserProfile, UserSkills
+
+SKILL_WEIGHT = 3.0
+AVAILABILITY_WEIGHT = 2.0
+PROXIMITY_WEIGHT = 1.0
+
+ZIP_RE = re.compile(r"\b(\d{5})(?:-?\d{4})?\b")
+STATE_RE = re.compile(r"\b([A-Z]{2})\b")
+STATE_CODES = {code for code, _ in UserProfile.STATE_CHOICES}
+
+
+def parse_location(location):
+    """Pull a (state, zip5) pair out of a free-text event location."""
+    location = location or ""
+    zip_match = ZIP_RE.search(location)
+    state = next((code for code in STATE_RE.findall(location) if code in STATE_CODES), None)
+    return state, zip_match.group(1) if zip_match else None
+
+
+def proximity_score(state, zip_code, event_state, event_zip):
+    zip5 = (zip_code or "")[:5]
+    if event_zip and zip5 == event_zip:
+        return 1.0
+    if event_zip and zip5[:3] == event_zip[:3]:
+        return 0.5
+    if event_state and state == event_state:
+        return 0.25
+    return 0.0
+
+
+class Candidate:
+    __slots__ = ("profile_id", "state", "zip_code", "skills", "available")
+
+    def __init__(self, profile_id, state, zip_code):
+        self.profile_id = profile_id
+        self.state = state
+        self.zip_code = zip_code
+        self.skills = set()
+        self.available = False
+
+
+def collect_candidates(skill_ids, event_day):
+    """
+    Walk the skill->profile index and the availability bitmaps and return
+    the profiles that hit either one. The skill lookup is an index range scan
+    on (skill, user_profile), so its work is proportional to the number of
+    hits; the availability test reads one small bitmap row per volunteer.
+    """
+    candidates = {}
+
+    def candidate(profile_id, state, zip_code):
+        entry = candidates.get(profile_id)
+        if entry is None:
+            entry = candidates[profile_id] = Candidate(profile_id, state, zip_code)
+        return entry
+
+    if skill_ids:
+        rows = UserSkills.objects.filter(skill_id__in=skill_ids).values_list(
+            "user_profile_id", "skill_id", "user_profile__state", "user_profile__zip_code"
+        )
+        for profile_id, skill_id, state, zip_code in rows.iterator(chunk_size=2000):
+            candidate(profile_id, state, zip_code).skills.add(skill_id)
+
+    rows = UserProfile.objects.filter(id__in=available_profile_ids(event_day)).values_list(
+        "id", "state", "zip_code"
+    )
+    for profile_id, state, zip_code in rows.iterator(chunk_size=2000):
+        candidate(profile_id, state, zip_code).available = True
+
+    return candidates
+
+
+def score_candidate(entry, skill_ids, event_state, event_zip):
+    skill_fraction = len(entry.skills) / len(skill_ids) if skill_ids else 0.0
+    proximity = proximity_score(entry.state, entry.zip_code, event_state, event_zip)
+    return (
+        SKILL_WEIGHT * skill_fraction
+        + AVAILABILITY_WEIGHT * entry.available
+        + PROXIMITY_WEIGHT * proximity
+    ), proximity
+
+
+def match_volunteers(event, limit=10):
+    """
+    Rank volunteers for ``event`` and return the ``limit`` best as a list of
+    dicts holding the profile, its score and the parts that made it up.
+    """
+    skill_names = dict(event.required_skills.values_list("skill_id", "skill__name"))
+    event_day = timezone.localtime(event.event_date).date()
+    event_state, event_zip = parse_location(event.location)
+
+    candidates = collect_candidates(set(skill_names), event_day)
+
+    def ranked():
+        for entry in candidates.values():
+            score, proximity = score_candidate(entry, skill_names, event_state, event_zip)
+            yield score, -entry.profile_id, entry, proximity
+
+    top = heapq.nlargest(limit, ranked(), key=lambda item: item[:2])
+    profiles = UserProfile.objects.in_bulk([entry.profile_id for _, _, entry, _ in top])
+
+    return [
+        {
+            "profile": profiles[entry.profile_id],
+            "score": round(score, 4),
+            "matched_skills": sorted(skill_names[skill_id] for skill_id in entry.skills),
+            "available": entry.available,
+            "proximity": proximity,
+        }
+        for score, _, entry, proximity in top
+        if entry.profile_id in profiles
+    ]
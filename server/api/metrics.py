@@ -0,0 +1,235 @@
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, JsonResponse
+
+from .cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestStats:
+    __slots__ = ("queries", "sql_seconds", "started", "view_done", "rendered")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.started = time.perf_counter()
+        self.view_done = None
+        self.rendered = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - start
+            self.queries += 1
+
+    @property
+    def serialization_seconds(self):
+        if self.view_done is None or self.rendered is None:
+            return 0.0
+        return self.rendered - self.view_done
+
+
+class EndpointStats:
+    __slots__ = ("requests", "statuses", "queries", "max_queries", "sql_seconds", "serialization_seconds", "wall_seconds", "buckets")
+
+    def __init__(self):
+        self.requests = 0
+        self.statuses = defaultdict(int)
+        self.queries = 0
+        self.max_queries = 0
+        self.sql_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(EndpointStats)
+
+    def record(self, endpoint, method, status_code, stats, wall_seconds):
+        with self._lock:
+            entry = self._endpoints[(endpoint, method)]
+            entry.requests += 1
+            entry.statuses[status_code] += 1
+            entry.queries += stats.queries
+            entry.max_queries = max(entry.max_queries, stats.queries)
+            entry.sql_seconds += stats.sql_seconds
+            entry.serialization_seconds += stats.serialization_seconds
+            entry.wall_seconds += wall_seconds
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if wall_seconds <= bound:
+                    entry.buckets[i] += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self):
+        with self._lock:
+            copies = []
+            for key, entry in sorted(self._endpoints.items()):
+                copy = EndpointStats()
+                for name in EndpointStats.__slots__:
+                    setattr(copy, name, getattr(entry, name))
+                copy.statuses = dict(entry.statuses)
+                copy.buckets = list(entry.buckets)
+                copies.append((key, copy))
+            return copies
+
+    def render(self):
+        """Format the collected numbers in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(endpoint, method, **extra):
+            pairs = {"endpoint": endpoint, "method": method, **extra}
+            return "{" + ",".join(f'{key}="{value}"' for key, value in pairs.items()) + "}"
+
+        family("api_requests_total", "counter", "Requests handled, by endpoint and status.")
+        for (endpoint, method), entry in snapshot:
+            for code, count in sorted(entry.statuses.items()):
+                lines.append(f"api_requests_total{labels(endpoint, method, status=code)} {count}")
+
+        family("api_request_queries_total", "counter", "SQL queries executed while handling requests.")
+        for (endpoint, method), entry in snapshot:
+            lines.append(f"api_request_queries_total{labels(endpoint, method)} {entry.queries}")
+
+        family("api_request_queries_max", "gauge", "Most SQL queries executed by a single request.")
+        for (endpoint, method), entry in snapshot:
+            lines.append(f"api_request_queries_max{labels(endpoint, method)} {entry.max_queries}")
+
+        family("api_request_sql_seconds_total", "counter", "Time spent executing SQL.")
+        for (endpoint, method), entry in snapshot:
+            lines.append(f"api_request_sql_seconds_total{labels(endpoint, method)} {entry.sql_seconds:.6f}")
+
+        family("api_request_serialization_seconds_total", "counter", "Time spent rendering response bodies.")
+        for (endpoint, method), entry in snapshot:
+            lines.append(f"api_request_serialization_seconds_total{labels(endpoint, method)} {entry.serialization_seconds:.6f}")
+
+        family("api_request_duration_seconds", "histogram", "Wall time per request.")
+        for (endpoint, method), entry in snapshot:
+            for bound, count in zip(DURATION_BUCKETS, entry.buckets):
+                lines.append(f"api_request_duration_seconds_bucket{labels(endpoint, method, le=bound)} {count}")
+            lines.append(f"api_request_duration_seconds_bucket{labels(endpoint, method, le='+Inf')} {entry.requests}")
+            lines.append(f"api_request_duration_seconds_sum{labels(endpoint, method)} {entry.wall_seconds:.6f}")
+            lines.append(f"api_request_duration_seconds_count{labels(endpoint, method)} {entry.requests}")
+
+        # Counted by this worker only, whatever the cache backend; the pid
+        # label keeps scrapes of different workers apart.
+        cache_stats = response_cache.process_stats()
+        pid = f'{{pid="{os.getpid()}"}}'
+        family("api_response_cache_process_hits_total", "counter", "Response cache hits in this worker process.")
+        lines.append(f"api_response_cache_process_hits_total{pid} {cache_stats['hits']}")
+        family("api_response_cache_process_misses_total", "counter", "Response cache misses in this worker process.")
+        lines.append(f"api_response_cache_process_misses_total{pid} {cache_stats['misses']}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def query_budget(endpoint, method):
+    budgets = getattr(settings, "QUERY_BUDGETS", {})
+    return budgets.get(f"{endpoint}:{method}", budgets.get(endpoint))
+
+
+class QueryMetricsMiddleware:
+    """
+    Records query count, SQL time, serialization time and wall time for every
+    request routed to a named URL, and checks the count against QUERY_BUDGETS.
+    Over-budget requests are logged, or raise QueryBudgetExceeded when
+    QUERY_BUDGET_ENFORCE is set (as it is in the test suite).
+
+    Runs natively under both WSGI and ASGI, so async views such as the
+    notification stream are not adapted to sync on every request.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        with connection.execute_wrapper(stats):
+            request._query_stats = stats
+            response = self.get_response(request)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        # Sync views run on the request's thread-sensitive sync thread, which
+        # has its own connection, so the wrapper is installed there.
+        stats = RequestStats()
+        request._query_stats = stats
+        await sync_to_async(lambda: connection.execute_wrappers.append(stats))()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(lambda: connection.execute_wrappers.remove(stats))()
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats):
+        wall_seconds = time.perf_counter() - stats.started
+
+        match = getattr(request, "resolver_match", None)
+        if match is None or not match.url_name or match.url_name == "metrics":
+            return response
+
+        endpoint, method = match.url_name, request.method
+        registry.record(endpoint, method, response.status_code, stats, wall_seconds)
+
+        budget = query_budget(endpoint, method)
+        if budget is not None and stats.queries > budget:
+            message = f"{method} {endpoint} ran {stats.queries} queries (budget {budget})"
+            if getattr(settings, "QUERY_BUDGET_ENFORCE", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_template_response(self, request, response):
+        stats = getattr(request, "_query_stats", None)
+        if stats is not None:
+            stats.view_done = time.perf_counter()
+            response.add_post_render_callback(lambda rendered: setattr(stats, "rendered", time.perf_counter()))
+        return response
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the recorded metrics. Scrapers authenticate
+    with ``Authorization: Bearer <METRICS_TOKEN>``; with no token configured
+    the endpoint is closed.
+    """
+    token = settings.METRICS_TOKEN
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    if not token or not hmac.compare_digest(supplied.encode(), token.encode()):
+        return JsonResponse({"error": "A valid metrics token is required."}, status=401)
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,3 +1,4 @@
+import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 
@@ -99,21 +100,132 @@ class UserProfile(models.Model):
 
     zip_code = models.CharField(max_length=9)
     preferences = models.TextField(blank=True, null=True)
+    # Centroid of zip_code, filled in on save from ZipCentroid.
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Grid bucket of (latitude, longitude); see api.geo.grid_cell.
+    geo_cell = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["state", "zip_code"], name="profile_state_zip_idx"),
+            models.Index(fields=["zip_code"], name="profile_zip_idx"),
+            models.Index(fields=["geo_cell"], name="profile_geo_cell_idx"),
+        ]
 
     def __str__(self):
         return self.full_name
     
+class ZipCentroid(models.Model):
+    zip_code = models.CharField(max_length=5, primary_key=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    def __str__(self):
+        return self.zip_code
+
 class UserAvailability(models.Model):
     user_profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="availabilities")
     date = models.DateField()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_profile", "date"], name="unique_user_availability"),
+        ]
+        indexes = [
+            models.Index(fields=["date", "user_profile"], name="availability_date_profile_idx"),
+        ]
+
     def __str__(self):
         return self.date
-    
-class UserSkills(models.Model):
+
+class AvailabilityYear(models.Model):
+    """
+    One profile's availability for one calendar year as a day-of-year bitmap,
+    kept alongside the UserAvailability rows it is built from. The 366 bits
+    are split over six 61-bit integer columns so range questions are integer
+    ``&`` tests the database can evaluate; see api/availability.py.
+    """
+    user_profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="availability_years")
+    year = models.PositiveSmallIntegerField()
+    days0 = models.BigIntegerField(default=0)
+    days1 = models.BigIntegerField(default=0)
+    days2 = models.BigIntegerField(default=0)
+    days3 = models.BigIntegerField(default=0)
+    days4 = models.BigIntegerField(default=0)
+    days5 = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_profile", "year"], name="unique_availability_year"),
+        ]
+        indexes = [
+            models.Index(fields=["year", "user_profile"], name="availyear_year_profile_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_profile_id} {self.year}"
+
+class SkillManager(models.Manager):
+    def intern(self, name):
+        """Return the catalog entry for ``name``, matched case-insensitively, creating it if needed."""
+        name = " ".join(name.split())
+        skill, _ = self.get_or_create(key=Skill.normalize(name), defaults={"name": name})
+        return skill
+
+
+class Skill(models.Model):
     name = models.CharField(max_length=50)
+    key = models.CharField(max_length=50, unique=True)
+
+    objects = SkillManager()
+
+    @staticmethod
+    def normalize(name):
+        return " ".join(name.split()).casefold()
+
+    def save(self, *args, **kwargs):
+        self.key = self.normalize(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillLinkManager(models.Manager):
+    """
+    Manager for the skill through tables. Rows always load their catalog
+    entry in the same query, so prefetching them and reading ``name`` stays
+    one query, and links can be created by name:
+    ``objects.create(event=event, name="Cooking")``.
+    """
+    def get_queryset(self):
+        return super().get_queryset().select_related("skill")
+
+    def create(self, name=None, **kwargs):
+        if name is not None:
+            kwargs["skill"] = Skill.objects.intern(name)
+        return super().create(**kwargs)
+
+
+class UserSkills(models.Model):
+    skill = models.ForeignKey(Skill, on_delete=models.PROTECT, related_name="user_links")
     user_profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="skills")
 
+    objects = SkillLinkManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_profile", "skill"], name="unique_user_skill"),
+        ]
+        indexes = [
+            models.Index(fields=["skill", "user_profile"], name="userskill_skill_profile_idx"),
+        ]
+
+    @property
+    def name(self):
+        return self.skill.name
+
     def __str__(self):
         return self.name
     
@@ -125,6 +237,17 @@ class EventDetails(models.Model):
     location = models.CharField(max_length=100)
     urgency = models.CharField(max_length=100)
     event_date = models.DateTimeField()
+    # Centroid of the ZIP code found in location, filled in on save.
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["event_date"], name="event_date_idx"),
+            models.Index(fields=["urgency", "event_date"], name="event_urgency_date_idx"),
+            models.Index(fields=["geo_cell"], name="event_geo_cell_idx"),
+        ]
 
     def __str__(self):
         return self.event_name
@@ -135,14 +258,37 @@ class VolunteerHistory(models.Model):
     event = models.ForeignKey(EventDetails, on_delete=models.CASCADE, related_name="volunteers")
     status = models.CharField(max_length=100, default="Pending")
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_profile", "event"], name="unique_volunteer_history"),
+        ]
+        indexes = [
+            models.Index(fields=["event", "status"], name="history_event_status_idx"),
+            models.Index(fields=["status", "event"], name="history_status_event_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user_profile.full_name} - {self.event.event_name}"
     
 # Relational Entity that links skills to events.
 class EventSkills(models.Model):
-    name = models.CharField(max_length=50)
+    skill = models.ForeignKey(Skill, on_delete=models.PROTECT, related_name="event_links")
     event = models.ForeignKey(EventDetails, on_delete=models.CASCADE, related_name="required_skills")
 
+    objects = SkillLinkManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "skill"], name="unique_event_skill"),
+        ]
+        indexes = [
+            models.Index(fields=["skill", "event"], name="eventskill_skill_event_idx"),
+        ]
+
+    @property
+    def name(self):
+        return self.skill.name
+
     def __str__(self):
         return self.name
 
@@ -151,4 +297,117 @@ class Notifications(models.Model):
     message = models.TextField()
 
     def __str__(self):
-        return self.message
\ No newline at end of file
+        return self.message
+
+# Per-table change counters, bumped on every write so caches and report
+# artifacts can tell whether the data they were built from is still current.
+class DataVersion(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}@{self.version}"
+
+class ReportJob(models.Model):
+    EVENTS_PDF = "events-pdf"
+    VOLUNTEERS_PDF = "volunteers-pdf"
+    KIND_CHOICES = [
+        (EVENTS_PDF, "Events PDF"),
+        (VOLUNTEERS_PDF, "Volunteer History PDF"),
+    ]
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    data_version = models.CharField(max_length=100)
+    file_path = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="report_jobs")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["kind", "data_version", "status"], name="reportjob_lookup_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} ({self.status})"
+
+# An uploaded import file, written batch by batch off the request by api.imports.
+class ImportJob(models.Model):
+    KIND_CHOICES = [
+        ("volunteers", "Volunteers"),
+        ("events", "Events"),
+    ]
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = ReportJob.STATUS_CHOICES
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    file_path = models.CharField(max_length=255, blank=True)
+    report = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="import_jobs")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} import ({self.status})"
+
+# Dashboard aggregates, kept current by api.dashboard so reads never scan the
+# history table.
+class EventStats(models.Model):
+    event = models.OneToOneField(EventDetails, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    volunteers = models.PositiveIntegerField(default=0)
+    required_skills = models.PositiveIntegerField(default=0)
+    covered_skills = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def fill_ratio(self):
+        """Share of the event's required skills held by at least one assigned volunteer."""
+        if not self.required_skills:
+            return 1.0
+        return self.covered_skills / self.required_skills
+
+    def __str__(self):
+        return f"{self.event_id}: {self.volunteers} volunteers"
+
+class DashboardCounter(models.Model):
+    URGENCY = "urgency"
+    STATE = "state"
+    KIND_CHOICES = [
+        (URGENCY, "Events by urgency"),
+        (STATE, "Participation by state"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    key = models.CharField(max_length=100)
+    value = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "key"], name="unique_dashboard_counter"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.key} = {self.value}"
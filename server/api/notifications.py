@@ -0,0 +1,211 @@
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .background import run_after_commit
+from .models import Notifications, VolunteerHistory
+from .profiles import load_profile
+
+KEEPALIVE_SECONDS = 15
+FANOUT_BATCH_SIZE = 1000
+QUEUE_SIZE = 100
+RESYNC = object()
+
+
+class Subscription:
+    """One open stream: a bounded queue owned by the event loop serving it."""
+    __slots__ = ("profile_id", "loop", "queue")
+
+    def __init__(self, profile_id, loop):
+        self.profile_id = profile_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def push(self, payload):
+        # A stream that falls this far behind drops its queue and catches up
+        # from the table instead of letting the queue grow without bound.
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+        else:
+            self.queue.put_nowait(payload)
+
+
+class NotificationBroker:
+    """
+    In-process fan-out from the code that creates notifications to the open
+    streams of their recipients. Publishing is thread-safe, so sync views
+    running in worker threads can hand payloads to the ASGI event loop.
+
+    This only reaches streams held by the same process. Notifications written
+    by other workers, jobs or commands are picked up by each stream polling
+    the table every NOTIFICATION_POLL_SECONDS (see event_stream).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, profile_id):
+        subscription = Subscription(profile_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[profile_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.profile_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.profile_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, profile_id, payload):
+        with self._lock:
+            subscribers = list(self._subscribers.get(profile_id, ()))
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.push, payload)
+
+
+broker = NotificationBroker()
+
+
+def notification_payload(notification):
+    return {"id": notification.id, "user_profile": notification.user_profile_id, "message": notification.message}
+
+
+def publish_notifications(notifications):
+    """Push saved notifications to their recipients once the transaction commits."""
+    payloads = [notification_payload(notification) for notification in notifications]
+
+    def send():
+        for payload in payloads:
+            broker.publish(payload["user_profile"], payload)
+
+    transaction.on_commit(send)
+
+
+def notify_event_volunteers(event_id, message):
+    """
+    Create one notification per volunteer assigned to ``event_id``. Recipients
+    come from a single streamed query and rows are written with one
+    bulk_create per batch of FANOUT_BATCH_SIZE.
+    """
+    profile_ids = (
+        VolunteerHistory.objects.filter(event_id=event_id)
+        .values_list("user_profile_id", flat=True)
+        .iterator(chunk_size=FANOUT_BATCH_SIZE)
+    )
+    with transaction.atomic():
+        batch = []
+        for profile_id in profile_ids:
+            batch.append(Notifications(user_profile_id=profile_id, message=message))
+            if len(batch) == FANOUT_BATCH_SIZE:
+                publish_notifications(Notifications.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            publish_notifications(Notifications.objects.bulk_create(batch))
+
+
+def fan_out_event_update(event):
+    """Notify the event's volunteers after the current transaction commits."""
+    message = f"Event '{event.event_name}' has been updated. Please check the details."
+    run_after_commit(
+        notify_event_volunteers, event.pk, message,
+        pool="notification-fanout", workers=settings.NOTIFICATION_FANOUT_WORKERS,
+    )
+
+
+def format_event(payload):
+    return f"id: {payload['id']}\nevent: notification\ndata: {json.dumps(payload)}\n\n"
+
+
+def authenticate_stream(request):
+    """
+    Resolve the user from the Authorization header or, because EventSource
+    cannot set headers, from a ``?token=`` access token.
+    """
+    auth = JWTStatelessUserAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else request.GET.get("token")
+    if not raw_token:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+def profile_id_for(user):
+    if user.profile_id is not None:
+        return user.profile_id
+    profile = load_profile(user.pk)
+    return profile.id if profile else None
+
+
+def backlog(profile_id, since):
+    notifications = Notifications.objects.filter(user_profile_id=profile_id, id__gt=since).order_by("id")
+    return [notification_payload(notification) for notification in notifications]
+
+
+def latest_id(profile_id):
+    return Notifications.objects.filter(user_profile_id=profile_id).aggregate(latest=Max("id"))["latest"] or 0
+
+
+async def event_stream(subscription, since=None):
+    """
+    Yield server-sent events for ``subscription``. Notifications published in
+    this process arrive on its queue at once. Every NOTIFICATION_POLL_SECONDS
+    without one, and whenever the queue overflowed, the stream reads rows
+    after its cursor, which delivers notifications written by other processes.
+    """
+    profile_id = subscription.profile_id
+    cursor = since if since is not None else await sync_to_async(latest_id)(profile_id)
+    # Ids pushed from the queue ahead of the cursor. The next poll skips them
+    # but still delivers lower ids that other processes wrote meanwhile.
+    pushed = set()
+    try:
+        yield f"retry: {KEEPALIVE_SECONDS * 1000}\n\n"
+        payload = RESYNC if since is not None else None
+        last_write = time.monotonic()
+        while True:
+            if payload is RESYNC:
+                payloads = await sync_to_async(backlog)(profile_id, cursor)
+                if payloads:
+                    cursor = payloads[-1]["id"]
+                payloads = [row for row in payloads if row["id"] not in pushed]
+                pushed = {pushed_id for pushed_id in pushed if pushed_id > cursor}
+            elif payload is not None and payload["id"] > cursor and payload["id"] not in pushed:
+                pushed.add(payload["id"])
+                payloads = [payload]
+            else:
+                payloads = []
+
+            for payload in payloads:
+                yield format_event(payload)
+            if payloads:
+                last_write = time.monotonic()
+            elif time.monotonic() - last_write >= KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                last_write = time.monotonic()
+
+            try:
+                payload = await asyncio.wait_for(subscription.queue.get(), timeout=settings.NOTIFICATION_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                payload = RESYNC
+    finally:
+        broker.unsubscribe(subscription)
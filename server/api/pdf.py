@@ -0,0 +1,233 @@
+import hashlib
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+
+# ReportLab keeps every finished page in memory until save(). PageStream
+# instead takes each page's content stream as soon as the page is complete
+# and writes it straight out, so memory stays bounded by one page plus the
+# xref offsets. Only the standard Type 1 fonts are used, which need no
+# embedding, so the font objects can be written at the end.
+#
+# Report content is laid out as blocks: a list of flowables rendered once at
+# the origin and kept as PDF operators. Drawing code inside a block is
+# position independent, so a cached block is placed on any page with one
+# translation. Blocks are cached by a hash of their content and LAYOUT_VERSION;
+# bump LAYOUT_VERSION whenever styles or geometry change.
+#
+# Cached operators name fonts by resource (/F1, /F2, ...), so every font a
+# block can select is registered up front in a fixed order. That includes the
+# substitution fonts ReportLab switches to for characters outside the base
+# font's encoding (Symbol, and ZapfDingbats for the notdef glyph).
+#
+# _PageCanvas and PageStream.close rely on Canvas internals (_code, _preamble,
+# _startPage, _doc.getInternalFontName, _doc.fontMapping) that ReportLab does
+# not document. requirements.txt pins REPORTLAB_VERSION exactly, and the
+# report tests fail on any other release and parse the output with pypdf, so
+# an upgrade is a deliberate change re-checked against a real reader.
+REPORTLAB_VERSION = "4.3.1"
+LAYOUT_VERSION = 2
+FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+# Fonts with a built-in encoding take no /Encoding entry.
+_BUILTIN_ENCODINGS = ("SymbolEncoding", "ZapfDingbatsEncoding")
+
+
+def _all_fonts():
+    names = list(FONTS)
+    for name in FONTS:
+        for font in pdfmetrics.getFont(name).substitutionFonts:
+            if font.fontName not in names:
+                names.append(font.fontName)
+    return names
+PAGE_SIZE = letter
+MARGIN = 40
+BLOCK_GAP = 12
+
+
+class _PageCanvas(canvas.Canvas):
+    """A canvas that hands each finished page to ``on_page`` instead of keeping it."""
+
+    def __init__(self, on_page, **kwargs):
+        super().__init__(None, pagesize=PAGE_SIZE, **kwargs)
+        self._on_page = on_page
+        # Fixed font resource names (/F1, /F2, ...) so cached blocks stay valid.
+        for name in _all_fonts():
+            self._doc.getInternalFontName(name)
+
+    def showPage(self):
+        self._on_page("\n".join([self._preamble, *self._code, " "]))
+        self._startPage()
+
+
+class PDFStreamWriter:
+    """Writes PDF objects as they are produced; ``take()`` returns the bytes written so far."""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+        self._offsets = {}
+        self._pages = []
+        # 1: catalog, 2: page tree, 3: shared resources; all written last.
+        self._next = 4
+        self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _emit(self, data):
+        self._chunks.append(data)
+        self._offset += len(data)
+
+    def _object(self, number, body):
+        self._offsets[number] = self._offset
+        self._emit(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def _allocate(self):
+        number, self._next = self._next, self._next + 1
+        return number
+
+    def add_page(self, content):
+        data = zlib.compress(content.encode("latin-1"))
+        stream = self._allocate()
+        self._object(stream, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+        page = self._allocate()
+        width, height = PAGE_SIZE
+        self._object(
+            page,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %s %s] /Resources 3 0 R /Contents %d 0 R >>"
+            % (_number(width), _number(height), stream),
+        )
+        self._pages.append(page)
+
+    def finish(self, font_mapping):
+        fonts = []
+        for name, internal in font_mapping.items():
+            number = self._allocate()
+            encoding = pdfmetrics.getFont(name).encoding.name
+            entry = "" if encoding in _BUILTIN_ENCODINGS else f" /Encoding /{encoding}"
+            self._object(number, f"<< /Type /Font /Subtype /Type1 /BaseFont /{name}{entry} >>".encode())
+            fonts.append(f"{internal} {number} 0 R")
+        self._object(3, f"<< /Font << {' '.join(fonts)} >> /ProcSet [/PDF /Text] >>".encode())
+        kids = " ".join(f"{page} 0 R" for page in self._pages)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>".encode())
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref = self._offset
+        lines = [f"xref\n0 {self._next}\n", "0000000000 65535 f \n"]
+        lines += [f"{self._offsets[number]:010d} 00000 n \n" for number in range(1, self._next)]
+        self._emit("".join(lines).encode())
+        self._emit(f"trailer\n<< /Size {self._next} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+    def take(self):
+        chunks, self._chunks = self._chunks, []
+        return b"".join(chunks)
+
+
+def _number(value):
+    return (b"%.2f" % value).rstrip(b"0").rstrip(b".")
+
+
+class PageStream:
+    """
+    Lays blocks out top to bottom over as many pages as they need. ``title``
+    is drawn on the first page, ``header`` (a block) at the top of every page.
+    """
+
+    def __init__(self, cache_name, title, header=None, gap=BLOCK_GAP):
+        self.writer = PDFStreamWriter()
+        self.canvas = _PageCanvas(self.writer.add_page)
+        self.width = PAGE_SIZE[0] - 2 * MARGIN
+        self.top = PAGE_SIZE[1] - MARGIN
+        self.cache_name = cache_name
+        self.gap = gap
+        self.header = self.render(header) if header else None
+        self.canvas.setFont("Helvetica-Bold", 14)
+        self.canvas.drawCentredString(PAGE_SIZE[0] / 2, self.top - 14, title)
+        self.y = self.top - 34
+        self._start_page(first=True)
+
+    def _start_page(self, first=False):
+        if not first:
+            self.canvas.showPage()
+            self.y = self.top
+        if self.header:
+            self._place(*self.header, gap=0)
+        self._page_empty = True
+
+    def _place(self, height, code, gap=None):
+        self.y -= height
+        self.canvas._code.append(f"q 1 0 0 1 {MARGIN} {self.y:.2f} cm\n{code}\nQ")
+        self.y -= self.gap if gap is None else gap
+
+    def render(self, flowables):
+        """Draw ``flowables`` stacked at the origin; return (height, PDF operators)."""
+        sizes = [flowable.wrapOn(self.canvas, self.width, self.top) for flowable in flowables]
+        height = sum(h for _, h in sizes)
+        start = len(self.canvas._code)
+        y = height
+        for flowable, (_, h) in zip(flowables, sizes):
+            y -= h
+            flowable.drawOn(self.canvas, 0, y)
+        code = "\n".join(self.canvas._code[start:])
+        del self.canvas._code[start:]
+        return height, code
+
+    def add_blocks(self, items, build):
+        """
+        Lay out ``items`` in order. ``build(item)`` returns the flowables of
+        one block; blocks already rendered for an identical item are taken
+        from the report block cache, looked up once for all of ``items``.
+        """
+        cache = caches["report_blocks"]
+        keys = [self._cache_key(item) for item in items]
+        cached = cache.get_many(keys)
+        fresh = {}
+        for key, item in zip(keys, items):
+            block = cached.get(key)
+            if block is None:
+                block = fresh[key] = self.render(build(item))
+            self._add(block, item, build)
+        if fresh:
+            cache.set_many(fresh, settings.REPORT_BLOCK_CACHE_TIMEOUT)
+
+    def _cache_key(self, item):
+        digest = hashlib.sha1(repr(item).encode()).hexdigest()
+        return f"pdfblock:{self.cache_name}:{LAYOUT_VERSION}:{digest}"
+
+    def _add(self, block, item, build):
+        height, code = block
+        if height > self.y - MARGIN and not self._page_empty:
+            self._start_page()
+        if height <= self.y - MARGIN:
+            self._place(height, code)
+            self._page_empty = False
+            return
+        # Taller than a whole page: split the flowables themselves across pages.
+        pending = list(build(item))
+        while pending:
+            flowable = pending.pop(0)
+            _, h = flowable.wrapOn(self.canvas, self.width, self.top)
+            if h <= self.y - MARGIN:
+                self._place(*self.render([flowable]), gap=0 if pending else None)
+                self._page_empty = False
+                continue
+            parts = flowable.splitOn(self.canvas, self.width, self.y - MARGIN)
+            if len(parts) > 1:
+                self._place(*self.render([parts[0]]), gap=0)
+                pending[:0] = parts[1:]
+            elif self._page_empty:
+                # Cannot be split and fills a page on its own: draw it anyway.
+                self._place(*self.render([flowable]))
+            else:
+                pending.insert(0, flowable)
+            self._start_page()
+
+    def take(self):
+        """Bytes of every page completed since the last call."""
+        return self.writer.take()
+
+    def close(self):
+        self.canvas.showPage()
+        self.writer.finish(self.canvas._doc.fontMapping)
+        return self.writer.take()
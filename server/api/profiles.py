@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import UserProfile
+
+# Profiles are read on nearly every authenticated call, so they can be kept
+# in the default cache by user id and dropped whenever the profile is saved or
+# deleted. The drop only reaches the cache of the process that saved, so the
+# cross-request cache is off (PROFILE_CACHE_TIMEOUT = 0) unless CACHE_BACKEND
+# is shared. Cached instances are for reading only: writes use lock_profile.
+CACHE_PREFIX = "profile:"
+
+
+def _cache_key(user_id):
+    return f"{CACHE_PREFIX}{user_id}"
+
+
+def load_profile(user_id, create=False):
+    """Return the profile of ``user_id`` from the cache or with one query."""
+    timeout = settings.PROFILE_CACHE_TIMEOUT
+    key = _cache_key(user_id)
+    if timeout:
+        profile = cache.get(key)
+        if profile is not None:
+            return profile
+
+    if create:
+        profile, _ = UserProfile.objects.get_or_create(user_id=user_id)
+    else:
+        profile = UserProfile.objects.filter(user_id=user_id).first()
+
+    if profile is not None and timeout:
+        cache.set(key, profile, timeout)
+    return profile
+
+
+def lock_profile(user_id):
+    """
+    Read the profile of ``user_id`` fresh and lock its row until the
+    surrounding transaction ends, creating it if needed. Saving through this
+    instance cannot overwrite a change another worker made after caching.
+    """
+    profile, _ = UserProfile.objects.select_for_update().get_or_create(user_id=user_id)
+    return profile
+
+
+def profile_for(request, create=False):
+    """
+    Resolve the caller's profile once per request. Later calls in the same
+    request, from the view or its serializers, reuse the first result.
+    """
+    profile = getattr(request, "_profile", None)
+    if profile is None:
+        profile = load_profile(request.user.pk, create=create)
+        request._profile = profile
+    return profile
+
+
+def forget_profile(user_id):
+    key = _cache_key(user_id)
+    cache.delete(key)
+    # A request that read the old row before this transaction commits may
+    # write it back; clearing again after commit closes that window.
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,142 @@
+import csv
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, Table, TableStyle
+
+from .models import EventDetails, VolunteerHistory
+from .pdf import PageStream
+
+REPORT_CHUNK_SIZE = 2000
+# Blocks laid out between cache lookups and flushes to the client.
+PDF_BLOCK_BATCH = 100
+
+EVENT_CSV_HEADER = ["Event Name", "Description", "Location", "Urgency", "Event Date", "Required Skills", "Assigned Volunteers"]
+VOLUNTEER_CSV_HEADER = ["Volunteer Name", "Event Name", "Status", "Event Date"]
+
+# Changing any of these changes the rendered blocks: bump pdf.LAYOUT_VERSION.
+TITLE_STYLE = ParagraphStyle("title", fontName="Helvetica-Bold", fontSize=11, leading=14, spaceAfter=2)
+BODY_STYLE = ParagraphStyle("body", fontName="Helvetica", fontSize=9, leading=11)
+HEADER_STYLE = ParagraphStyle("header", parent=BODY_STYLE, fontName="Helvetica-Bold")
+DETAILS_TABLE_STYLE = TableStyle([
+    ("FONT", (0, 0), (-1, -1), "Helvetica", 9),
+    ("FONT", (0, 0), (0, 0), "Helvetica-Bold", 9),
+    ("FONT", (2, 0), (2, 0), "Helvetica-Bold", 9),
+    ("FONT", (4, 0), (4, 0), "Helvetica-Bold", 9),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("LEFTPADDING", (0, 0), (-1, -1), 0),
+])
+ROW_TABLE_STYLE = TableStyle([
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.grey),
+])
+VOLUNTEER_COLUMN_WIDTHS = [160, 200, 90, 82]
+
+
+class Echo:
+    """File-like object whose write() hands the line back instead of storing it."""
+    def write(self, value):
+        return value
+
+
+def event_rows():
+    events = (
+        EventDetails.objects.order_by("id")
+        .prefetch_related("volunteers__user_profile", "required_skills")
+        .iterator(chunk_size=REPORT_CHUNK_SIZE)
+    )
+    for event in events:
+        yield [
+            event.event_name,
+            event.description,
+            event.location,
+            event.urgency,
+            event.event_date.strftime("%Y-%m-%d"),
+            ", ".join(skill.name for skill in event.required_skills.all()),
+            ", ".join(v.user_profile.full_name for v in event.volunteers.all()),
+        ]
+
+
+def volunteer_rows():
+    histories = (
+        VolunteerHistory.objects.order_by("id")
+        .values_list("user_profile__full_name", "event__event_name", "status", "event__event_date")
+        .iterator(chunk_size=REPORT_CHUNK_SIZE)
+    )
+    for full_name, event_name, history_status, event_date in histories:
+        yield [full_name, event_name, history_status, event_date.strftime("%Y-%m-%d")]
+
+
+def stream_csv(header, rows):
+    """
+    Yield CSV-encoded lines one at a time. Rows are pulled lazily from
+    ``rows`` so only one database chunk is held in memory at once.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _escape(value):
+    return escape(str(value or ""))
+
+
+def _event_block(row):
+    name, description, location, urgency, event_date, skills, volunteers = row
+    details = Table(
+        [["Location", Paragraph(_escape(location), BODY_STYLE), "Urgency", urgency, "Date", event_date]],
+        colWidths=[50, 250, 50, 60, 30, 92],
+        style=DETAILS_TABLE_STYLE,
+    )
+    return [
+        Paragraph(_escape(name), TITLE_STYLE),
+        details,
+        Paragraph(f"<b>Description:</b> {_escape(description)}", BODY_STYLE),
+        Paragraph(f"<b>Required Skills:</b> {_escape(skills) or 'None'}", BODY_STYLE),
+        Paragraph(f"<b>Assigned Volunteers:</b> {_escape(volunteers) or 'None'}", BODY_STYLE),
+    ]
+
+
+def _volunteer_row(cells, style=BODY_STYLE):
+    return [
+        Table(
+            [[Paragraph(_escape(cell), style) for cell in cells]],
+            colWidths=VOLUNTEER_COLUMN_WIDTHS,
+            style=ROW_TABLE_STYLE,
+        )
+    ]
+
+
+def stream_pdf(page_stream, rows, build):
+    """
+    Lay ``rows`` out on ``page_stream`` PDF_BLOCK_BATCH at a time, yielding
+    the bytes of each batch's finished pages as soon as they are written.
+    """
+    rows = iter(rows)
+    while batch := list(islice(rows, PDF_BLOCK_BATCH)):
+        page_stream.add_blocks(batch, build)
+        if data := page_stream.take():
+            yield data
+    yield page_stream.close()
+
+
+def stream_events_pdf():
+    return stream_pdf(PageStream("events", "Events Report"), event_rows(), _event_block)
+
+
+def stream_volunteers_pdf():
+    header = _volunteer_row(VOLUNTEER_CSV_HEADER, HEADER_STYLE)
+    return stream_pdf(PageStream("volunteers", "Volunteer Report", header=header, gap=0), volunteer_rows(), _volunteer_row)
+
+
+def render_events_pdf(output):
+    for data in stream_events_pdf():
+        output.write(data)
+
+
+def render_volunteers_pdf(output):
+    for data in stream_volunteers_pdf():
+        output.write(data)
@@ -0,0 +1,146 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+
+from .models import EventDetails, UserProfile
+
+# Each searchable model gets a text index over three columns, most important
+# first. On SQLite that is an FTS5 table keyed by the row's id and written from
+# model signals; on PostgreSQL it is a GIN index over a weighted tsvector
+# expression, which the database keeps current by itself. Both are created
+# after migrate (see install_search_indexes), since migrations are generated
+# per deployment.
+SEARCH_INDEXES = {
+    "events": (EventDetails, ("event_name", "location", "description")),
+    "users": (UserProfile, ("full_name", "city", "preferences")),
+}
+SEARCH_MODELS = {model: kind for kind, (model, _) in SEARCH_INDEXES.items()}
+
+# bm25 column weights and their tsvector counterparts, per column position.
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+TSVECTOR_WEIGHTS = ("A", "B", "C")
+
+MAX_TERMS = 8
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query):
+    """Lowercased word tokens of a user query; punctuation and operators are dropped."""
+    return [term.lower() for term in TERM_RE.findall(query or "")][:MAX_TERMS]
+
+
+def _fts_table(model):
+    return f"{model._meta.db_table}_search"
+
+
+def _tsvector(model, columns):
+    return " || ".join(
+        f"setweight(to_tsvector('simple', coalesce({connection.ops.quote_name(column)}, '')), '{weight}')"
+        for column, weight in zip(columns, TSVECTOR_WEIGHTS)
+    )
+
+
+def install_search_indexes(using=DEFAULT_DB_ALIAS, **kwargs):
+    """post_migrate receiver: create any missing index and fill new FTS tables."""
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        for model, columns in SEARCH_INDEXES.values():
+            table = _fts_table(model)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [table])
+                if cursor.fetchone():
+                    continue
+                # prefix='2 3' adds indexes for 2- and 3-character prefixes, the
+                # ones that would otherwise match the most terms.
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {table} USING fts5("
+                    f"{', '.join(columns)}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                )
+            rebuild_search_index(model, using=using)
+    elif connection.vendor == "postgresql":
+        for model, columns in SEARCH_INDEXES.values():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {model._meta.db_table}_search_idx "
+                    f"ON {model._meta.db_table} USING gin (({_tsvector(model, columns)}))"
+                )
+
+
+def index_objects(model, objects, using=DEFAULT_DB_ALIAS):
+    """Write ``objects`` into the SQLite FTS table, replacing older entries."""
+    connection = connections[using]
+    if connection.vendor != "sqlite" or not objects:
+        return
+    table = _fts_table(model)
+    columns = SEARCH_INDEXES[SEARCH_MODELS[model]][1]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {table} (rowid, {', '.join(columns)}) VALUES (%s{', %s' * len(columns)})",
+            [(obj.pk, *(getattr(obj, column) or "" for column in columns)) for obj in objects],
+        )
+
+
+def unindex_object(model, pk):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {_fts_table(model)} WHERE rowid = %s", [pk])
+
+
+def rebuild_search_index(model, batch_size=2000, using=DEFAULT_DB_ALIAS):
+    """Re-fill ``model``'s FTS table from scratch. Returns the rows indexed."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return 0
+    columns = SEARCH_INDEXES[SEARCH_MODELS[model]][1]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {_fts_table(model)}")
+    count, batch = 0, []
+    for obj in model.objects.using(using).only("id", *columns).order_by().iterator(chunk_size=batch_size):
+        batch.append(obj)
+        if len(batch) == batch_size:
+            index_objects(model, batch, using=using)
+            count, batch = count + len(batch), []
+    index_objects(model, batch, using=using)
+    return count + len(batch)
+
+
+def search_ids(kind, query, limit, offset=0):
+    """
+    Ids of the ``kind`` objects matching every term of ``query``, best match
+    first. Returns [(id, score)].
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    model, columns = SEARCH_INDEXES[kind]
+    # Every term is matched as a prefix, so results keep up as the user types.
+    if connection.vendor == "sqlite":
+        table = _fts_table(model)
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS[:len(columns)])
+        sql = (
+            f"SELECT rowid, -bm25({table}, {weights}) AS score FROM {table} "
+            f"WHERE {table} MATCH %s ORDER BY bm25({table}, {weights}), rowid LIMIT %s OFFSET %s"
+        )
+        params = [match, limit, offset]
+    elif connection.vendor == "postgresql":
+        vector = _tsvector(model, columns)
+        sql = (
+            f"SELECT id, ts_rank_cd({vector}, query) AS score "
+            f"FROM {model._meta.db_table}, to_tsquery('simple', %s) AS query "
+            f"WHERE {vector} @@ query ORDER BY score DESC, id LIMIT %s OFFSET %s"
+        )
+        params = [" & ".join(f"{term}:*" for term in terms), limit, offset]
+    else:
+        # No text index on other backends: a substring scan, unranked.
+        matches = Q()
+        for term in terms:
+            matches &= Q(*(Q(**{f"{column}__icontains": term}) for column in columns), _connector=Q.OR)
+        ids = model.objects.filter(matches).order_by("id").values_list("id", flat=True)[offset:offset + limit]
+        return [(pk, 0.0) for pk in ids]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(pk, float(score)) for pk, score in cursor.fetchall()]
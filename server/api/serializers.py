@@ -1,8 +1,23 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
-from .models import User, UserProfile, UserAvailability, UserSkills, EventDetails, EventSkills, VolunteerHistory, Notifications
+from .models import User, UserProfile, UserAvailability, UserSkills, EventDetails, EventSkills, Skill, VolunteerHistory, Notifications, ReportJob, ImportJob
+from django.urls import reverse
+from .profiles import profile_for
 
 
+class DynamicFieldsMixin:
+    """
+    Lets callers pass ``fields=[...]`` to keep only a subset of the declared
+    fields, e.g. for ``?fields=id,full_name`` sparse fieldsets.
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -33,37 +48,49 @@ class UserAvailabilitySerializer(serializers.ModelSerializer):
         fields = ["date"]
     
     def create(self, validated_data):
-        user_profile = self.context["request"].user.profile
+        user_profile = profile_for(self.context["request"])
         return UserAvailability.objects.create(user_profile=user_profile, **validated_data)
 
 class UserSkillsSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source="skill.name", max_length=50)
+
     class Meta:
         model = UserSkills
         fields = ["name"]
     
     def create(self, validated_data):
-        user_profile = self.context["request"].user.profile
-        return UserSkills.objects.create(user_profile=user_profile, **validated_data)
+        user_profile = profile_for(self.context["request"])
+        return UserSkills.objects.create(user_profile=user_profile, name=validated_data["skill"]["name"])
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = UserProfile
-        fields = "__all__"
+        exclude = ["geo_cell"]
         extra_kwargs = {
             "address2": {"required": False},
             "user": {"required": False},
+            "latitude": {"read_only": True},
+            "longitude": {"read_only": True},
         }
 
+class SkillSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Skill
+        fields = ["id", "name"]
+
 class EventSkillsSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source="skill.name", read_only=True)
+
     class Meta:
         model = EventSkills
-        fields = "__all__"
+        fields = ["id", "name", "skill", "event"]
 
-class EventDetailsSerializer(serializers.ModelSerializer):
+class EventDetailsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     required_skills = EventSkillsSerializer(many=True, read_only=True)
     class Meta:
         model = EventDetails
-        fields = "__all__"
+        exclude = ["geo_cell"]
+        read_only_fields = ["latitude", "longitude"]
 
 class VolunteerHistorySerializer(serializers.ModelSerializer):
     event = EventDetailsSerializer(read_only=True)
@@ -71,7 +98,39 @@ class VolunteerHistorySerializer(serializers.ModelSerializer):
         model = VolunteerHistory
         fields = "__all__"
 
+class VolunteerHistoryCompactSerializer(serializers.ModelSerializer):
+    event_name = serializers.CharField(source="event.event_name", read_only=True)
+    event_date = serializers.DateTimeField(source="event.event_date", read_only=True)
+
+    class Meta:
+        model = VolunteerHistory
+        fields = ["id", "event", "event_name", "event_date", "status"]
+
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notifications
         fields = "__all__"
+
+class VolunteerMatchSerializer(serializers.Serializer):
+    profile = UserProfileSerializer(read_only=True)
+    score = serializers.FloatField()
+    matched_skills = serializers.ListField(child=serializers.CharField())
+    available = serializers.BooleanField()
+    proximity = serializers.FloatField()
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ["id", "kind", "status", "data_version", "error", "created_at", "finished_at", "download"]
+
+    def get_download(self, obj):
+        if obj.status != ReportJob.DONE:
+            return None
+        return reverse("report-job-download", args=[obj.pk])
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = ["id", "kind", "status", "report", "error", "created_at", "finished_at"]
@@ -0,0 +1,111 @@
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
+from django.dispatch import receiver
+
+from .models import User, UserProfile, UserAvailability, EventDetails, EventSkills, Skill, VolunteerHistory, Notifications
+from .authentication import revoke_tokens
+from .availability import sync_availability
+from .dashboard import schedule_dashboard_refresh
+from .geo import locate_event, locate_profile
+from .notifications import publish_notifications
+from .profiles import forget_profile
+from .search import index_objects, unindex_object
+from .versioning import bump_version
+
+# VolunteerHistory, EventSkills and UserAvailability deliberately have no
+# post_delete receiver: a receiver would stop Django from fast-deleting them
+# and cost one version bump per row. Cascades bump their versions from the
+# parent's receiver, and bulk paths (sync_related_set, bulk assignment) bump
+# explicitly. Availability bitmaps are resynced by the view that deletes.
+
+# Changing either of these, or setting a new password, revokes the refresh
+# tokens issued to a user before. set_password keeps the raw password on the
+# user until it is saved; the rehash on login clears it first, so an upgraded
+# hash of the same password revokes nothing.
+TOKEN_FIELDS = ("is_active", "is_admin")
+
+@receiver(pre_save, sender=User)
+def user_saving(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None:
+        return
+    if instance._password is not None:
+        revoke_tokens(instance.pk)
+        return
+    if update_fields is not None and not set(TOKEN_FIELDS) & set(update_fields):
+        return
+    old = User.objects.filter(pk=instance.pk).values_list(*TOKEN_FIELDS).first()
+    if old is not None and old != tuple(getattr(instance, field) for field in TOKEN_FIELDS):
+        revoke_tokens(instance.pk)
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
+
+@receiver(pre_save, sender=EventDetails)
+def event_saving(sender, instance, **kwargs):
+    locate_event(instance)
+
+@receiver(post_save, sender=EventDetails)
+def event_saved(sender, instance, **kwargs):
+    bump_version("EventDetails")
+    index_objects(EventDetails, [instance])
+    schedule_dashboard_refresh(event_ids=[instance.pk], urgency=True)
+
+@receiver(pre_delete, sender=EventDetails)
+def event_deleting(sender, instance, **kwargs):
+    states = UserProfile.objects.filter(volunteer_history__event=instance).values_list("state", flat=True).distinct()
+    schedule_dashboard_refresh(states=list(states), urgency=True)
+
+@receiver(post_delete, sender=EventDetails)
+def event_deleted(sender, instance, **kwargs):
+    bump_version("EventDetails", "EventSkills", "VolunteerHistory")
+    unindex_object(EventDetails, instance.pk)
+
+@receiver(post_save, sender=EventSkills)
+def event_skill_saved(sender, instance, **kwargs):
+    bump_version("EventSkills")
+    schedule_dashboard_refresh(event_ids=[instance.event_id])
+
+@receiver(post_save, sender=UserAvailability)
+def availability_saved(sender, instance, **kwargs):
+    sync_availability(instance.user_profile_id, [instance.date.year])
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def skill_changed(sender, instance, **kwargs):
+    bump_version("Skill")
+
+@receiver(post_save, sender=VolunteerHistory)
+def volunteer_history_saved(sender, instance, **kwargs):
+    bump_version("VolunteerHistory")
+    schedule_dashboard_refresh(event_ids=[instance.event_id], profile_ids=[instance.user_profile_id])
+
+@receiver(pre_save, sender=UserProfile)
+def profile_saving(sender, instance, **kwargs):
+    locate_profile(instance)
+    if instance.pk is None:
+        return
+    old_state = UserProfile.objects.filter(pk=instance.pk).values_list("state", flat=True).first()
+    if old_state is not None and old_state != instance.state:
+        schedule_dashboard_refresh(states=[old_state, instance.state])
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, **kwargs):
+    bump_version("UserProfile")
+    index_objects(UserProfile, [instance])
+    forget_profile(instance.user_id)
+
+@receiver(pre_delete, sender=UserProfile)
+def profile_deleting(sender, instance, **kwargs):
+    event_ids = instance.volunteer_history.values_list("event_id", flat=True)
+    schedule_dashboard_refresh(event_ids=list(event_ids), states=[instance.state])
+
+@receiver(post_delete, sender=UserProfile)
+def profile_deleted(sender, instance, **kwargs):
+    bump_version("UserProfile", "VolunteerHistory")
+    unindex_object(UserProfile, instance.pk)
+    forget_profile(instance.user_id)
+
+@receiver(post_save, sender=Notifications)
+def notification_saved(sender, instance, created, **kwargs):
+    if created:
+        publish_notifications([instance])
@@ -0,0 +1,53 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+# Bytes pulled from a sync iterator per hop to its thread.
+CHUNK_BYTES = 64 * 1024
+
+
+async def iterate_in_thread(iterator, chunk_bytes=CHUNK_BYTES):
+    """
+    Yield the parts of a sync ``iterator`` from an async context, advancing it
+    on the request's sync thread about ``chunk_bytes`` at a time so database
+    cursors stay on the connection that opened them.
+    """
+    iterator = iter(iterator)
+
+    def take():
+        parts, size = [], 0
+        for part in iterator:
+            parts.append(part)
+            size += len(part)
+            if size >= chunk_bytes:
+                break
+        return parts
+
+    while parts := await sync_to_async(take)():
+        for part in parts:
+            yield part
+
+
+class AsyncStreamingMiddleware:
+    """
+    Under ASGI Django buffers a streaming response with a sync iterator in
+    full before sending it. This hands such responses (the CSV exports, PDF
+    renders and file downloads) an async iterator instead, so they stream in
+    bounded memory. Under WSGI it does nothing.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if response.streaming and not response.is_async:
+            response.streaming_content = iterate_in_thread(response.streaming_content)
+        return response
@@ -0,0 +1,73 @@
+from .models import EventSkills, Skill
+from .versioning import bump_version
+
+BULK_BATCH_SIZE = 1000
+
+
+def sync_related_set(queryset, field, values, build, replace=True):
+    """
+    Make the ``field`` values of ``queryset`` match ``values`` with one read,
+    one bulk insert and (when ``replace`` is set) one filtered delete.
+
+    ``build`` turns a missing value into an unsaved model instance. Inserts
+    ignore conflicts so a concurrent sync of the same set cannot fail on the
+    unique constraint backing ``field``. Returns the (added, removed) sets.
+    """
+    wanted = set(values)
+    existing = set(queryset.values_list(field, flat=True))
+
+    added = wanted - existing
+    removed = existing - wanted if replace else set()
+
+    if removed:
+        queryset.filter(**{f"{field}__in": removed}).delete()
+    if added:
+        queryset.model.objects.bulk_create(
+            [build(value) for value in added],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+    if added or removed:
+        bump_version(queryset.model.__name__)
+    return added, removed
+
+
+def resolve_skills(names):
+    """
+    Map skill names to catalog ids with one read and, for names the catalog
+    has not seen yet, one bulk insert. Names are matched case-insensitively,
+    so duplicates collapse onto a single id. Returns ids in first-seen order.
+    """
+    wanted = {}
+    for name in names:
+        name = " ".join(str(name).split())
+        if name:
+            wanted.setdefault(Skill.normalize(name), name)
+    if not wanted:
+        return []
+
+    ids = dict(Skill.objects.filter(key__in=wanted).values_list("key", "id"))
+    missing = [key for key in wanted if key not in ids]
+    if missing:
+        Skill.objects.bulk_create(
+            [Skill(name=wanted[key], key=key) for key in missing],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        ids.update(Skill.objects.filter(key__in=missing).values_list("key", "id"))
+        bump_version("Skill")
+    return [ids[key] for key in wanted]
+
+
+def reconcile_event_skills(event, names):
+    """
+    Replace the required skills of ``event`` with ``names``. Call inside a
+    transaction; the unique (event, skill) constraint keeps concurrent edits
+    from leaving duplicates behind.
+    """
+    return sync_related_set(
+        event.required_skills.all(),
+        "skill_id",
+        resolve_skills(names),
+        lambda skill_id: EventSkills(event=event, skill_id=skill_id),
+    )
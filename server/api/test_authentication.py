@@ -0,0 +1,100 @@
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.urls import reverse
+from .authentication import issue_tokens
+from .models import UserProfile, Notifications
+
+User = get_user_model()
+
+class ClaimsAuthenticationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
+            full_name="Test User",
+            address1="123 Test St",
+            city="Test City",
+            state="TX",
+            zip_code="12345"
+        )
+        Notifications.objects.create(user_profile=cls.profile, message="Hello")
+
+    def login(self):
+        response = self.client.post(reverse("login"), {"email": "testuser@example.com", "password": "testpass123"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def test_admin_check_reads_claim(self):
+        self.login()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("event-pdf-report"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_profile_scoped_view_uses_profile_claim(self):
+        self.login()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("notifications"))
+        self.assertEqual(len(response.data), 1)
+
+    def refresh(self, token):
+        return self.client.post(reverse("token-refresh"), {"refresh": str(token)}, format="json")
+
+    def test_access_changes_revoke_refresh_tokens(self):
+        refresh = issue_tokens(self.user)
+        self.user.first_name = "Renamed"
+        self.user.save()
+        response = self.refresh(refresh)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(AccessToken(response.data["access"])["is_admin"] is False)
+
+        self.user.is_admin = True
+        self.user.save()
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+        self.assertEqual(self.refresh(issue_tokens(self.user)).status_code, 200)
+
+        refresh = issue_tokens(self.user)
+        self.user.set_password("newpass123")
+        self.user.save()
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+    def test_refresh_without_version_claim_refused_for_inactive_user(self):
+        refresh = RefreshToken.for_user(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+    def test_token_without_claims_falls_back_to_model(self):
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("event-pdf-report"))
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get(reverse("notifications"))
+        self.assertEqual(len(response.data), 1)
+
+class PasswordUpgradeTests(APITestCase):
+    def login(self):
+        return self.client.post(reverse("login"), {"email": "testuser@example.com", "password": "testpass123"}, format="json")
+
+    def test_other_hasher_upgraded_on_login(self):
+        user = User.objects.create_user(email="testuser@example.com")
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            user.password = make_password("testpass123", hasher="pbkdf2_sha256")
+        user.save()
+
+        self.assertEqual(self.login().status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$"))
+        self.assertEqual(self.login().status_code, 200)
+
+    def test_changed_cost_upgraded_on_login(self):
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 12):
+            user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        self.assertTrue(user.password.startswith("scrypt$4096$"))
+
+        self.assertEqual(self.login().status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$16384$"))
@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .availability import available_profile_ids, range_words, year_words
+from .models import UserProfile, UserAvailability, AvailabilityYear
+
+User = get_user_model()
+
+class AvailabilityBitmapTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profiles = []
+        schedules = [
+            [date(2025, 3, 1), date(2025, 3, 2), date(2025, 3, 3)],
+            [date(2025, 3, 2)],
+            [date(2024, 12, 31), date(2025, 1, 1)],
+            [date(2024, 2, 29), date(2025, 12, 31)],
+        ]
+        for i, days in enumerate(schedules):
+            user = User.objects.create_user(email=f"volunteer{i}@example.com", password="testpass123")
+            profile = UserProfile.objects.create(
+                user=user, full_name=f"Volunteer {i}", address1="123 Test St", city="Test City", state="TX", zip_code="77002"
+            )
+            for day in days:
+                UserAvailability.objects.create(user_profile=profile, date=day)
+            cls.profiles.append(profile)
+        cls.user = cls.profiles[0].user
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def ids(self, start, end=None, every_day=False):
+        return set(available_profile_ids(start, end, every_day).values_list("user_profile_id", flat=True))
+
+    def test_words_round_trip(self):
+        days = [date(2024, 1, 1), date(2024, 3, 1), date(2024, 12, 31)]
+        words = year_words(days)[2024]
+        mask = range_words(date(2024, 1, 1), date(2024, 12, 31))[2024]
+        self.assertTrue(all(word & m == word for word, m in zip(words, mask)))
+        self.assertEqual(sum(bin(word).count("1") for word in words), 3)
+        self.assertEqual(sum(bin(word).count("1") for word in mask), 366)
+
+    def test_any_and_every_day(self):
+        first, second, new_year, leap = (p.id for p in self.profiles)
+        self.assertEqual(self.ids(date(2025, 3, 2)), {first, second})
+        self.assertEqual(self.ids(date(2025, 3, 1), date(2025, 3, 3)), {first, second})
+        self.assertEqual(self.ids(date(2025, 3, 1), date(2025, 3, 3), every_day=True), {first})
+        self.assertEqual(self.ids(date(2024, 12, 31), date(2025, 1, 1), every_day=True), {new_year})
+        self.assertEqual(self.ids(date(2024, 12, 30), date(2025, 1, 1), every_day=True), set())
+        self.assertEqual(self.ids(date(2024, 2, 29)), {leap})
+        self.assertEqual(self.ids(date(2025, 12, 31)), {leap})
+
+    def test_matches_per_date_rows(self):
+        start = date(2024, 12, 1)
+        for offset in range(0, 120, 7):
+            day = start + timedelta(days=offset)
+            expected = set(UserAvailability.objects.filter(date=day).values_list("user_profile_id", flat=True))
+            self.assertEqual(self.ids(day), expected, day)
+
+    def test_endpoint_keeps_bitmaps_in_sync(self):
+        url = reverse("availabilities") + "?replace=true"
+        self.client.post(url, [{"date": "2025-03-02"}, {"date": "2026-01-05"}], format="json")
+        self.assertNotIn(self.profiles[0].id, self.ids(date(2025, 3, 1)))
+        self.assertIn(self.profiles[0].id, self.ids(date(2025, 3, 2)))
+        self.assertIn(self.profiles[0].id, self.ids(date(2026, 1, 5)))
+
+    def test_users_listing_filter(self):
+        response = self.client.get(reverse("users"), {"available_from": "2025-03-01", "available_to": "2025-03-03", "available": "all"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data], [self.profiles[0].id])
+        response = self.client.get(reverse("users"), {"available_from": "2025-03-02", "fields": "id"})
+        self.assertEqual(response.data, [{"id": self.profiles[0].id}, {"id": self.profiles[1].id}])
+
+        for params in (
+            {"available_from": "March 1"},
+            {"available_from": "2025-03-03", "available_to": "2025-03-01"},
+            {"available_from": "2025-01-01", "available_to": "2026-06-01"},
+            {"available_from": "2025-03-01", "available": "some"},
+        ):
+            response = self.client.get(reverse("users"), params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_rebuild_command(self):
+        AvailabilityYear.objects.all().delete()
+        call_command("rebuild_availability", stdout=StringIO())
+        self.assertEqual(AvailabilityYear.objects.count(), 6)
+        self.assertEqual(self.ids(date(2025, 3, 2)), {self.profiles[0].id, self.profiles[1].id})
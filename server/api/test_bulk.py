@@ -0,0 +1,242 @@
+from datetime import date
+from io import StringIO
+from unittest import skipUnless
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from .models import UserProfile, UserAvailability, UserSkills, EventDetails, EventSkills, Skill, VolunteerHistory, Notifications
+
+User = get_user_model()
+
+class VolunteerHistoryBulkCreateTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+        cls.event = EventDetails.objects.create(
+            event_name="Test Event",
+            description="This is a test event.",
+            location="Test Location",
+            urgency="High",
+            event_date="2023-12-31 23:59:59"
+        )
+        EventSkills.objects.create(event=cls.event, name="Test Skill")
+        cls.profiles = []
+        for i in range(20):
+            user = User.objects.create_user(email=f"volunteer{i}@example.com", password="testpass123")
+            cls.profiles.append(UserProfile.objects.create(
+                user=user,
+                full_name=f"Volunteer {i}",
+                address1="123 Test St",
+                city="Test City",
+                state="TX",
+                zip_code="12345"
+            ))
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.admin)
+
+    def assign(self, profile_ids):
+        return self.client.post(
+            reverse("volunteer-history-bulk-create"),
+            {"event": self.event.id, "user_profiles": profile_ids},
+            format="json",
+        )
+
+    def test_assign_uses_constant_queries(self):
+        profile_ids = [profile.id for profile in self.profiles]
+        with self.assertNumQueries(9):
+            response = self.assign(profile_ids + [9999])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 20)
+        self.assertIsNotNone(response.data[0]["id"])
+        self.assertEqual(response.data[0]["event"]["required_skills"][0]["name"], "Test Skill")
+        self.assertEqual(VolunteerHistory.objects.filter(event=self.event).count(), 20)
+        self.assertEqual(Notifications.objects.count(), 20)
+
+    def test_reassign_upserts(self):
+        first = self.profiles[0]
+        VolunteerHistory.objects.create(user_profile=first, event=self.event, status="Confirmed")
+        response = self.assign([first.id, first.id, self.profiles[1].id])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(VolunteerHistory.objects.filter(event=self.event).count(), 2)
+        self.assertEqual(VolunteerHistory.objects.get(user_profile=first).status, "Pending")
+
+    @override_settings(NOTIFICATION_FANOUT_WORKERS=0)
+    def test_event_update_fans_out_after_commit(self):
+        VolunteerHistory.objects.bulk_create(
+            [VolunteerHistory(user_profile=profile, event=self.event) for profile in self.profiles]
+        )
+        payload = {
+            "event_name": "Renamed Event",
+            "description": "This is a test event.",
+            "location": "Test Location",
+            "urgency": "High",
+            "event_date": "2023-12-31T23:59:59Z",
+            "skills": ["Test Skill"],
+        }
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.put(reverse("events", args=[self.event.id]), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Notifications.objects.count(), 0)
+
+        with self.assertNumQueries(4):
+            for callback in callbacks:
+                callback()
+        messages = set(Notifications.objects.values_list("message", flat=True))
+        self.assertEqual(messages, {"Event 'Renamed Event' has been updated. Please check the details."})
+        self.assertEqual(Notifications.objects.count(), 20)
+
+    def test_invalid_profile_ids(self):
+        response = self.assign(["abc"])
+        self.assertEqual(response.status_code, 400)
+
+class ProfileSetSyncTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
+            full_name="Test User",
+            address1="123 Test St",
+            city="Test City",
+            state="TX",
+            zip_code="12345"
+        )
+        UserAvailability.objects.create(user_profile=cls.profile, date=date(2025, 1, 1))
+        UserAvailability.objects.create(user_profile=cls.profile, date=date(2025, 1, 2))
+        UserSkills.objects.create(user_profile=cls.profile, name="Cooking")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def test_availability_merge_keeps_existing(self):
+        response = self.client.post(reverse("availabilities"), [{"date": "2025-01-02"}, {"date": "2025-01-03"}], format="json")
+        self.assertEqual(response.status_code, 200)
+        dates = set(self.profile.availabilities.values_list("date", flat=True))
+        self.assertEqual(dates, {date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)})
+
+    def test_availability_replace(self):
+        payload = [{"date": f"2025-02-{day:02d}"} for day in range(1, 29)]
+        url = reverse("availabilities") + "?replace=true"
+        with self.assertNumQueries(10):
+            response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        dates = set(self.profile.availabilities.values_list("date", flat=True))
+        self.assertEqual(dates, {date(2025, 2, day) for day in range(1, 29)})
+
+    def test_skills_replace(self):
+        url = reverse("skills") + "?replace=true"
+        response = self.client.post(url, [{"name": "Driving"}, {"name": "Driving"}], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.profile.skills.values_list("skill__name", flat=True)), ["Driving"])
+
+    def test_invalid_entry(self):
+        response = self.client.post(reverse("availabilities"), [{"day": "2025-01-01"}], format="json")
+        self.assertEqual(response.status_code, 400)
+
+class EventSkillReconcileTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.admin)
+
+    def event_payload(self, skills):
+        return {
+            "event_name": "Test Event",
+            "description": "This is a test event.",
+            "location": "Test Location",
+            "urgency": "High",
+            "event_date": "2023-12-31T23:59:59Z",
+            "skills": skills,
+        }
+
+    def skill_names(self, event_id):
+        return set(EventSkills.objects.filter(event_id=event_id).values_list("skill__name", flat=True))
+
+    def test_create_and_edit_cost_constant_queries(self):
+        many = [f"Skill {i}" for i in range(25)]
+        with self.assertNumQueries(16):
+            response = self.client.post(reverse("events"), self.event_payload(many), format="json")
+        self.assertEqual(response.status_code, 201)
+        event_id = response.data["id"]
+        self.assertEqual(self.skill_names(event_id), set(many))
+        self.assertEqual(len(response.data["required_skills"]), 25)
+
+        edited = many[5:] + [f"New Skill {i}" for i in range(10)]
+        with self.assertNumQueries(15):
+            response = self.client.put(reverse("events", args=[event_id]), self.event_payload(edited), format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.skill_names(event_id), set(edited))
+
+    def test_duplicate_names_collapse(self):
+        response = self.client.post(reverse("events"), self.event_payload(["Cooking", "Cooking"]), format="json")
+        self.assertEqual(self.skill_names(response.data["id"]), {"Cooking"})
+        self.assertEqual(EventSkills.objects.count(), 1)
+
+    def test_names_share_catalog_entries_case_insensitively(self):
+        first = self.client.post(reverse("events"), self.event_payload(["First Aid", "first  aid"]), format="json")
+        second = self.client.post(reverse("events"), self.event_payload(["FIRST AID", "Cooking"]), format="json")
+        self.assertEqual(self.skill_names(first.data["id"]), {"First Aid"})
+        self.assertEqual(self.skill_names(second.data["id"]), {"First Aid", "Cooking"})
+        self.assertEqual(set(Skill.objects.values_list("name", flat=True)), {"First Aid", "Cooking"})
+
+
+@skipUnless(connection.vendor == "sqlite", "rebuilds tables from SQLite's stored DDL")
+class SkillNameConversionTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        cls.profile = UserProfile.objects.create(user=user, full_name="Test User", address1="123 Test St", city="Test City", state="TX", zip_code="12345")
+        cls.event = EventDetails.objects.create(
+            event_name="Test Event",
+            description="This is a test event.",
+            location="Test Location",
+            urgency="High",
+            event_date="2023-12-31 23:59:59"
+        )
+
+    def make_legacy(self, table, owner, rows):
+        """Swap ``table`` for its pre-catalog layout; return the DDL that restores it."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE tbl_name = %s AND sql IS NOT NULL", [table])
+            ddl = [sql for (sql,) in cursor.fetchall()]
+            cursor.execute(f"DROP TABLE {table}")
+            cursor.execute(f"CREATE TABLE {table} (id integer PRIMARY KEY, name varchar(50) NOT NULL, {owner} integer NOT NULL)")
+            cursor.executemany(f"INSERT INTO {table} (name, {owner}) VALUES (%s, %s)", rows)
+        return ddl
+
+    def test_names_are_interned_across_the_schema_change(self):
+        Skill.objects.create(name="Cooking")
+        restore = self.make_legacy("api_userskills", "user_profile_id", [
+            ("cooking", self.profile.id), ("First  Aid", self.profile.id), ("first aid", self.profile.id),
+        ])
+        restore += self.make_legacy("api_eventskills", "event_id", [("FIRST AID", self.event.id), ("Driving", self.event.id)])
+
+        call_command("convert_skill_names", stdout=StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM api_userskills")
+            self.assertEqual(cursor.fetchone(), (0,))
+            # Stand-in for migrate: the tables come back in the catalog layout.
+            cursor.execute("DROP TABLE api_userskills")
+            cursor.execute("DROP TABLE api_eventskills")
+            for sql in restore:
+                cursor.execute(sql)
+
+        out = StringIO()
+        call_command("convert_skill_names", stdout=out)
+        self.assertEqual(out.getvalue(), "Restored 4 skill links.\n")
+        self.assertEqual(
+            set(UserSkills.objects.filter(user_profile=self.profile).values_list("skill__name", flat=True)),
+            {"Cooking", "First Aid"},
+        )
+        self.assertEqual(set(EventSkills.objects.filter(event=self.event).values_list("skill__name", flat=True)), {"First Aid", "Driving"})
+        self.assertEqual(Skill.objects.count(), 3)
+
+        out = StringIO()
+        call_command("convert_skill_names", stdout=out)
+        self.assertEqual(out.getvalue(), "No skill links to convert.\n")
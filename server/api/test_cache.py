@@ -0,0 +1,77 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from .models import EventDetails, EventSkills, DataVersion
+from .cache import response_cache
+
+User = get_user_model()
+
+class ResponseCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        cls.event = EventDetails.objects.create(
+            event_name="Test Event",
+            description="This is a test event.",
+            location="Test Location",
+            urgency="High",
+            event_date="2023-12-31 23:59:59"
+        )
+        EventSkills.objects.create(event=cls.event, name="Cooking")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        response_cache.reset_process_stats()
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client.get(reverse("events"))
+        # Only the data-version lookup.
+        with self.assertNumQueries(1):
+            second = self.client.get(reverse("events"))
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(response_cache.process_stats(), {"hits": 1, "misses": 1})
+
+    @override_settings(DATA_VERSION_CACHE_TIMEOUT=300)
+    def test_shared_cache_skips_version_lookup(self):
+        self.client.get(reverse("events"))
+        with self.assertNumQueries(0):
+            self.client.get(reverse("events"))
+
+    def test_sees_bumps_made_by_other_workers(self):
+        first = self.client.get(reverse("events"))
+        # Another process bumping the counter cannot clear this process's cache.
+        DataVersion.objects.filter(name="EventDetails").update(version=100)
+        second = self.client.get(reverse("events"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_conditional_get(self):
+        first = self.client.get(reverse("event-skills"))
+        self.assertIn("ETag", first)
+        self.assertIn("Last-Modified", first)
+
+        response = self.client.get(reverse("event-skills"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(reverse("event-skills"), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_skill_catalog(self):
+        EventSkills.objects.create(event=self.event, name="driving")
+        response = self.client.get(reverse("event-skills"))
+        self.assertEqual([skill["name"] for skill in response.data], ["Cooking", "driving"])
+        with self.assertNumQueries(1):
+            self.client.get(reverse("event-skills"))
+
+    def test_write_invalidates(self):
+        first = self.client.get(reverse("events", args=[self.event.id]))
+        EventSkills.objects.create(event=self.event, name="Driving")
+        second = self.client.get(reverse("events", args=[self.event.id]), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(first["ETag"], second["ETag"])
+        self.assertEqual(len(second.data["required_skills"]), 2)
+
+    def test_missing_event_not_cached(self):
+        response = self.client.get(reverse("events", args=[9999]))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
@@ -0,0 +1,95 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .models import UserProfile, EventDetails, EventSkills, UserSkills, VolunteerHistory, EventStats, DashboardCounter
+
+User = get_user_model()
+
+@override_settings(DASHBOARD_REFRESH_WORKERS=0)
+class DashboardStatsTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profiles = []
+            for i, state in enumerate(["TX", "TX", "CA"]):
+                user = User.objects.create_user(email=f"volunteer{i}@example.com", password="testpass123")
+                self.profiles.append(UserProfile.objects.create(
+                    user=user, full_name=f"Volunteer {i}", address1="123 Test St", city="Test City", state=state, zip_code="12345"
+                ))
+            UserSkills.objects.create(user_profile=self.profiles[0], name="Cooking")
+            self.event = EventDetails.objects.create(
+                event_name="Food Drive",
+                description="This is a test event.",
+                location="Test Location",
+                urgency="High",
+                event_date="2025-01-01T12:00:00Z"
+            )
+            EventSkills.objects.create(event=self.event, name="Cooking")
+            EventSkills.objects.create(event=self.event, name="Driving")
+            for profile in self.profiles:
+                VolunteerHistory.objects.create(user_profile=profile, event=self.event)
+        self.client.force_authenticate(user=self.admin)
+
+    def test_incremental_counts(self):
+        response = self.client.get(reverse("dashboard-stats"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["events_by_urgency"], {"High": 1})
+        self.assertEqual(response.data["participation_by_state"], {"TX": 2, "CA": 1})
+        event = response.data["events"][0]
+        self.assertEqual((event["volunteers"], event["required_skills"], event["covered_skills"]), (3, 2, 1))
+        self.assertEqual(event["fill_ratio"], 0.5)
+
+    def test_state_move_and_event_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = self.profiles[2]
+            profile.state = "TX"
+            profile.save()
+        response = self.client.get(reverse("dashboard-stats"))
+        self.assertEqual(response.data["participation_by_state"], {"TX": 3})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        response = self.client.get(reverse("dashboard-stats"))
+        self.assertEqual(response.data["events_by_urgency"], {})
+        self.assertEqual(response.data["participation_by_state"], {})
+        self.assertEqual(response.data["events"], [])
+
+    def test_volunteer_skill_changes_recount_assigned_events(self):
+        def covered():
+            return self.client.get(reverse("dashboard-stats")).data["events"][0]["covered_skills"]
+
+        self.client.force_authenticate(user=self.profiles[1].user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("skills"), [{"name": "Driving"}], format="json")
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(covered(), 2)
+
+        self.client.force_authenticate(user=self.profiles[1].user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("skills") + "?replace=1", [], format="json")
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(covered(), 1)
+
+    def test_reads_are_constant_and_cached(self):
+        with self.assertNumQueries(3):
+            self.client.get(reverse("dashboard-stats"))
+        with self.assertNumQueries(1):
+            self.client.get(reverse("dashboard-stats"))
+
+    def test_rebuild_matches_incremental(self):
+        before = self.client.get(reverse("dashboard-stats")).data
+        EventStats.objects.all().delete()
+        DashboardCounter.objects.all().delete()
+        call_command("rebuild_dashboard", stdout=StringIO())
+        after = self.client.get(reverse("dashboard-stats")).data
+        self.assertEqual(before["events"], after["events"])
+        self.assertEqual(before["participation_by_state"], after["participation_by_state"])
+        self.assertEqual(before["events_by_urgency"], after["events_by_urgency"])
+
+    def test_admin_only(self):
+        self.client.force_authenticate(user=self.profiles[0].user)
+        response = self.client.get(reverse("dashboard-stats"))
+        self.assertEqual(response.status_code, 401)
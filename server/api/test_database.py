@@ -0,0 +1,35 @@
+import os
+import unittest
+from unittest import mock
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from app.settings import database_config
+
+class DatabaseConfigTests(SimpleTestCase):
+    def test_postgres_pool(self):
+        with mock.patch.dict(os.environ, {"DB_POOL_MAX_SIZE": "20", "DB_HOST": "db"}):
+            config = database_config("postgres")
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(config["HOST"], "db")
+        self.assertEqual(config["OPTIONS"]["pool"]["max_size"], 20)
+        self.assertNotIn("CONN_MAX_AGE", config)
+
+    def test_postgres_persistent_connections(self):
+        with mock.patch.dict(os.environ, {"DB_CONN_MAX_AGE": "300"}):
+            os.environ.pop("DB_POOL_MAX_SIZE", None)
+            config = database_config("postgres")
+        self.assertEqual(config["CONN_MAX_AGE"], 300)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", config["OPTIONS"])
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite profile")
+class SQLiteProfileTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied(self):
+        self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma("busy_timeout"), 20000)
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
@@ -0,0 +1,144 @@
+import os
+import tempfile
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .geo import centroid, distance_miles, grid_cell, load_centroids, nearest, within_radius
+from .models import UserProfile, EventDetails, ZipCentroid
+
+User = get_user_model()
+
+CENTROIDS = {
+    "77002": (29.7560, -95.3650),
+    "77005": (29.7180, -95.4230),
+    "75201": (32.7880, -96.7990),
+    "10001": (40.7500, -73.9970),
+}
+
+class GeoTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        load_centroids(ZipCentroid(zip_code=code, latitude=lat, longitude=lon) for code, (lat, lon) in CENTROIDS.items())
+        cls.user = User.objects.create_user(email="viewer@example.com", password="testpass123")
+        cls.profiles = {}
+        for i, zip_code in enumerate(["77002", "77005", "75201", "10001", "99999"]):
+            user = User.objects.create_user(email=f"volunteer{i}@example.com", password="testpass123")
+            cls.profiles[zip_code] = UserProfile.objects.create(
+                user=user, full_name=f"Volunteer {i}", address1="123 Test St", city="Test City", state="TX", zip_code=zip_code
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def near(self, **params):
+        return self.client.get(reverse("users"), params)
+
+    def test_coordinates_set_on_save(self):
+        profile = self.profiles["77002"]
+        self.assertEqual((profile.latitude, profile.longitude), CENTROIDS["77002"])
+        self.assertIsNone(self.profiles["99999"].latitude)
+
+        profile.zip_code = "10001"
+        profile.save()
+        profile.refresh_from_db()
+        self.assertEqual((profile.latitude, profile.longitude), CENTROIDS["10001"])
+
+        event = EventDetails.objects.create(
+            event_name="Food Drive", description="Test", location="1 Main St, Dallas, TX 75201",
+            urgency="High", event_date="2025-01-01T12:00:00Z",
+        )
+        self.assertEqual((event.latitude, event.longitude), CENTROIDS["75201"])
+
+    def test_radius_and_nearest_match_brute_force(self):
+        origin = CENTROIDS["77002"]
+        located = [p for p in UserProfile.objects.all() if p.latitude is not None]
+        expected = sorted(
+            (distance_miles(*origin, p.latitude, p.longitude), p.pk) for p in located
+        )
+        hits = within_radius(UserProfile.objects.all(), *origin, 300)
+        self.assertEqual([p.pk for _, p in hits], [pk for d, pk in expected if d <= 300])
+        hits = nearest(UserProfile.objects.all(), *origin, 3)
+        self.assertEqual([p.pk for _, p in hits], [pk for _, pk in expected[:3]])
+
+    def test_users_near_zip_with_radius(self):
+        response = self.near(near="77002", radius="10")
+        self.assertEqual(response.status_code, 200)
+        rows = response.data["results"]
+        self.assertEqual([row["zip_code"] for row in rows], ["77002", "77005"])
+        self.assertEqual(rows[0]["distance_miles"], 0)
+        self.assertGreater(rows[1]["distance_miles"], 0)
+        self.assertIsNone(response.data["next"])
+
+    def test_radius_results_are_paged_nearest_first(self):
+        expected = [row["id"] for row in self.near(near="77002", radius="300", limit="500").data["results"]]
+        self.assertGreater(len(expected), 2)
+        seen, params = [], {"near": "77002", "radius": "300", "limit": "2"}
+        while True:
+            response = self.near(**params)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen += [row["id"] for row in response.data["results"]]
+            if response.data["next"] is None:
+                break
+            params["cursor"] = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+        self.assertEqual(seen, expected)
+        self.assertEqual(self.near(near="77002", radius="300", cursor="bogus").status_code, 400)
+
+    def test_users_nearest_with_sparse_fields(self):
+        response = self.near(near="29.75,-95.36", nearest="3", fields="id,full_name")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["id"] for row in response.data],
+            [self.profiles[code].id for code in ("77002", "77005", "75201")],
+        )
+        self.assertEqual(set(response.data[0]), {"id", "full_name", "distance_miles"})
+
+    def test_bad_proximity_parameters(self):
+        for params in (
+            {"near": "00000", "radius": "10"},
+            {"near": "95,10", "radius": "10"},
+            {"near": "77002"},
+            {"near": "77002", "radius": "10", "nearest": "2"},
+            {"near": "77002", "radius": "5000"},
+            {"near": "77002", "nearest": "0"},
+        ):
+            response = self.near(**params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn("error", response.data)
+
+    def test_loader_command_backfills(self):
+        ZipCentroid.objects.all().delete()
+        UserProfile.objects.update(latitude=None, longitude=None, geo_cell=None)
+        handle, path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, "w") as gazetteer:
+            gazetteer.write("GEOID\tALAND\tINTPTLAT\tINTPTLONG\n")
+            for code, (lat, lon) in CENTROIDS.items():
+                gazetteer.write(f"{code}\t1000\t{lat}\t{lon}\n")
+        self.addCleanup(os.remove, path)
+
+        call_command("load_zip_centroids", path, stdout=StringIO())
+        self.assertEqual(ZipCentroid.objects.count(), len(CENTROIDS))
+        self.assertEqual(centroid("75201"), CENTROIDS["75201"])
+        profile = UserProfile.objects.get(pk=self.profiles["75201"].pk)
+        self.assertEqual((profile.latitude, profile.longitude), CENTROIDS["75201"])
+        self.assertEqual(profile.geo_cell, grid_cell(*CENTROIDS["75201"]))
+        self.assertEqual([p.pk for _, p in within_radius(UserProfile.objects.all(), *CENTROIDS["75201"], 1)], [profile.pk])
+
+    def test_radius_across_the_antimeridian(self):
+        for zip_code, (lat, lon) in {"77002": (51.9, 179.9), "77005": (51.9, -179.9), "75201": (51.9, 178.0)}.items():
+            UserProfile.objects.filter(pk=self.profiles[zip_code].pk).update(latitude=lat, longitude=lon, geo_cell=grid_cell(lat, lon))
+        hits = within_radius(UserProfile.objects.all(), 51.9, -179.95, 20)
+        self.assertEqual({p.pk for _, p in hits}, {self.profiles["77002"].pk, self.profiles["77005"].pk})
+
+    def test_unknown_zip_is_remembered_only_once_centroids_exist(self):
+        self.assertIsNone(centroid("30301"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(centroid("30301"))
+
+        ZipCentroid.objects.all().delete()
+        self.assertIsNone(centroid("30303"))
+        # Loaded by another process, which cannot reach this worker's cache.
+        ZipCentroid.objects.create(zip_code="30303", latitude=33.75, longitude=-84.39)
+        self.assertEqual(centroid("30303"), (33.75, -84.39))
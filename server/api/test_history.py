@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from .models import UserProfile, EventDetails, EventSkills, VolunteerHistory
+
+User = get_user_model()
+
+@override_settings(PROFILE_CACHE_TIMEOUT=300)
+class HistoryTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
+            full_name="Test User",
+            address1="123 Test St",
+            city="Test City",
+            state="TX",
+            zip_code="12345"
+        )
+        start = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+        for i in range(6):
+            event = EventDetails.objects.create(
+                event_name=f"Event {i}",
+                description="This is a test event.",
+                location="Test Location",
+                urgency="High",
+                event_date=start + timedelta(days=i)
+            )
+            EventSkills.objects.create(event=event, name="Cooking")
+            EventSkills.objects.create(event=event, name="Driving")
+            VolunteerHistory.objects.create(user_profile=cls.profile, event=event, status="Completed" if i < 4 else "Pending")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        # Warm the profile cache so the counts below are the history reads alone.
+        self.client.get(reverse("profile"))
+
+class VolunteerHistoryReadTests(HistoryTestCase):
+    def test_full_rows_constant_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("volunteer-history"))
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(response.data[0]["event"]["event_name"], "Event 0")
+        self.assertEqual(len(response.data[0]["event"]["required_skills"]), 2)
+
+    def test_compact_rows(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("volunteer-history"), {"compact": "true"})
+        self.assertEqual(set(response.data[0]), {"id", "event", "event_name", "event_date", "status"})
+        self.assertEqual(response.data[0]["event_name"], "Event 0")
+
+    def test_date_range(self):
+        response = self.client.get(reverse("volunteer-history"), {"from": "2025-01-02", "to": "2025-01-04", "compact": "1"})
+        self.assertEqual([row["event_name"] for row in response.data], ["Event 1", "Event 2", "Event 3"])
+
+    def test_invalid_date(self):
+        response = self.client.get(reverse("volunteer-history"), {"from": "January"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_walk(self):
+        seen = []
+        url = reverse("volunteer-history") + "?limit=4&compact=true"
+        while url:
+            response = self.client.get(url)
+            seen.extend(row["event_name"] for row in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, [f"Event {i}" for i in range(6)])
+
+class UserHistoryDetailTests(HistoryTestCase):
+    def test_profile_history_and_summary(self):
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse("history", args=[self.user.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["profile"]["full_name"], "Test User")
+        self.assertEqual(len(response.data["history"]), 6)
+        summary = response.data["summary"]
+        self.assertEqual(summary["total_events"], 6)
+        self.assertEqual(summary["by_status"], {"Completed": 4, "Pending": 2})
+        self.assertEqual(summary["last_participation"], datetime(2025, 1, 6, 12, tzinfo=timezone.utc))
+
+    def test_own_history_compact_in_range(self):
+        response = self.client.get(reverse("history"), {"compact": "true", "to": "2025-01-02"})
+        self.assertEqual(response.data["summary"]["total_events"], 2)
+        self.assertEqual(set(response.data["history"][0]), {"id", "event", "event_name", "event_date", "status"})
+
+    def test_unknown_user(self):
+        response = self.client.get(reverse("history", args=[9999]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .availability import available_profile_ids
+from .imports import hash_passwords, import_records, password_pool, read_records
+from .models import UserProfile, UserSkills, UserAvailability, EventDetails, EventSkills, ImportJob
+from .search import search_ids
+
+User = get_user_model()
+
+VOLUNTEERS_CSV = """email,password,full_name,address1,city,state,zip_code,skills,availability
+ana@example.com,Str0ng-passw0rd,Ana Ortiz,1 Main St,Houston,TX,77002,Cooking; Driving,2025-03-01;2025-03-02
+ben@example.com,Str0ng-passw0rd,Ben Lee,2 Main St,Austin,TX,78701,cooking,
+bad-email,Str0ng-passw0rd,No Email,3 Main St,Austin,TX,78701,,
+cara@example.com,short,Cara Short,4 Main St,Austin,TX,78701,,
+ana@example.com,Str0ng-passw0rd,Ana Again,5 Main St,Austin,TX,78701,,
+dan@example.com,Str0ng-passw0rd,Dan Dates,6 Main St,Austin,TX,78701,,not-a-date
+"""
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"], DASHBOARD_REFRESH_WORKERS=0)
+class ImportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+        cls.volunteer = User.objects.create_user(email="volunteer@example.com", password="testpass123")
+
+    def import_csv(self, text, batch_size=2):
+        return import_records("volunteers", read_records(StringIO(text), "csv"), batch_size=batch_size, workers=0)
+
+    def test_valid_rows_written_and_errors_reported(self):
+        report = self.import_csv(VOLUNTEERS_CSV)
+        self.assertEqual((report["created"], report["failed"]), (2, 4))
+        self.assertEqual(
+            {error["row"]: sorted(error["errors"]) for error in report["errors"]},
+            {3: ["email"], 4: ["password"], 5: ["email"], 6: ["availability"]},
+        )
+
+        ana = UserProfile.objects.get(user__email="ana@example.com")
+        self.assertTrue(ana.user.check_password("Str0ng-passw0rd"))
+        self.assertEqual(ana.full_name, "Ana Ortiz")
+        self.assertEqual(set(ana.skills.values_list("skill__name", flat=True)), {"Cooking", "Driving"})
+        ben = UserProfile.objects.get(user__email="ben@example.com")
+        self.assertEqual(list(ben.skills.values_list("skill__name", flat=True)), ["Cooking"])
+        self.assertEqual(
+            set(UserAvailability.objects.filter(user_profile=ana).values_list("date", flat=True)),
+            {date(2025, 3, 1), date(2025, 3, 2)},
+        )
+        # The side tables signals would have filled are written too.
+        self.assertEqual(list(available_profile_ids(date(2025, 3, 2)).values_list("user_profile_id", flat=True)), [ana.id])
+        self.assertEqual([pk for pk, _ in search_ids("users", "ortiz", 10)], [ana.id])
+
+    def test_batches_are_constant_queries(self):
+        rows = "".join(
+            f"v{i}@example.com,Str0ng-passw0rd,Volunteer {i},1 Main St,Houston,TX,77002,Skill {i % 3},2025-01-0{1 + i % 5}\n"
+            for i in range(50)
+        )
+        text = VOLUNTEERS_CSV.splitlines(keepends=True)[0] + rows
+        with self.assertNumQueries(18):
+            report = self.import_csv(text, batch_size=50)
+        self.assertEqual(report["created"], 50)
+        self.assertEqual(UserSkills.objects.filter(user_profile__user__email__startswith="v").count(), 50)
+
+    def test_jsonl_events(self):
+        lines = [
+            {"event_name": "Food Drive", "description": "Sort food.", "location": "Houston, TX 77002",
+             "urgency": "High", "event_date": "2025-05-01T12:00:00Z", "skills": ["Cooking", "cooking"]},
+            {"event_name": "No Date", "description": "Missing date.", "location": "Austin", "urgency": "Low"},
+            "not an object",
+        ]
+        text = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+        report = import_records("events", read_records(StringIO(text), "jsonl"), workers=0)
+        self.assertEqual((report["created"], report["failed"]), (1, 3))
+        event = EventDetails.objects.get(event_name="Food Drive")
+        self.assertEqual(EventSkills.objects.filter(event=event).count(), 1)
+
+    def test_process_pool_hashing(self):
+        with password_pool(2) as pool:
+            encoded = hash_passwords(["one", "two", "three"], pool, 2)
+        user = User(email="pool@example.com")
+        for password, value in zip(["one", "two", "three"], encoded):
+            user.password = value
+            self.assertTrue(user.check_password(password))
+
+    def test_command(self):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as output:
+            output.write(VOLUNTEERS_CSV)
+        self.addCleanup(os.remove, path)
+        out, err = StringIO(), StringIO()
+        call_command("import_records", "volunteers", path, "--workers", "0", stdout=out, stderr=err)
+        self.assertIn("Imported 2 volunteers; 4 rows failed.", out.getvalue())
+        self.assertIn("row 4:", err.getvalue())
+
+    def test_admin_upload(self):
+        url = reverse("import", args=["volunteers"])
+
+        def upload():
+            return SimpleUploadedFile("volunteers.csv", VOLUNTEERS_CSV.encode("utf-8-sig"))
+
+        self.client.force_authenticate(user=self.volunteer)
+        self.assertEqual(self.client.post(url, {"file": upload()}).status_code, 401)
+
+        self.client.force_authenticate(user=self.admin)
+        with tempfile.TemporaryDirectory() as root, self.settings(IMPORT_ROOT=root, IMPORT_JOB_WORKERS=0):
+            response = self.client.post(url, {"file": upload()})
+            self.assertEqual(os.listdir(root), [])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], ImportJob.DONE)
+        self.assertEqual((response.data["report"]["created"], response.data["report"]["failed"]), (2, 4))
+
+        job = self.client.get(reverse("import-job", args=[response.data["id"]]))
+        self.assertEqual(job.data["report"], response.data["report"])
+
+        bad = SimpleUploadedFile("volunteers.xlsx", b"")
+        self.assertEqual(self.client.post(url, {"file": bad}).status_code, 400)
+        self.assertEqual(self.client.post(reverse("import", args=["skills"]), {"file": upload()}).status_code, 404)
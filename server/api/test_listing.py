@@ -0,0 +1,64 @@
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from .models import UserProfile, EventDetails, EventSkills
+
+User = get_user_model()
+
+class ListingPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        for i in range(5):
+            user = User.objects.create_user(email=f"volunteer{i}@example.com", password="testpass123")
+            UserProfile.objects.create(
+                user=user,
+                full_name=f"Volunteer {i}",
+                address1="123 Test St",
+                city="Test City",
+                state="TX",
+                zip_code="12345"
+            )
+            event = EventDetails.objects.create(
+                event_name=f"Event {i}",
+                description="This is a test event.",
+                location="Test Location",
+                urgency="High",
+                event_date="2023-12-31 23:59:59"
+            )
+            EventSkills.objects.create(event=event, name="Cooking")
+            EventSkills.objects.create(event=event, name="Driving")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def test_users_unpaginated_by_default(self):
+        response = self.client.get(reverse("users"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
+
+    def test_users_cursor_walk(self):
+        seen = []
+        url = reverse("users") + "?limit=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(profile["id"] for profile in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, sorted(UserProfile.objects.values_list("id", flat=True)))
+
+    def test_users_sparse_fields(self):
+        response = self.client.get(reverse("users"), {"fields": "id,full_name"})
+        self.assertEqual(set(response.data[0]), {"id", "full_name"})
+
+    def test_events_skills_prefetched(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("events"), {"limit": 3})
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(len(response.data["results"][0]["required_skills"]), 2)
+
+    def test_events_sparse_fields_skip_skills(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("events"), {"fields": "id,event_name"})
+        self.assertEqual(set(response.data[0]), {"id", "event_name"})
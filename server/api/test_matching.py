@@ -0,0 +1,81 @@
+from datetime import date
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from .models import UserProfile, UserSkills, UserAvailability, EventDetails, EventSkills
+from .matching import match_volunteers, parse_location
+
+User = get_user_model()
+
+class MatchingEngineTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+        cls.volunteer = User.objects.create_user(email="volunteer@example.com", password="testpass123")
+        cls.event = EventDetails.objects.create(
+            event_name="Food Drive",
+            description="Sort donations.",
+            location="Houston, TX 77002",
+            urgency="High",
+            event_date="2025-05-01 12:00:00"
+        )
+        EventSkills.objects.create(event=cls.event, name="Cooking")
+        EventSkills.objects.create(event=cls.event, name="Driving")
+
+        def profile(email, name, zip_code, state="TX"):
+            user = User.objects.create_user(email=email, password="testpass123")
+            return UserProfile.objects.create(
+                user=user, full_name=name, address1="1 Main St", city="Houston", state=state, zip_code=zip_code
+            )
+
+        cls.best = profile("best@example.com", "Best Match", "77002")
+        UserSkills.objects.create(user_profile=cls.best, name="Cooking")
+        UserSkills.objects.create(user_profile=cls.best, name="Driving")
+        UserAvailability.objects.create(user_profile=cls.best, date=date(2025, 5, 1))
+
+        cls.partial = profile("partial@example.com", "Partial Match", "75001")
+        UserSkills.objects.create(user_profile=cls.partial, name="Cooking")
+
+        cls.available_only = profile("free@example.com", "Free Match", "90001", state="CA")
+        UserAvailability.objects.create(user_profile=cls.available_only, date=date(2025, 5, 1))
+
+        cls.unrelated = profile("none@example.com", "No Match", "77002")
+        UserSkills.objects.create(user_profile=cls.unrelated, name="Teaching")
+        UserAvailability.objects.create(user_profile=cls.unrelated, date=date(2025, 6, 1))
+
+    def setUp(self):
+        self.event.refresh_from_db()
+
+    def test_parse_location(self):
+        self.assertEqual(parse_location("Houston, TX 77002"), ("TX", "77002"))
+        self.assertEqual(parse_location("Community Center"), (None, None))
+
+    def test_ranks_candidates_from_indexes(self):
+        matches = match_volunteers(self.event, limit=10)
+        ids = [match["profile"].id for match in matches]
+        self.assertEqual(ids, [self.best.id, self.available_only.id, self.partial.id])
+        self.assertEqual(matches[0]["matched_skills"], ["Cooking", "Driving"])
+        self.assertTrue(matches[0]["available"])
+        self.assertEqual(matches[0]["proximity"], 1.0)
+
+    def test_limit(self):
+        matches = match_volunteers(self.event, limit=1)
+        self.assertEqual([match["profile"].id for match in matches], [self.best.id])
+
+    def test_match_view_requires_admin(self):
+        self.client.force_authenticate(user=self.volunteer)
+        response = self.client.get(reverse("event-matches", args=[self.event.id]))
+        self.assertEqual(response.status_code, 401)
+
+    def test_match_view(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("event-matches", args=[self.event.id]), {"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data[0]["profile"]["id"], self.best.id)
+        self.assertEqual(response.data[0]["score"], 6.0)
+
+    def test_match_view_missing_event(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("event-matches", args=[9999]))
+        self.assertEqual(response.status_code, 404)
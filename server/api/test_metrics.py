@@ -0,0 +1,75 @@
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from .models import EventDetails, EventSkills
+from .metrics import registry, QueryBudgetExceeded
+from .authentication import issue_tokens
+
+User = get_user_model()
+
+class MetricsMiddlewareTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        for i in range(3):
+            event = EventDetails.objects.create(
+                event_name=f"Event {i}",
+                description="This is a test event.",
+                location="Test Location",
+                urgency="High",
+                event_date="2023-12-31 23:59:59"
+            )
+            EventSkills.objects.create(event=event, name="Cooking")
+
+    def setUp(self):
+        registry.reset()
+        self.client.force_authenticate(user=self.user)
+
+    def test_metrics_endpoint_reports_requests(self):
+        self.client.get(reverse("events"))
+        self.client.get(reverse("event-skills"))
+
+        with self.settings(METRICS_TOKEN="scrape-secret"):
+            response = self.client.get(reverse("metrics"), headers={"Authorization": "Bearer scrape-secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn('api_requests_total{endpoint="events",method="GET",status="200"} 1', body)
+        self.assertIn('api_request_queries_total{endpoint="events",method="GET"} 3', body)
+        self.assertIn('api_request_duration_seconds_count{endpoint="event-skills",method="GET"} 1', body)
+        self.assertIn("api_response_cache_process_misses_total{pid=", body)
+        self.assertNotIn('endpoint="metrics"', body)
+
+    def test_metrics_endpoint_requires_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+        with self.settings(METRICS_TOKEN="scrape-secret"):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+            response = self.client.get(reverse("metrics"), headers={"Authorization": "Bearer wrong"})
+            self.assertEqual(response.status_code, 401)
+
+    async def test_records_requests_served_over_asgi(self):
+        token = await sync_to_async(issue_tokens)(self.user)
+        response = await self.async_client.get(reverse("events"), headers={"Authorization": f"Bearer {token.access_token}"})
+        self.assertEqual(response.status_code, 200)
+        (key, entry), = registry.snapshot()
+        self.assertEqual(key, ("events", "GET"))
+        self.assertEqual(entry.queries, 3)
+
+    def test_serialization_time_recorded(self):
+        self.client.get(reverse("events"))
+        (_, entry), = registry.snapshot()
+        self.assertGreater(entry.serialization_seconds, 0)
+        self.assertGreaterEqual(entry.wall_seconds, entry.sql_seconds)
+
+    @override_settings(QUERY_BUDGETS={"events:GET": 1})
+    def test_budget_enforced(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse("events"))
+
+    @override_settings(QUERY_BUDGETS={"events:GET": 1}, QUERY_BUDGET_ENFORCE=False)
+    def test_budget_logged_when_not_enforced(self):
+        with self.assertLogs("api.metrics", level="WARNING"):
+            response = self.client.get(reverse("events"))
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,90 @@
+import asyncio
+from unittest import mock
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from .authentication import issue_tokens
+from .models import UserProfile, Notifications
+from .notifications import broker, event_stream, QUEUE_SIZE
+
+User = get_user_model()
+
+class NotificationDeliveryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
+            full_name="Test User",
+            address1="123 Test St",
+            city="Test City",
+            state="TX",
+            zip_code="12345"
+        )
+        cls.notifications = [
+            Notifications.objects.create(user_profile=cls.profile, message=f"Message {i}") for i in range(3)
+        ]
+
+    def test_since_returns_only_newer(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("notifications"), {"since": self.notifications[0].id})
+        self.assertEqual([n["message"] for n in response.data], ["Message 1", "Message 2"])
+
+        response = self.client.get(reverse("notifications"), {"since": "latest"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_created_notification_is_published_on_commit(self):
+        with mock.patch.object(broker, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                notification = Notifications.objects.create(user_profile=self.profile, message="Hello")
+        publish.assert_called_once_with(
+            self.profile.id, {"id": notification.id, "user_profile": self.profile.id, "message": "Hello"}
+        )
+
+    def test_stream_without_token(self):
+        response = self.client.get(reverse("notifications-stream"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_needs_asgi(self):
+        token = issue_tokens(self.user).access_token
+        response = self.client.get(reverse("notifications-stream"), HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 501)
+
+class EventStreamTests(APITestCase):
+    def collect(self, publish, count):
+        async def run():
+            subscription = broker.subscribe(42)
+            stream = event_stream(subscription)
+            events = [await anext(stream)]
+            publish()
+            for _ in range(count):
+                events.append(await asyncio.wait_for(anext(stream), timeout=1))
+            await stream.aclose()
+            return events
+
+        return asyncio.run(run())
+
+    def test_pushes_published_notifications(self):
+        events = self.collect(lambda: broker.publish(42, {"id": 7, "user_profile": 42, "message": "Hi"}), 1)
+        self.assertTrue(events[0].startswith("retry:"))
+        self.assertEqual(events[1], 'id: 7\nevent: notification\ndata: {"id": 7, "user_profile": 42, "message": "Hi"}\n\n')
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    def test_slow_consumer_catches_up_from_table(self):
+        def flood():
+            for i in range(1, QUEUE_SIZE + 2):
+                broker.publish(42, {"id": i, "user_profile": 42, "message": "x"})
+
+        rows = [{"id": QUEUE_SIZE + 1, "user_profile": 42, "message": "x"}]
+        with mock.patch("api.notifications.backlog", return_value=rows) as backlog:
+            events = self.collect(flood, 1)
+        backlog.assert_called_once_with(42, 0)
+        self.assertTrue(events[1].startswith(f"id: {QUEUE_SIZE + 1}\n"))
+
+    @override_settings(NOTIFICATION_POLL_SECONDS=0.05)
+    def test_poll_delivers_other_processes_notifications_once(self):
+        rows = [{"id": i, "user_profile": 42, "message": "x"} for i in (2, 3)]
+        with mock.patch("api.notifications.backlog", side_effect=[rows] + [[]] * 100):
+            events = self.collect(lambda: broker.publish(42, rows[1]), 2)
+        self.assertEqual([event.split("\n", 1)[0] for event in events[1:]], ["id: 3", "id: 2"])
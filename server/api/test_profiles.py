@@ -0,0 +1,74 @@
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from .models import UserProfile, Notifications
+
+User = get_user_model()
+
+@override_settings(PROFILE_CACHE_TIMEOUT=300)
+class ProfileResolverTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
+            full_name="Test User",
+            address1="123 Test St",
+            city="Test City",
+            state="TX",
+            zip_code="12345"
+        )
+        Notifications.objects.create(user_profile=cls.profile, message="Hello")
+
+    def setUp(self):
+        # A fresh user instance, so nothing is memoized on it between requests.
+        self.client.force_authenticate(user=User.objects.get(pk=self.user.pk))
+
+    def test_profile_read_once_then_cached(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("profile"))
+        self.assertEqual(response.data["full_name"], "Test User")
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("profile"))
+        self.assertEqual(response.data["full_name"], "Test User")
+
+    def test_profile_scoped_list_costs_one_query_when_warm(self):
+        self.client.get(reverse("profile"))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("notifications"))
+        self.assertEqual(len(response.data), 1)
+
+    def test_save_invalidates(self):
+        self.client.get(reverse("profile"))
+        response = self.client.put(reverse("profile"), {"full_name": "Renamed", "address1": "1 Main St", "city": "Austin", "state": "TX", "zip_code": "78701"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(reverse("profile")).data["full_name"], "Renamed")
+
+    def test_update_does_not_save_over_a_stale_cached_profile(self):
+        self.client.get(reverse("profile"))
+        # Written by another worker, whose cache delete this process never sees.
+        UserProfile.objects.filter(pk=self.profile.pk).update(city="Houston")
+        response = self.client.patch(reverse("profile"), {"full_name": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.full_name, self.profile.city), ("Renamed", "Houston"))
+
+    def test_missing_profile_is_created(self):
+        user = User.objects.create_user(email="new@example.com", password="testpass123")
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    def test_missing_profile_on_scoped_view(self):
+        user = User.objects.create_user(email="new@example.com", password="testpass123")
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse("skills"))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(PROFILE_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        self.client.get(reverse("profile"))
+        with self.assertNumQueries(1):
+            self.client.get(reverse("profile"))
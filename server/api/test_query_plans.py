@@ -0,0 +1,161 @@
+import re
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from .geo import grid_cell, radius_candidates
+from .models import UserProfile, UserAvailability, UserSkills, EventDetails, EventSkills, Skill, VolunteerHistory, Notifications
+
+User = get_user_model()
+
+SKILLS = ["Cooking", "Driving", "First Aid", "Teaching", "Construction", "Translation", "Counseling", "Logistics"]
+STATES = ["TX", "CA", "NY", "FL", "IL", "WA"]
+STATUSES = ["Pending", "Confirmed", "Completed", "Cancelled"]
+
+def spread_point(i):
+    """Coordinates scattered over the continental US, with their grid cell."""
+    lat, lon = 25 + (i * 37 % 240) / 10, -124 + (i * 53 % 570) / 10
+    return {"latitude": lat, "longitude": lon, "geo_cell": grid_cell(lat, lon)}
+
+# "SCAN api_x" without "USING ... INDEX" means SQLite reads every row of api_x.
+FULL_SCAN_RE = re.compile(r"\bSCAN (api_\w+)(?! USING (?:COVERING )?INDEX)(?! USING INTEGER PRIMARY KEY)")
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN checks are written against SQLite")
+class QueryPlanTests(APITestCase):
+    """
+    Seeds a synthetic dataset, runs ANALYZE so the planner has realistic
+    statistics, then checks that filtered queries are answered from an index
+    rather than a full table scan.
+    """
+    PROFILES = 2000
+    EVENTS = 300
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+        users = User.objects.bulk_create(
+            [User(email=f"volunteer{i}@example.com", password="!") for i in range(cls.PROFILES)]
+        )
+        profiles = UserProfile.objects.bulk_create([
+            UserProfile(
+                user=user,
+                full_name=f"Volunteer {i}",
+                address1=f"{i} Main St",
+                city="Test City",
+                state=STATES[i % len(STATES)],
+                zip_code=f"{77000 + i % 500:05d}",
+                **spread_point(i),
+            )
+            for i, user in enumerate(users)
+        ])
+        start = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+        events = EventDetails.objects.bulk_create([
+            EventDetails(
+                event_name=f"Event {i}",
+                description="Synthetic event.",
+                location=f"Houston, TX {77000 + i % 500:05d}",
+                urgency=["Low", "Medium", "High", "Critical"][i % 4],
+                event_date=start + timedelta(days=i),
+                **spread_point(i * 7),
+            )
+            for i in range(cls.EVENTS)
+        ])
+        skills = Skill.objects.bulk_create([Skill(name=name, key=Skill.normalize(name)) for name in SKILLS])
+        EventSkills.objects.bulk_create([
+            EventSkills(event=event, skill=skills[(i + offset) % len(skills)])
+            for i, event in enumerate(events) for offset in range(2)
+        ])
+        UserSkills.objects.bulk_create([
+            UserSkills(user_profile=profile, skill=skills[(i + offset) % len(skills)])
+            for i, profile in enumerate(profiles) for offset in range(3)
+        ])
+        UserAvailability.objects.bulk_create([
+            UserAvailability(user_profile=profile, date=date(2025, 1, 1) + timedelta(days=(i + offset * 37) % 365))
+            for i, profile in enumerate(profiles) for offset in range(10)
+        ])
+        VolunteerHistory.objects.bulk_create([
+            VolunteerHistory(
+                user_profile=profile,
+                event=events[(i + offset * 7) % cls.EVENTS],
+                status=STATUSES[(i + offset) % len(STATUSES)],
+            )
+            for i, profile in enumerate(profiles) for offset in range(3)
+        ])
+        Notifications.objects.bulk_create([
+            Notifications(user_profile=profile, message="Synthetic notification.") for profile in profiles
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        cls.profile = profiles[0]
+        cls.event = events[0]
+        cls.skills = skills
+
+    def plan(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertIndexed(self, sql, params=()):
+        plan = self.plan(sql, params)
+        scans = [line for line in plan if FULL_SCAN_RE.search(line)]
+        self.assertFalse(scans, f"Full table scan in plan for:\n{sql}\n" + "\n".join(plan))
+
+    def assertQuerysetIndexed(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        self.assertIndexed(sql, params)
+
+    def assertViewIndexed(self, url, user=None):
+        """Every filtered SELECT the view runs must be served by an index."""
+        self.client.force_authenticate(user=user or self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        for query in ctx.captured_queries:
+            sql = query["sql"]
+            if sql.startswith("SELECT") and " WHERE " in sql:
+                self.assertIndexed(sql)
+
+    def test_detects_full_scan(self):
+        with self.assertRaises(AssertionError):
+            self.assertQuerysetIndexed(UserProfile.objects.filter(city="Test City"))
+
+    def test_access_paths_use_indexes(self):
+        start = datetime(2025, 2, 1, tzinfo=timezone.utc)
+        querysets = [
+            EventDetails.objects.filter(event_date__gte=start, event_date__lt=start + timedelta(days=7)),
+            EventDetails.objects.filter(urgency="Critical", event_date__gte=start),
+            EventDetails.objects.filter(id__gt=100).order_by("id")[:50],
+            VolunteerHistory.objects.filter(status="Cancelled", event=self.event),
+            VolunteerHistory.objects.filter(event=self.event, status="Pending"),
+            VolunteerHistory.objects.filter(user_profile=self.profile).select_related("event"),
+            UserAvailability.objects.filter(date=date(2025, 3, 1)).values_list("user_profile_id"),
+            UserSkills.objects.filter(skill__in=self.skills[:2]).values_list("user_profile_id", "skill_id"),
+            EventSkills.objects.filter(skill=self.skills[0]).values_list("event_id"),
+            Skill.objects.filter(key__in=["cooking", "driving"]),
+            UserProfile.objects.filter(state="TX", zip_code="77010"),
+            UserProfile.objects.filter(zip_code__gte="77000", zip_code__lt="77100"),
+            Notifications.objects.filter(user_profile=self.profile),
+            radius_candidates(UserProfile.objects.all(), 29.75, -95.36, 100),
+            radius_candidates(EventDetails.objects.all(), 29.75, -95.36, 100),
+        ]
+        for queryset in querysets:
+            with self.subTest(sql=str(queryset.query)):
+                self.assertQuerysetIndexed(queryset)
+
+    def test_listing_views(self):
+        self.assertViewIndexed(reverse("users") + "?limit=50")
+        self.assertViewIndexed(reverse("events") + "?limit=50")
+        self.assertViewIndexed(reverse("events", args=[self.event.id]))
+
+    def test_matching_view(self):
+        self.assertViewIndexed(reverse("event-matches", args=[self.event.id]))
+
+    def test_profile_scoped_views(self):
+        user = self.profile.user
+        for name in ("availabilities", "skills", "notifications", "volunteer-history"):
+            with self.subTest(view=name):
+                self.assertViewIndexed(reverse(name), user=user)
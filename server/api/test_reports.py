@@ -0,0 +1,233 @@
+import io
+import re
+import shutil
+import tempfile
+import warnings
+import zlib
+from unittest import mock
+import reportlab
+from asgiref.sync import sync_to_async
+from pypdf import PdfReader
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from . import pdf, reports
+from .authentication import issue_tokens
+from .models import UserProfile, EventDetails, EventSkills, VolunteerHistory, ReportJob
+
+User = get_user_model()
+
+class StreamingCSVReportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+        cls.user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
+            full_name="Test User",
+            address1="123 Test St",
+            city="Test City",
+            state="TX",
+            zip_code="12345"
+        )
+        for i in range(3):
+            event = EventDetails.objects.create(
+                event_name=f"Event {i}",
+                description="Line one, with a comma",
+                location="Test Location",
+                urgency="High",
+                event_date="2023-12-31 12:00:00"
+            )
+            EventSkills.objects.create(event=event, name="Cooking")
+            VolunteerHistory.objects.create(user_profile=cls.profile, event=event, status="Pending")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.admin)
+
+    def read_lines(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode().splitlines()
+
+    def test_event_csv_streams_rows(self):
+        lines = self.read_lines(self.client.get(reverse("event-csv-report")))
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[1], 'Event 0,"Line one, with a comma",Test Location,High,2023-12-31,Cooking,Test User')
+
+    async def test_csv_streams_asynchronously_under_asgi(self):
+        token = await sync_to_async(issue_tokens)(self.admin)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            response = await self.async_client.get(reverse("event-csv-report"), headers={"Authorization": f"Bearer {token.access_token}"})
+            self.assertTrue(response.is_async)
+            body = b"".join([part async for part in response.streaming_content])
+        self.assertEqual(len(body.decode().splitlines()), 4)
+
+    def test_volunteer_csv_streams_rows(self):
+        lines = self.read_lines(self.client.get(reverse("volunteer-history-csv-report")))
+        self.assertEqual(lines[0], "Volunteer Name,Event Name,Status,Event Date")
+        self.assertEqual(lines[1:], [f"Test User,Event {i},Pending,2023-12-31" for i in range(3)])
+
+class StreamingPDFReportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+        user = User.objects.create_user(email="testuser@example.com", password="testpass123")
+        profile = UserProfile.objects.create(user=user, full_name="Test User", address1="123 Test St", city="Test City", state="TX", zip_code="12345")
+        for i in range(3):
+            event = EventDetails.objects.create(
+                event_name=f"Event {i} <&>",
+                description="A description",
+                location="Test Location",
+                urgency="High",
+                event_date="2023-12-31 12:00:00"
+            )
+            VolunteerHistory.objects.create(user_profile=profile, event=event, status="Pending")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.admin)
+
+    def read_pdf(self, name):
+        response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        data = b"".join(response.streaming_content)
+        self.assertTrue(data.startswith(b"%PDF-1.4"))
+        self.assertTrue(data.endswith(b"%%EOF\n"))
+        return data
+
+    def page_count(self, data):
+        return int(re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", data).group(1))
+
+    def test_reportlab_is_the_pinned_release(self):
+        # PageStream uses undocumented Canvas internals; re-check the output
+        # before moving the pin in requirements.txt and pdf.REPORTLAB_VERSION.
+        self.assertEqual(reportlab.Version, pdf.REPORTLAB_VERSION)
+
+    def test_reports_parse_with_pdf_reader(self):
+        def read(name):
+            reader = PdfReader(io.BytesIO(self.read_pdf(name)), strict=True)
+            return reader.pages, "".join(page.extract_text() for page in reader.pages)
+
+        EventDetails.objects.filter(event_name__startswith="Event 1").update(description="word " * 4000)
+        pages, text = read("event-pdf-report")
+        self.assertEqual(len(pages), 4)
+        self.assertIn("Event 2 <&>", text)
+        pages, text = read("volunteer-history-pdf-report")
+        self.assertEqual(len(pages), 1)
+        self.assertIn("Test User", text)
+
+    def test_xref_points_at_each_object(self):
+        data = self.read_pdf("event-pdf-report")
+        xref = int(data.rsplit(b"startxref\n", 1)[1].split()[0])
+        entries = data[xref:].split(b"\n")[3:]
+        for number in range(1, int(data[xref:].split(b"\n")[1].split()[1])):
+            offset = int(entries[number - 1][:10])
+            self.assertTrue(data[offset:].startswith(b"%d 0 obj" % number))
+
+    def test_long_descriptions_wrap_across_pages(self):
+        self.assertEqual(self.page_count(self.read_pdf("event-pdf-report")), 1)
+        EventDetails.objects.filter(event_name__startswith="Event 1").update(description="word " * 4000)
+        self.assertEqual(self.page_count(self.read_pdf("event-pdf-report")), 4)
+
+    def test_unchanged_events_reuse_cached_blocks(self):
+        with mock.patch("api.reports._event_block", wraps=reports._event_block) as build:
+            first = self.read_pdf("event-pdf-report")
+            self.assertEqual(build.call_count, 3)
+            self.assertEqual(self.read_pdf("event-pdf-report"), first)
+            self.assertEqual(build.call_count, 3)
+            EventDetails.objects.filter(event_name__startswith="Event 2").update(urgency="Low")
+            self.read_pdf("event-pdf-report")
+            self.assertEqual(build.call_count, 4)
+
+    def test_cached_blocks_only_use_declared_fonts(self):
+        EventDetails.objects.filter(event_name__startswith="Event 0").update(event_name="Łukasz's drive", description="李 → ∑")
+        for _ in range(2):
+            data = self.read_pdf("event-pdf-report")
+            declared = re.search(rb"/Font << (.*?) >>", data).group(1)
+            fonts = dict(re.findall(rb"(/F\d+) (\d+) 0 R", declared))
+            for stream in re.findall(rb"stream\n(.*?)\nendstream", data, re.S):
+                for used in set(re.findall(rb"(/F\d+) [\d.]+ Tf", zlib.decompress(stream))):
+                    self.assertIn(used, fonts)
+            base_fonts = {
+                name: re.search(rb"\n%s 0 obj\n<< /Type /Font /Subtype /Type1 /BaseFont /([\w-]+)" % number, data).group(1)
+                for name, number in fonts.items()
+            }
+            self.assertIn(b"ZapfDingbats", base_fonts.values())
+            self.assertEqual(base_fonts[b"/F1"], b"Helvetica")
+
+    def test_volunteer_pdf_repeats_header_on_each_page(self):
+        profile = UserProfile.objects.get()
+        events = EventDetails.objects.bulk_create([
+            EventDetails(event_name=f"Extra {i}", description="", location="Test Location", urgency="Low", event_date="2024-01-01 12:00:00")
+            for i in range(80)
+        ])
+        VolunteerHistory.objects.bulk_create([VolunteerHistory(user_profile=profile, event=event, status="Attended") for event in events])
+        data = self.read_pdf("volunteer-history-pdf-report")
+        pages = [zlib.decompress(stream) for stream in re.findall(rb"stream\n(.*?)\nendstream", data, re.S)]
+        self.assertEqual(self.page_count(data), len(pages))
+        self.assertGreater(len(pages), 1)
+        self.assertTrue(all(b"(Volunteer Name)" in page for page in pages))
+
+class ReportJobTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass123", is_admin=True)
+        cls.event = EventDetails.objects.create(
+            event_name="Test Event",
+            description="This is a test event.",
+            location="Test Location",
+            urgency="High",
+            event_date="2023-12-31 12:00:00"
+        )
+
+    def setUp(self):
+        self.report_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.report_root, ignore_errors=True)
+        settings_override = override_settings(REPORT_ROOT=self.report_root, REPORT_JOB_WORKERS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_authenticate(user=self.admin)
+
+    def test_job_renders_and_downloads(self):
+        response = self.client.post(reverse("event-pdf-report"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], ReportJob.DONE)
+
+        download = self.client.get(response.data["download"])
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(download.streaming_content).startswith(b"%PDF"))
+
+    def test_repeat_request_reuses_artifact(self):
+        first = self.client.post(reverse("event-pdf-report"))
+        second = self.client.post(reverse("event-pdf-report"))
+        self.assertEqual(first.data["id"], second.data["id"])
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+        cached = self.client.get(reverse("event-pdf-report"))
+        self.assertTrue(cached.streaming)
+
+    def test_data_change_invalidates_artifact(self):
+        first = self.client.post(reverse("event-pdf-report"))
+        self.event.event_name = "Renamed Event"
+        self.event.save()
+        second = self.client.post(reverse("event-pdf-report"))
+        self.assertNotEqual(first.data["id"], second.data["id"])
+        self.assertNotEqual(first.data["data_version"], second.data["data_version"])
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+    def test_cold_get_streams_pdf(self):
+        response = self.client.get(reverse("event-pdf-report"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_job_status(self):
+        job = ReportJob.objects.create(kind=ReportJob.VOLUNTEERS_PDF, data_version="0.0.0")
+        response = self.client.get(reverse("report-job", args=[job.pk]))
+        self.assertEqual(response.data["status"], ReportJob.PENDING)
+        self.assertIsNone(response.data["download"])
+        response = self.client.get(reverse("report-job-download", args=[job.pk]))
+        self.assertEqual(response.status_code, 409)
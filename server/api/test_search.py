@@ -0,0 +1,83 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .models import UserProfile, EventDetails
+from .search import search_ids
+
+User = get_user_model()
+
+class SearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="viewer@example.com", password="testpass123")
+        cls.events = [
+            EventDetails.objects.create(
+                event_name=name, description=description, location=location,
+                urgency="High", event_date="2025-01-01T12:00:00Z",
+            )
+            for name, description, location in [
+                ("Food Drive", "Collect canned food for the pantry.", "Houston, TX 77002"),
+                ("Park Cleanup", "Bring gloves; food provided.", "Austin, TX 78701"),
+                ("Tutoring", "Help students with math.", "Dallas, TX 75201"),
+                ("Blood Drive", "Donate at the clinic.", "El Paso, TX 79901"),
+                ("Book Sale", "Sort donated books.", "Waco, TX 76701"),
+                ("Coat Collection", "Warm coats for winter.", "Tyler, TX 75701"),
+            ]
+        ]
+        cls.profiles = []
+        for i, (name, city) in enumerate([("Maria Foodwell", "Houston"), ("José Ramírez", "Austin")]):
+            user = User.objects.create_user(email=f"volunteer{i}@example.com", password="testpass123")
+            cls.profiles.append(UserProfile.objects.create(
+                user=user, full_name=name, address1="123 Test St", city=city, state="TX", zip_code="77002"
+            ))
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, **params):
+        return self.client.get(reverse("search"), params)
+
+    def test_ranked_prefix_search(self):
+        response = self.search(q="foo")
+        self.assertEqual(response.status_code, 200)
+        events = response.data["results"]["events"]
+        # A title match outranks a description-only match.
+        self.assertEqual([row["id"] for row in events], [self.events[0].id, self.events[1].id])
+        self.assertGreater(events[0]["score"], events[1]["score"])
+        self.assertEqual([row["full_name"] for row in response.data["results"]["users"]], ["Maria Foodwell"])
+        self.assertIsNone(response.data["next"])
+
+    def test_all_terms_must_match_and_accents_fold(self):
+        self.assertEqual([pk for pk, _ in search_ids("events", "food houston", 10)], [self.events[0].id])
+        self.assertEqual([pk for pk, _ in search_ids("users", "jose ramirez", 10)], [self.profiles[1].id])
+
+    def test_index_follows_saves_and_deletes(self):
+        event = self.events[2]
+        event.event_name = "Math Marathon"
+        event.save()
+        self.assertEqual([pk for pk, _ in search_ids("events", "marathon", 10)], [event.id])
+        self.assertEqual(search_ids("events", "tutoring", 10), [])
+        event.delete()
+        self.assertEqual(search_ids("events", "marathon", 10), [])
+
+    def test_pagination(self):
+        response = self.search(q="tx", type="events", limit=4)
+        self.assertEqual(len(response.data["results"]["events"]), 4)
+        self.assertNotIn("users", response.data["results"])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]["events"]), 2)
+        self.assertIsNone(response.data["next"])
+
+    def test_bad_parameters(self):
+        for params in ({"q": "  ++ "}, {"q": "food", "type": "skills"}, {"q": "food", "limit": "0"}):
+            response = self.search(**params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn("error", response.data)
+
+    def test_rebuild_command(self):
+        EventDetails.objects.filter(pk=self.events[2].pk).update(event_name="Reading Club")
+        self.assertEqual(search_ids("events", "reading", 10), [])
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual([pk for pk, _ in search_ids("events", "reading", 10)], [self.events[2].id])
@@ -16,25 +16,38 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
-from .views import RegisterView, LoginView, UserHistoryDetailView, UserProfileView, UserAvailabilityView, UserSkillsView, EventDetailsView, EventSkillsView, UsersListView, UserDetailView, EventDetailedView, VolunteerHistoryView, VolunteerHistoryBulkCreateView, NotificationsView, EventCSVReportView, EventPDFReportView, VolunteerReportCSV, VolunteerReportPDF
+from rest_framework_simplejwt.views import TokenRefreshView
+from .metrics import metrics_view
+from .views import RegisterView, LoginView, UserHistoryDetailView, UserProfileView, UserAvailabilityView, UserSkillsView, EventDetailsView, EventSkillsView, UsersListView, UserDetailView, EventDetailedView, EventMatchView, VolunteerHistoryView, VolunteerHistoryBulkCreateView, NotificationsView, EventCSVReportView, EventPDFReportView, VolunteerReportCSV, VolunteerReportPDF, ReportJobView, ReportJobDownloadView, DashboardStatsView, SearchView, ImportView, ImportJobView, notification_stream
 
 urlpatterns = [
     path("signup/", RegisterView.as_view(), name="signup"),
     path("login/", LoginView.as_view(), name="login"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
     path("profile/", UserProfileView.as_view(), name="profile"),
     path("availabilities/", UserAvailabilityView.as_view(), name="availabilities"),
     path("skills/", UserSkillsView.as_view(), name="skills"),
     path("events/", EventDetailsView.as_view(), name="events"),
     path("events/<int:pk>/", EventDetailedView.as_view(), name="events"),
+    path("events/<int:pk>/matches/", EventMatchView.as_view(), name="event-matches"),
     path("event-skills/", EventSkillsView.as_view(), name="event-skills"),
     path("users/", UsersListView.as_view(), name="users"),
     path("users/<int:pk>/", UserDetailView.as_view(), name="user"),
+    path("history/", UserHistoryDetailView.as_view(), name="history"),
     path("history/<int:pk>/", UserHistoryDetailView.as_view(), name="history"),
     path("volunteer-history/", VolunteerHistoryView.as_view(), name="volunteer-history"),
     path("volunteer-history/bulk-create/", VolunteerHistoryBulkCreateView.as_view(), name="volunteer-history-bulk-create"),
     path("notifications/", NotificationsView.as_view(), name="notifications"),
+    path("notifications/stream/", notification_stream, name="notifications-stream"),
     path("report/events/csv/", EventCSVReportView.as_view(), name="event-csv-report"),
     path("report/events/pdf/", EventPDFReportView.as_view(), name="event-pdf-report"),
     path("report/volunteer-history/csv/", VolunteerReportCSV.as_view(), name="volunteer-history-csv-report"),
     path("report/volunteer-history/pdf/", VolunteerReportPDF.as_view(), name="volunteer-history-pdf-report"),
+    path("report/jobs/<uuid:pk>/", ReportJobView.as_view(), name="report-job"),
+    path("report/jobs/<uuid:pk>/download/", ReportJobDownloadView.as_view(), name="report-job-download"),
+    path("stats/", DashboardStatsView.as_view(), name="dashboard-stats"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("import/jobs/<uuid:pk>/", ImportJobView.as_view(), name="import-job"),
+    path("import/<str:kind>/", ImportView.as_view(), name="import"),
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DataVersion
+
+# Counters are read through the default cache so that checking whether a
+# cached response is still current does not cost a database query. That is
+# only safe when every worker shares the cache (a bump deletes the cached
+# counters in the cache it can reach), so with a per-process cache
+# DATA_VERSION_CACHE_TIMEOUT is 0 and each call reads the unique-indexed rows.
+CACHE_PREFIX = "dataversion:"
+
+
+def _cache_keys(names):
+    return [CACHE_PREFIX + name for name in names]
+
+
+def bump_version(*names):
+    """Advance the change counter of each named table by one."""
+    if not names:
+        return
+    updated = DataVersion.objects.filter(name__in=names).update(version=F("version") + 1, updated_at=timezone.now())
+    if updated < len(names):
+        DataVersion.objects.bulk_create(
+            [DataVersion(name=name, version=1) for name in names],
+            ignore_conflicts=True,
+        )
+
+    # Drop the cached counters now and again once the write is visible to
+    # other connections, so a reader cannot re-cache the pre-commit value.
+    keys = _cache_keys(names)
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def version_info(*names):
+    """
+    Return ``(stamp, last_modified)`` for the named tables. The stamp (e.g.
+    ``"4.17.2"``) changes whenever any of them is written to; last_modified
+    is the time of the most recent write, or None if there has been none.
+    """
+    timeout = settings.DATA_VERSION_CACHE_TIMEOUT
+    keys = dict(zip(names, _cache_keys(names)))
+    cached = cache.get_many(keys.values()) if timeout else {}
+    entries = {name: cached[key] for name, key in keys.items() if key in cached}
+
+    missing = [name for name in names if name not in entries]
+    if missing:
+        rows = DataVersion.objects.filter(name__in=missing).values_list("name", "version", "updated_at")
+        found = {name: (version, updated_at) for name, version, updated_at in rows}
+        loaded = {name: found.get(name, (0, None)) for name in missing}
+        if timeout:
+            cache.set_many({keys[name]: entry for name, entry in loaded.items()}, timeout)
+        entries.update(loaded)
+
+    stamp = ".".join(str(entries[name][0]) for name in names)
+    modified = [entries[name][1] for name in names if entries[name][1] is not None]
+    return stamp, max(modified) if modified else None
+
+
+def data_version(*names):
+    return version_info(*names)[0]
@@ -3,16 +3,133 @@ from django.contrib.auth import authenticate
 from rest_framework.response import Response
 from rest_framework import status, generics
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
-from .models import UserProfile, User, UserAvailability, UserSkills, EventDetails, EventSkills, VolunteerHistory, Notifications
-from .serializers import RegisterSerializer, UserProfileSerializer, UserAvailabilitySerializer, UserSkillsSerializer, EventDetailsSerializer, EventSkillsSerializer, VolunteerHistorySerializer, NotificationSerializer
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.permissions import SAFE_METHODS, AllowAny, IsAuthenticated
+from .models import UserProfile, User, UserAvailability, UserSkills, EventDetails, Skill, VolunteerHistory, Notifications, ReportJob, ImportJob
+from .serializers import RegisterSerializer, UserProfileSerializer, UserAvailabilitySerializer, UserSkillsSerializer, EventDetailsSerializer, SkillSerializer, VolunteerHistorySerializer, VolunteerHistoryCompactSerializer, NotificationSerializer, VolunteerMatchSerializer, ReportJobSerializer, ImportJobSerializer
+from .matching import match_volunteers
+from .dashboard import dashboard_snapshot, schedule_dashboard_refresh
+from .versioning import bump_version
+from .cache import cached_response
+from .notifications import broker, event_stream, authenticate_stream, profile_id_for, publish_notifications, fan_out_event_update
+from .jobs import enqueue_report, cached_report, artifact_ready
+from .sync import sync_related_set, resolve_skills, reconcile_event_skills, BULK_BATCH_SIZE
+from .reports import stream_csv, stream_events_pdf, stream_volunteers_pdf, event_rows, volunteer_rows, EVENT_CSV_HEADER, VOLUNTEER_CSV_HEADER
+from .pagination import IdCursorPagination, decode_distance_cursor, encode_distance_cursor, requested_fields, only_requested
+from .profiles import lock_profile, profile_for
+from .availability import available_profile_ids, sync_availability
+from .imports import IMPORT_KINDS, enqueue_import, import_format
+from .search import SEARCH_INDEXES, search_ids, search_terms
+from .geo import MAX_RADIUS_MILES, resolve_point, within_radius, nearest
+from .authentication import issue_tokens
 from django.db import transaction
-from django.http import HttpResponse
-import csv
-from reportlab.pdfgen import canvas
-from django.http import HttpResponse
-from reportlab.lib.pagesizes import letter
+from django.db.models import Count, Max, Q, prefetch_related_objects
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse, FileResponse, JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from asgiref.sync import sync_to_async
+from datetime import datetime, time, timedelta
+
+EVENT_TABLES = ("EventDetails", "EventSkills", "Skill")
+MAX_NEAREST = 500
+
+def query_flag(request, name):
+    return request.query_params.get(name, "").lower() in ("1", "true", "yes")
+
+def replace_requested(request):
+    return query_flag(request, "replace")
+
+def requested_date_range(request):
+    """
+    Parse the inclusive ``?from=`` / ``?to=`` ISO dates into an aware
+    [start, end) datetime range. Either end may be None; raises ValueError.
+    """
+    bounds = []
+    for name, offset in (("from", 0), ("to", 1)):
+        value = request.query_params.get(name)
+        if not value:
+            bounds.append(None)
+            continue
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"{name} must be a date (YYYY-MM-DD).")
+        bounds.append(timezone.make_aware(datetime.combine(day + timedelta(days=offset), time.min)))
+    return tuple(bounds)
+
+def requested_proximity(request):
+    """
+    Parse ``?near=<zip|lat,lon>`` with ``&radius=<miles>`` or
+    ``&nearest=<k>`` into (lat, lon, miles, k); one of miles and k is None.
+    Returns None without ``near``; raises ValueError.
+    """
+    near = request.query_params.get("near")
+    if not near:
+        return None
+    lat, lon = resolve_point(near)
+    radius, k = request.query_params.get("radius"), request.query_params.get("nearest")
+    if (radius is None) == (k is None):
+        raise ValueError("near needs exactly one of radius or nearest.")
+    if radius is not None:
+        try:
+            miles = float(radius)
+        except ValueError:
+            raise ValueError("radius must be a number of miles.")
+        if not 0 < miles <= MAX_RADIUS_MILES:
+            raise ValueError(f"radius must be between 0 and {MAX_RADIUS_MILES:g} miles.")
+        return lat, lon, miles, None
+    if not k.isdigit() or not 0 < int(k) <= MAX_NEAREST:
+        raise ValueError(f"nearest must be between 1 and {MAX_NEAREST}.")
+    return lat, lon, None, int(k)
+
+def requested_availability(request):
+    """
+    Parse ``?available_from=`` / ``?available_to=`` ISO dates and
+    ``available=any|all`` into (start, end, every_day). Returns None without
+    ``available_from``; raises ValueError.
+    """
+    start = request.query_params.get("available_from")
+    if not start:
+        return None
+    end = request.query_params.get("available_to", start)
+    start, end = parse_date(start), parse_date(end)
+    if start is None or end is None:
+        raise ValueError("available_from and available_to must be dates (YYYY-MM-DD).")
+    mode = request.query_params.get("available", "any")
+    if mode not in ("any", "all"):
+        raise ValueError("available must be 'any' or 'all'.")
+    return start, end, mode == "all"
+
+def history_read(request, history):
+    """
+    Apply the ``from``/``to`` date range to a VolunteerHistory queryset and
+    pick its serializer. Returns (queryset, serializer class); raises
+    ValueError on a bad date.
+    """
+    start, end = requested_date_range(request)
+    if start:
+        history = history.filter(event__event_date__gte=start)
+    if end:
+        history = history.filter(event__event_date__lt=end)
+
+    # Compact rows need three event columns; full rows nest the whole
+    # event with its skills, fetched in one extra query.
+    if query_flag(request, "compact"):
+        history = history.select_related("event").only("id", "status", "event__event_name", "event__event_date")
+        return history, VolunteerHistoryCompactSerializer
+    history = history.select_related("event").prefetch_related("event__required_skills")
+    return history, VolunteerHistorySerializer
+
+def history_summary(history):
+    """Totals for a VolunteerHistory queryset, computed in two aggregate queries."""
+    history = history.order_by()
+    totals = history.aggregate(
+        total_events=Count("event", distinct=True),
+        last_participation=Max("event__event_date", filter=Q(event__event_date__lte=timezone.now())),
+    )
+    by_status = history.values("status").annotate(count=Count("id")).values_list("status", "count")
+    return {**totals, "by_status": dict(by_status)}
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -24,7 +141,7 @@ class RegisterView(generics.CreateAPIView):
         serialzer.is_valid(raise_exception=True)
         user = serialzer.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = issue_tokens(user)
 
         return Response(
             {
@@ -44,8 +161,8 @@ class LoginView(APIView):
         user = authenticate(email=email, password=password)
 
         if user:
-            refresh = RefreshToken.for_user(user)
-            
+            refresh = issue_tokens(user)
+
             return Response({
                 "refresh": str(refresh), 
                 "access": str(refresh.access_token),
@@ -53,13 +170,31 @@ class LoginView(APIView):
             })
         return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
     
+class ProfileScopedMixin:
+    """For views scoped to the caller's own profile, resolved once per request."""
+    def get_profile(self):
+        profile = profile_for(self.request)
+        if profile is None:
+            raise NotFound("Profile not found")
+        return profile
+
+    def get_profile_id(self):
+        # Tokens issued after the profile exists carry its id as a claim.
+        profile_id = getattr(self.request.user, "profile_id", None)
+        return profile_id if profile_id is not None else self.get_profile().id
+
 class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        profile, created = UserProfile.objects.get_or_create(user=self.request.user)
-        return self.request.user.profile
+        if self.request.method in SAFE_METHODS:
+            return profile_for(self.request, create=True)
+        return lock_profile(self.request.user.pk)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
     
     def get(self, request):
         profile = self.get_object()
@@ -71,15 +206,67 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 class UsersListView(generics.ListAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = IdCursorPagination
 
     def get_queryset(self):
-        return UserProfile.objects.all()
+        return UserProfile.objects.order_by("id")
     
     def get(self, request):
-        profiles = self.get_queryset()
-        serializer = self.serializer_class(profiles, many=True)
+        try:
+            proximity = requested_proximity(request)
+            availability = requested_availability(request)
+            profiles = self.get_queryset()
+            if availability:
+                profiles = profiles.filter(id__in=available_profile_ids(*availability))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        fields = requested_fields(request)
+        if fields:
+            profiles = only_requested(profiles, [*fields, "latitude", "longitude"] if proximity else fields)
+        if proximity:
+            return self.near(request, profiles, fields, *proximity)
+
+        page = self.paginate_queryset(profiles)
+        if page is not None:
+            serializer = self.serializer_class(page, many=True, fields=fields)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.serializer_class(profiles, many=True, fields=fields)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def near(self, request, profiles, fields, lat, lon, miles, k):
+        # nearest is bounded by k and returns one list, nearest first. A radius
+        # can hold any number of volunteers, so its hits come a page at a time
+        # (the listing's page size, or ``limit``) after a (distance, id) cursor.
+        if miles is None:
+            return Response(self.distance_rows(nearest(profiles, lat, lon, k), fields), status=status.HTTP_200_OK)
+
+        cursor = request.query_params.get(self.paginator.cursor_query_param)
+        try:
+            after = decode_distance_cursor(cursor) if cursor else None
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        limit = self.paginator.get_page_size(request)
+
+        hits = within_radius(profiles, lat, lon, miles)
+        if after is not None:
+            hits = [hit for hit in hits if (hit[0], hit[1].pk) > after]
+        page = hits[:limit]
+        next_url = None
+        if len(hits) > limit:
+            distance, profile = page[-1]
+            next_url = replace_query_param(
+                request.build_absolute_uri(), self.paginator.cursor_query_param, encode_distance_cursor(distance, profile.pk)
+            )
+        return Response({"results": self.distance_rows(page, fields), "next": next_url}, status=status.HTTP_200_OK)
+
+    def distance_rows(self, hits, fields):
+        rows = self.serializer_class([profile for _, profile in hits], many=True, fields=fields).data
+        for row, (distance, _) in zip(rows, hits):
+            row["distance_miles"] = round(distance, 2)
+        return rows
+
 class UserDetailView(generics.RetrieveAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
@@ -94,12 +281,12 @@ class UserDetailView(generics.RetrieveAPIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
 
-class UserAvailabilityView(generics.ListCreateAPIView):
+class UserAvailabilityView(ProfileScopedMixin, generics.ListCreateAPIView):
     serializer_class = UserAvailabilitySerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return self.request.user.profile.availabilities.all()
+        return UserAvailability.objects.filter(user_profile_id=self.get_profile_id())
     
     def get(self, request):
         availabilities = self.get_queryset()
@@ -108,27 +295,34 @@ class UserAvailabilityView(generics.ListCreateAPIView):
 
     
     def post(self, request):
-        user_profile = request.user.profile
+        profile_id = self.get_profile_id()
         availability_data = request.data
 
         if not isinstance(availability_data, list):
             return Response({"error": "Invalid format, expected a list."}, status=status.HTTP_400_BAD_REQUEST)
         
+        serializer = self.serializer_class(data=availability_data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
         with transaction.atomic():
-            for entry in availability_data:
-                UserAvailability.objects.update_or_create(
-                    user_profile=user_profile,
-                    date=entry["date"]
-                )
+            added, removed = sync_related_set(
+                self.get_queryset(),
+                "date",
+                [entry["date"] for entry in serializer.validated_data],
+                lambda date: UserAvailability(user_profile_id=profile_id, date=date),
+                replace=replace_requested(request),
+            )
+            sync_availability(profile_id, {day.year for day in added | removed})
         
         return Response({"message": "Availabilities updated successfully."}, status=status.HTTP_200_OK)
     
-class UserSkillsView(generics.ListCreateAPIView):
+class UserSkillsView(ProfileScopedMixin, generics.ListCreateAPIView):
     serializer_class = UserSkillsSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return self.request.user.profile.skills.all()
+        return UserSkills.objects.filter(user_profile_id=self.get_profile_id())
     
     def get(self, request):
         skills = self.get_queryset()
@@ -136,45 +330,81 @@ class UserSkillsView(generics.ListCreateAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request):
-        user_profile = request.user.profile
+        profile_id = self.get_profile_id()
         skills_data = request.data  # Expecting a list of skill names
 
         if not isinstance(skills_data, list):
             return Response({"error": "Invalid format, expected a list."}, status=status.HTTP_400_BAD_REQUEST)
 
+        serializer = self.serializer_class(data=skills_data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
         with transaction.atomic():
-            for skill_entry in skills_data:
-                UserSkills.objects.update_or_create(
-                    user_profile=user_profile,
-                    name=skill_entry["name"],
-                )
+            added, removed = sync_related_set(
+                self.get_queryset(),
+                "skill_id",
+                resolve_skills(entry["skill"]["name"] for entry in serializer.validated_data),
+                lambda skill_id: UserSkills(user_profile_id=profile_id, skill_id=skill_id),
+                replace=replace_requested(request),
+            )
+            if added or removed:
+                schedule_dashboard_refresh(skill_profile_ids=[profile_id])
 
         return Response({"message": "Skills updated successfully."}, status=status.HTTP_200_OK)
 
 class UserHistoryDetailView(generics.RetrieveAPIView):
+    """
+    A volunteer's profile, participation records and summary in one response.
+    ``/history/<pk>/`` takes a user id; ``/history/`` is the caller's own.
+    Accepts the same ``compact``, ``from`` and ``to`` parameters as
+    ``/volunteer-history/``.
+    """
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         return UserProfile.objects.all()
     
-    def get(self, request, pk):
-        profile = self.get_queryset().filter(user_id=pk).first()
-        if profile:
-            serializer = self.serializer_class(profile)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+    def get(self, request, pk=None):
+        if pk is None:
+            profile = profile_for(request)
+        else:
+            profile = self.get_queryset().filter(user_id=pk).first()
+        if not profile:
+            return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            history, serializer_class = history_read(request, VolunteerHistory.objects.filter(user_profile=profile).order_by("id"))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "profile": self.serializer_class(profile).data,
+            "summary": history_summary(history),
+            "history": serializer_class(history, many=True).data,
+        }, status=status.HTTP_200_OK)
     
-class VolunteerHistoryView(generics.RetrieveAPIView):
+class VolunteerHistoryView(ProfileScopedMixin, generics.ListAPIView):
     serializer_class = VolunteerHistorySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = IdCursorPagination
 
     def get_queryset(self):
-        return self.request.user.profile.volunteer_history.all()
+        return VolunteerHistory.objects.filter(user_profile_id=self.get_profile_id()).order_by("id")
     
     def get(self, request):
-        events = self.get_queryset()
-        serializer = self.serializer_class(events, many=True)
+        try:
+            history, serializer_class = history_read(request, self.get_queryset())
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        page = self.paginate_queryset(history)
+        if page is not None:
+            serializer = serializer_class(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = serializer_class(history, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
 class VolunteerHistoryBulkCreateView(APIView):
@@ -193,39 +423,57 @@ class VolunteerHistoryBulkCreateView(APIView):
         except EventDetails.DoesNotExist:
             return Response({"error": "Event not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        created_histories = []
+        try:
+            requested_ids = list(dict.fromkeys(int(profile_id) for profile_id in user_profiles))
+        except (TypeError, ValueError):
+            return Response({"error": "user_profiles must be a list of profile ids."}, status=status.HTTP_400_BAD_REQUEST)
+
         with transaction.atomic():
-            for profile_id in user_profiles:
-                try:
-                    profile = UserProfile.objects.get(id=profile_id)
-                except UserProfile.DoesNotExist:
-                    continue
-
-                Notifications.objects.create(
-                    user_profile=profile,
-                    message=f"You have been assigned to Event '{event.event_name}' Please check the details."
-                )
-
-                history, created = VolunteerHistory.objects.update_or_create(
-                    user_profile=profile,
-                    event=event,
-                    defaults={"status": "Pending"}
-                )
-                created_histories.append(history)
-        
+            existing_ids = set(UserProfile.objects.filter(id__in=requested_ids).values_list("id", flat=True))
+            profile_ids = [profile_id for profile_id in requested_ids if profile_id in existing_ids]
+
+            message = f"You have been assigned to Event '{event.event_name}' Please check the details."
+            notifications = Notifications.objects.bulk_create(
+                [Notifications(user_profile_id=profile_id, message=message) for profile_id in profile_ids],
+                batch_size=BULK_BATCH_SIZE,
+            )
+            publish_notifications(notifications)
+
+            created_histories = VolunteerHistory.objects.bulk_create(
+                [VolunteerHistory(user_profile_id=profile_id, event=event, status="Pending") for profile_id in profile_ids],
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["user_profile", "event"],
+                update_fields=["status"],
+            )
+            bump_version("VolunteerHistory")
+            schedule_dashboard_refresh(event_ids=[event.id], profile_ids=profile_ids)
+
+        prefetch_related_objects([event], "required_skills")
         serializer = VolunteerHistorySerializer(created_histories, many=True)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 class EventDetailsView(generics.RetrieveUpdateAPIView):
     serializer_class = EventDetailsSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = IdCursorPagination
 
     def get_queryset(self):
-        return EventDetails.objects.all()
+        return EventDetails.objects.order_by("id")
     
+    @cached_response(*EVENT_TABLES)
     def get(self, request, *args, **kwargs):
+        fields = requested_fields(request)
         events = self.get_queryset()
-        serializer = self.serializer_class(events, many=True)
+        if not fields or "required_skills" in fields:
+            events = events.prefetch_related("required_skills")
+
+        page = self.paginate_queryset(events)
+        if page is not None:
+            serializer = self.serializer_class(page, many=True, fields=fields)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.serializer_class(events, many=True, fields=fields)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     def post(self, request):
@@ -237,10 +485,9 @@ class EventDetailsView(generics.RetrieveUpdateAPIView):
         serializer = self.serializer_class(data=data)
 
         if serializer.is_valid():
-            event = serializer.save()
-
-            for skill in skills_data:
-                EventSkills.objects.create(name=skill, event=event)
+            with transaction.atomic():
+                event = serializer.save()
+                reconcile_event_skills(event, skills_data)
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
@@ -253,6 +500,7 @@ class EventDetailedView(generics.RetrieveUpdateAPIView):
     def get_queryset(self):
         return EventDetails.objects.all()
     
+    @cached_response(*EVENT_TABLES)
     def get(self, request, pk):
         event = self.get_queryset().filter(pk=pk).first()
         if event:
@@ -264,29 +512,24 @@ class EventDetailedView(generics.RetrieveUpdateAPIView):
         if not request.user.is_admin:
             return Response({"error": "Only admins can update events"}, status=status.HTTP_401_UNAUTHORIZED)
         
-        event = self.get_queryset().filter(pk=pk).first()
-        if event:
+        with transaction.atomic():
+            # Lock the event row so concurrent edits reconcile one at a time.
+            event = self.get_queryset().select_for_update().filter(pk=pk).first()
+            if not event:
+                return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
+
             data = request.data.copy()
             skills_data = data.pop('skills', [])
             serializer = self.serializer_class(event, data=data)
 
             if serializer.is_valid():
                 event = serializer.save()
-
-                EventSkills.objects.filter(event=event).exclude(name__in=skills_data).delete()
-                for skill in skills_data:
-                    EventSkills.objects.update_or_create(name=skill, event=event)
-
-                for volunteer in VolunteerHistory.objects.filter(event=event).all():
-                    Notifications.objects.create(
-                        user_profile=volunteer.user_profile,
-                        message=f"Event '{event.event_name}' has been updated. Please check the details."
-                    )
+                reconcile_event_skills(event, skills_data)
+                fan_out_event_update(event)
 
                 return Response(serializer.data, status=status.HTTP_200_OK)
             
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
 
     def delete(self, request, pk):
         if not request.user.is_admin:
@@ -298,27 +541,56 @@ class EventDetailedView(generics.RetrieveUpdateAPIView):
             return Response({"message": "Event deleted successfully."}, status=status.HTTP_200_OK)
         return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
 
-class EventSkillsView(generics.ListCreateAPIView):
-    serializer_class = EventSkillsSerializer
+class EventMatchView(APIView):
+    permission_classes = [IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request, pk):
+        if not request.user.is_admin:
+            return Response({"error": "Only admins can match volunteers"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        event = EventDetails.objects.filter(pk=pk).first()
+        if not event:
+            return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.max_limit))
+
+        matches = match_volunteers(event, limit=limit)
+        serializer = VolunteerMatchSerializer(matches, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class EventSkillsView(generics.ListAPIView):
+    serializer_class = SkillSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return EventSkills.objects.all()
+        return Skill.objects.order_by("name")
     
+    @cached_response("Skill")
     def get(self, request, *args, **kwargs):
-        event_skills = self.get_queryset()
-        serializer = self.serializer_class(event_skills, many=True)
+        skills = self.get_queryset()
+        serializer = self.serializer_class(skills, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
-class NotificationsView(generics.ListAPIView):
+class NotificationsView(ProfileScopedMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Notifications.objects.filter(user_profile=self.request.user.profile)
+        return Notifications.objects.filter(user_profile_id=self.get_profile_id())
     
     def get(self, request):
         notifications = self.get_queryset()
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                notifications = notifications.filter(id__gt=int(since)).order_by("id")
+            except ValueError:
+                return Response({"error": "since must be a notification id."}, status=status.HTTP_400_BAD_REQUEST)
         serializer = self.serializer_class(notifications, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
@@ -332,6 +604,35 @@ class NotificationsView(generics.ListAPIView):
             return Response({"message": "Notification deleted successfully"}, status=status.HTTP_200_OK)
         return Response({"error": "Notification not found"}, status=status.HTTP_404_NOT_FOUND)
     
+async def notification_stream(request):
+    """
+    Server-sent event stream of the caller's new notifications. Reconnecting
+    clients resume from the Last-Event-ID header or ``?since=<id>``. Only
+    served under ASGI (app.asgi): a WSGI server would drain the endless
+    stream into a list before sending a byte, so it answers 501 there.
+    """
+    user = await sync_to_async(authenticate_stream)(request)
+    if user is None:
+        return JsonResponse({"error": "Authentication credentials were not provided."}, status=status.HTTP_401_UNAUTHORIZED)
+
+    profile_id = await sync_to_async(profile_id_for)(user)
+    if profile_id is None:
+        return JsonResponse({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    since = request.headers.get("Last-Event-ID") or request.GET.get("since")
+    try:
+        since = int(since) if since is not None else None
+    except ValueError:
+        return JsonResponse({"error": "since must be a notification id."}, status=status.HTTP_400_BAD_REQUEST)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "The notification stream needs an ASGI server."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    subscription = broker.subscribe(profile_id)
+    response = StreamingHttpResponse(event_stream(subscription, since), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
 class EventCSVReportView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -339,68 +640,45 @@ class EventCSVReportView(APIView):
         if not request.user.is_admin:
             return Response({"error": "Only admins can access this report"}, status=status.HTTP_401_UNAUTHORIZED)
         
-        events = EventDetails.objects.all().prefetch_related('volunteers__user_profile', 'required_skills')
-        
-        response = HttpResponse(content_type='text/csv')
+        response = StreamingHttpResponse(stream_csv(EVENT_CSV_HEADER, event_rows()), content_type='text/csv')
         response['Content-Disposition'] = "attachment; filename=events_report.csv"
-
-        writer = csv.writer(response)
-        writer.writerow(["Event Name", "Description", "Location", "Urgency", "Event Date", "Required Skills", "Assigned Volunteers"])
-
-        for event in events:
-            required_skills = ", ".join(skill.name for skill in event.required_skills.all())
-            assigned_volunteers = ", ".join(v.user_profile.full_name for v in event.volunteers.all())
-            writer.writerow([
-                event.event_name,
-                event.description,
-                event.location,
-                event.urgency,
-                event.event_date.strftime("%Y-%m-%d"),
-                required_skills,
-                assigned_volunteers,
-            ])
         return response
     
-class EventPDFReportView(APIView):
+class PDFReportView(APIView):
+    """
+    GET serves the cached artifact for the current data version, or streams
+    pages as they are rendered when there is none. POST queues a background
+    render and returns the job to poll.
+    """
     permission_classes = [IsAuthenticated]
+    kind = None
+    filename = None
+    stream = None
 
     def get(self, request):
         if not request.user.is_admin:
             return Response({"error": "Only admins can access this report"}, status=status.HTTP_401_UNAUTHORIZED)
-        
-        events = EventDetails.objects.all().prefetch_related('volunteers__user_profile', 'required_skills')
-
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename=events_report.pdf'
-
-        p = canvas.Canvas(response, pagesize=letter)
-        width, height = letter
-        y = height - 40
-        p.setFont("Helvetica-Bold", 14)
-        p.drawString(200, y, "Events Report")
-        y -= 30
-        p.setFont("Helvetica", 10)
-
-        for event in events:
-            required_skills = ", ".join(skill.name for skill in event.required_skills.all())
-            assigned_volunteers = ", ".join(v.user_profile.full_name for v in event.volunteers.all())
-            p.drawString(40, y, f"Event Name: {event.event_name}")
-            y -= 15
-            p.drawString(40, y, f"Description: {event.description}")
-            y -= 15
-            p.drawString(40, y, f"Location: {event.location} | Urgency: {event.urgency} | Event Date: {event.event_date.strftime('%Y-%m-%d')}")
-            y -= 15
-            p.drawString(40, y, f"Required Skills: {required_skills}")
-            y -= 15
-            p.drawString(40, y, f"Assigned Volunteers: {assigned_volunteers}")
-            y -= 30
-            if y < 60:
-                p.showPage()
-                y = height - 40
-                p.setFont("Helvetica", 10)
-            
-        p.save()
+
+        job = cached_report(self.kind)
+        if job:
+            return FileResponse(open(job.file_path, "rb"), as_attachment=True, filename=self.filename, content_type='application/pdf')
+
+        response = StreamingHttpResponse(self.stream(), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename={self.filename}'
         return response
+
+    def post(self, request):
+        if not request.user.is_admin:
+            return Response({"error": "Only admins can access this report"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        job = enqueue_report(self.kind, user=request.user)
+        status_code = status.HTTP_200_OK if job.status == ReportJob.DONE else status.HTTP_202_ACCEPTED
+        return Response(ReportJobSerializer(job).data, status=status_code)
+
+class EventPDFReportView(PDFReportView):
+    kind = ReportJob.EVENTS_PDF
+    filename = "events_report.pdf"
+    stream = staticmethod(stream_events_pdf)
     
 class VolunteerReportCSV(APIView):
     permission_classes = [IsAuthenticated]
@@ -409,51 +687,137 @@ class VolunteerReportCSV(APIView):
         if not request.user.is_admin:
             return Response({"error": "Only admins can access this report"}, status=status.HTTP_401_UNAUTHORIZED)
         
-        response = HttpResponse(content_type='text/csv')
+        response = StreamingHttpResponse(stream_csv(VOLUNTEER_CSV_HEADER, volunteer_rows()), content_type='text/csv')
         response['Content-Disposition'] = "attachment; filename=volunteer_report.csv"
-
-        writer = csv.writer(response)
-        writer.writerow(['Volunteer Name', 'Event Name', 'Status', 'Event Date'])
-
-        histories = VolunteerHistory.objects.select_related('user_profile', 'event').all()
-        for history in histories:
-            writer.writerow([
-                history.user_profile.full_name,
-                history.event.event_name,
-                history.status,
-                history.event.event_date.strftime("%Y-%m-%d"),
-            ])
-        
         return response
     
-class VolunteerReportPDF(APIView):
+class VolunteerReportPDF(PDFReportView):
+    kind = ReportJob.VOLUNTEERS_PDF
+    filename = "volunteer_report.pdf"
+    stream = staticmethod(stream_volunteers_pdf)
+
+class ReportJobView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
+    def get(self, request, pk):
         if not request.user.is_admin:
             return Response({"error": "Only admins can access this report"}, status=status.HTTP_401_UNAUTHORIZED)
-        
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename=volunteer_report.pdf'
-
-        p = canvas.Canvas(response, pagesize=letter)
-        width, height = letter
-        y = height - 40
-        p.setFont("Helvetica-Bold", 14)
-        p.drawString(200, y, "Volunteer Report")
-        y -= 30
-        p.setFont("Helvetica", 10)
-
-        histories = VolunteerHistory.objects.select_related('user_profile', 'event').all()
-        for history in histories:
-            p.drawString(40, y, f"Volunteer Name: {history.user_profile.full_name}")
-            y -= 15
-            p.drawString(40, y, f"Event Name: {history.event.event_name} | Status: {history.status} | Event Date: {history.event.event_date.strftime('%Y-%m-%d')}")
-            y -= 30
-            if y < 60:
-                p.showPage()
-                y = height - 40
-                p.setFont("Helvetica", 10)
-
-        p.save()
-        return response
+
+        job = ReportJob.objects.filter(pk=pk).first()
+        if not job:
+            return Response({"error": "Report job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ReportJobSerializer(job).data, status=status.HTTP_200_OK)
+
+class ReportJobDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        if not request.user.is_admin:
+            return Response({"error": "Only admins can access this report"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        job = ReportJob.objects.filter(pk=pk).first()
+        if not job:
+            return Response({"error": "Report job not found"}, status=status.HTTP_404_NOT_FOUND)
+        if not artifact_ready(job):
+            return Response(ReportJobSerializer(job).data, status=status.HTTP_409_CONFLICT)
+
+        filename = f"{job.kind.replace('-', '_')}.pdf"
+        return FileResponse(open(job.file_path, "rb"), as_attachment=True, filename=filename, content_type='application/pdf')
+
+class DashboardStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_admin:
+            return Response({"error": "Only admins can view dashboard stats"}, status=status.HTTP_401_UNAUTHORIZED)
+        return self.snapshot(request)
+
+    @cached_response("DashboardStats")
+    def snapshot(self, request):
+        return Response(dashboard_snapshot(), status=status.HTTP_200_OK)
+
+class SearchView(APIView):
+    """
+    ``?q=`` full-text search over events and volunteers, best match first.
+    ``type=events|users`` narrows it to one kind; ``limit``/``offset`` page
+    through each kind's results.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = 100
+    serializers = {"events": EventDetailsSerializer, "users": UserProfileSerializer}
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        if not search_terms(query):
+            return Response({"error": "q must contain at least one word."}, status=status.HTTP_400_BAD_REQUEST)
+        kind = request.query_params.get("type")
+        if kind and kind not in SEARCH_INDEXES:
+            return Response({"error": f"type must be one of {', '.join(SEARCH_INDEXES)}."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get("limit", self.default_limit)), self.max_limit)
+            offset = int(request.query_params.get("offset", 0))
+            if limit < 1 or offset < 0:
+                raise ValueError
+        except ValueError:
+            return Response({"error": "limit and offset must be positive integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results, more = {}, False
+        for name in [kind] if kind else SEARCH_INDEXES:
+            # One extra hit tells whether another page exists.
+            hits = search_ids(name, query, limit + 1, offset)
+            more = more or len(hits) > limit
+            results[name] = self.rows(name, hits[:limit])
+        next_url = replace_query_param(request.build_absolute_uri(), "offset", offset + limit) if more else None
+        return Response({"results": results, "next": next_url}, status=status.HTTP_200_OK)
+
+    def rows(self, kind, hits):
+        model = SEARCH_INDEXES[kind][0]
+        objects = model.objects.in_bulk([pk for pk, _ in hits])
+        if kind == "events":
+            prefetch_related_objects(list(objects.values()), "required_skills")
+        # Rows deleted since they were indexed drop out here.
+        found = [(objects[pk], score) for pk, score in hits if pk in objects]
+        rows = self.serializers[kind]([obj for obj, _ in found], many=True).data
+        for row, (_, score) in zip(rows, found):
+            row["score"] = round(score, 4)
+        return rows
+
+class ImportView(APIView):
+    """
+    Admin upload of a CSV or JSONL file of volunteers or events. The file is
+    imported by a background job; the response is that job, whose report
+    holds the number created and the rows that failed validation once it
+    is done. Very large files are better run through ``manage.py
+    import_records``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, kind):
+        if not request.user.is_admin:
+            return Response({"error": "Only admins can import records"}, status=status.HTTP_401_UNAUTHORIZED)
+        if kind not in IMPORT_KINDS:
+            return Response({"error": f"Unknown import kind '{kind}'."}, status=status.HTTP_404_NOT_FOUND)
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "Upload the records as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fmt = import_format(upload.name, request.query_params.get("format"))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = enqueue_import(kind, upload, fmt, user=request.user)
+        status_code = status.HTTP_200_OK if job.status in (ImportJob.DONE, ImportJob.FAILED) else status.HTTP_202_ACCEPTED
+        return Response(ImportJobSerializer(job).data, status=status_code)
+
+class ImportJobView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        if not request.user.is_admin:
+            return Response({"error": "Only admins can import records"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        job = ImportJob.objects.filter(pk=pk).first()
+        if not job:
+            return Response({"error": "Import job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_200_OK)
@@ -2,6 +2,12 @@
 ASGI config for app project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the API with an ASGI server; the notification stream is only
+available under ASGI, where it holds a coroutine per open connection.
+Streams in one worker see notifications written by the others by polling
+(NOTIFICATION_POLL_SECONDS):
+
+    uvicorn app.asgi:application --host 0.0.0.0 --port 8000 --workers 4
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -37,13 +38,26 @@ INSTALLED_APPS += ['rest_framework', 'rest_framework_simplejwt']
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
     ),
 }
 
+# Authenticated requests get an api.authentication.ClaimsUser built from the
+# token instead of a User loaded from the database, so access tokens are not
+# checked for revocation. They are kept short-lived, and POST /token/refresh/
+# refuses refresh tokens revoked since issue (api.authentication.revoke_tokens)
+# or belonging to inactive users.
+SIMPLE_JWT = {
+    'TOKEN_USER_CLASS': 'api.authentication.ClaimsUser',
+    'TOKEN_REFRESH_SERIALIZER': 'api.authentication.RevocableTokenRefreshSerializer',
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('ACCESS_TOKEN_MINUTES', '5'))),
+}
+
 JWT_AUTH_HEADER_PREFIX = "Bearer"
 
 MIDDLEWARE = [
+    'api.streaming.AsyncStreamingMiddleware',
+    'api.metrics.QueryMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -82,15 +96,235 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# DB_ENGINE=sqlite (default) suits a single node. DB_ENGINE=postgres is for
+# several worker processes writing at once and needs psycopg 3; pooling also
+# needs psycopg[pool]. With DB_POOL_MAX_SIZE set, each process keeps a
+# connection pool. Without it, connections persist for DB_CONN_MAX_AGE seconds
+# and are health-checked before reuse.
+
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+
+def database_config(engine):
+    if engine == 'postgres':
+        config = {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'volunteer'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'OPTIONS': {},
+        }
+        pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE', '0'))
+        if pool_max_size:
+            # Django's pool hands connections back after each request, so it
+            # cannot be combined with persistent connections.
+            config['OPTIONS']['pool'] = {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+                'max_size': pool_max_size,
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            }
+        else:
+            config['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+            config['CONN_HEALTH_CHECKS'] = True
+        return config
+
+    # WAL lets reads run while a write is in progress. synchronous=NORMAL
+    # syncs only at checkpoints, which WAL keeps crash-safe. IMMEDIATE
+    # transactions take the write lock at BEGIN, so a second writer waits up
+    # to SQLITE_BUSY_TIMEOUT seconds rather than failing on lock upgrade.
+    return {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-        'PORT': os.getenv('PORT', '8000'),
+        'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY',
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', '20')),
+        },
     }
+
+
+DATABASES = {
+    'default': database_config(DB_ENGINE),
 }
 
 
+# Caches
+# "default" holds the data-version counters and profiles, "responses" holds serialized API
+# responses, "report_blocks" holds laid-out PDF report blocks. CACHE_BACKEND picks where they live:
+#   locmem (default)  per process; evicts the least recently used entry at MAX_ENTRIES.
+#   redis             shared by every worker at REDIS_URL; needs the redis package. Eviction is
+#                     the server's: set maxmemory and maxmemory-policy allkeys-lru for LRU.
+#                     MAX_ENTRIES does not apply.
+#   file              shared through CACHE_DIR with no server to run. Not LRU: FileBasedCache
+#                     deletes a random third of the entries when it reaches MAX_ENTRIES.
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/0')
+
+CACHE_DIR = Path(os.getenv('CACHE_DIR', BASE_DIR / 'cache'))
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1000'))
+
+# One entry per event (or history row) in a rendered PDF report; size it to
+# cover the largest report so a re-render lays out only what changed.
+REPORT_BLOCK_CACHE_MAX_ENTRIES = int(os.getenv('REPORT_BLOCK_CACHE_MAX_ENTRIES', '20000'))
+
+REPORT_BLOCK_CACHE_TIMEOUT = int(os.getenv('REPORT_BLOCK_CACHE_TIMEOUT', str(7 * 24 * 3600)))
+
+# Seconds the data-version counters stay in the default cache; 0 reads them
+# from the database on every request. Caching them is only correct when all
+# workers share the cache, so it defaults to off for the per-process backend.
+DATA_VERSION_CACHE_TIMEOUT = int(os.getenv('DATA_VERSION_CACHE_TIMEOUT', '300' if CACHE_BACKEND != 'locmem' else '0'))
+
+# Seconds an unknown ZIP code is remembered as having no centroid. A new
+# centroid load reaches running workers once their entries expire.
+ZIP_MISS_CACHE_TIMEOUT = int(os.getenv('ZIP_MISS_CACHE_TIMEOUT', '300'))
+
+# Seconds a user's profile stays in the default cache; 0 disables it. Off by
+# default for the per-process backend, where other workers would keep serving
+# a profile after it changed.
+PROFILE_CACHE_TIMEOUT = int(os.getenv('PROFILE_CACHE_TIMEOUT', '300' if CACHE_BACKEND != 'locmem' else '0'))
+
+
+def cache_config(name, max_entries):
+    if CACHE_BACKEND == 'redis':
+        return {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': name,
+        }
+    if CACHE_BACKEND == 'file':
+        return {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR / name,
+            'OPTIONS': {'MAX_ENTRIES': max_entries},
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': name,
+        'OPTIONS': {'MAX_ENTRIES': max_entries},
+    }
+
+
+CACHES = {
+    'default': cache_config('default', 10000),
+    'responses': cache_config('responses', RESPONSE_CACHE_MAX_ENTRIES),
+    'report_blocks': cache_config('report_blocks', REPORT_BLOCK_CACHE_MAX_ENTRIES),
+}
+
+
+# Request instrumentation
+# Per-request query budgets keyed by URL name, optionally narrowed to one
+# method as "name:METHOD". Requests over budget are logged, or fail outright
+# when QUERY_BUDGET_ENFORCE is on (the test suite turns it on).
+
+QUERY_BUDGETS = {
+    'login': 4,
+    'profile': 6,
+    'profile:PUT': 9,
+    'profile:PATCH': 9,
+    'users': 4,
+    'user': 3,
+    'events:GET': 4,
+    'events:POST': 16,
+    'events:PUT': 16,
+    'event-skills': 3,
+    'event-matches': 6,
+    'availabilities:GET': 3,
+    'availabilities:POST': 10,
+    'skills:GET': 3,
+    'skills:POST': 12,
+    'notifications': 4,
+    'volunteer-history': 3,
+    'history': 5,
+    'dashboard-stats': 3,
+    'search': 5,
+    'volunteer-history-bulk-create': 10,
+    'event-csv-report': 3,
+    'volunteer-history-csv-report': 3,
+}
+
+QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', 'False') == 'True'
+
+# Bearer token a scraper must send to read /metrics. Unset keeps it closed.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+
+# Background report jobs
+# Rendered PDF reports are written under REPORT_ROOT and reused until the data
+# they were built from changes. REPORT_JOB_WORKERS=0 renders in the request.
+
+REPORT_ROOT = Path(os.getenv('REPORT_ROOT', BASE_DIR / 'reports'))
+
+REPORT_JOB_WORKERS = int(os.getenv('REPORT_JOB_WORKERS', '2'))
+
+
+# Event-update notifications are written on this many background threads once
+# the admin's edit commits. 0 writes them in the request after commit.
+
+NOTIFICATION_FANOUT_WORKERS = int(os.getenv('NOTIFICATION_FANOUT_WORKERS', '2'))
+
+# Open notification streams receive notifications published in their own
+# process immediately, and read the table every NOTIFICATION_POLL_SECONDS for
+# ones written by other worker processes, jobs and commands.
+
+NOTIFICATION_POLL_SECONDS = float(os.getenv('NOTIFICATION_POLL_SECONDS', '5'))
+
+
+# Dashboard aggregates are recounted for the keys a write touched once it
+# commits, on this many background threads (0 recounts in the request).
+# Run manage.py rebuild_dashboard periodically to recount everything.
+
+DASHBOARD_REFRESH_WORKERS = int(os.getenv('DASHBOARD_REFRESH_WORKERS', '1'))
+
+
+# Password hashing
+# PASSWORD_HASHER picks the hasher for new passwords: "scrypt", "pbkdf2" or
+# "argon2" (needs argon2-cffi). Hashes in the other formats keep verifying,
+# and any hash made with another hasher or other cost parameters is rewritten
+# on its owner's next login. Use manage.py benchmark_logins to pick the costs.
+
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'scrypt')
+
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', '870000'))
+
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR', str(2 ** 14)))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv('PASSWORD_SCRYPT_BLOCK_SIZE', '8'))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv('PASSWORD_SCRYPT_PARALLELISM', '1'))
+
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', '2'))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST', '19456'))  # KiB
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv('PASSWORD_ARGON2_PARALLELISM', '1'))
+
+PASSWORD_HASHER_CLASSES = {
+    'scrypt': 'api.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'api.hashers.PBKDF2PasswordHasher',
+    'argon2': 'api.hashers.Argon2PasswordHasher',
+}
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+
+# Bulk import
+# manage.py import_records and POST /import/<kind>/ write IMPORT_BATCH_SIZE
+# records per transaction. manage.py import_records hashes passwords on
+# IMPORT_HASH_WORKERS processes (0 or 1 hashes in the importing process).
+# Uploads are saved under IMPORT_ROOT and imported on IMPORT_JOB_WORKERS
+# background threads, hashing in-process; 0 imports in the request.
+
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '1000'))
+IMPORT_HASH_WORKERS = int(os.getenv('IMPORT_HASH_WORKERS', str(os.cpu_count() or 1)))
+
+IMPORT_ROOT = Path(os.getenv('IMPORT_ROOT', BASE_DIR / 'imports'))
+
+IMPORT_JOB_WORKERS = int(os.getenv('IMPORT_JOB_WORKERS', '1'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Cache backends outlive the per-test database rollback, so start every
+    # test with empty caches.
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    settings.QUERY_BUDGET_ENFORCE = True